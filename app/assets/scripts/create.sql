@@ -1,23 +1,82 @@
+IF OBJECT_ID (N'dbo.booking_dates_log', N'U') IS NOT NULL
+    DROP TABLE dbo.booking_dates_log;
+
 IF OBJECT_ID (N'dbo.booking_dates', N'U') IS NOT NULL
     DROP TABLE dbo.booking_dates;
 
 IF OBJECT_ID (N'dbo.booking', N'U') IS NOT NULL
     DROP TABLE dbo.booking;
 
+IF OBJECT_ID (N'dbo.resource', N'U') IS NOT NULL
+    DROP TABLE dbo.resource;
+
+
+CREATE TABLE dbo.resource (
+    id VARCHAR(36) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    created_date DATETIME2 NOT NULL DEFAULT GETDATE(),
+	modified_date DATETIME2 NOT NULL DEFAULT GETDATE(),
+);
+
+INSERT INTO dbo.resource (id, name) VALUES ('main', 'Meeting room');
 
 CREATE TABLE dbo.booking (
     id VARCHAR(36) PRIMARY KEY,
+    resource_id VARCHAR(36) NOT NULL DEFAULT 'main',
     customer_name VARCHAR(100),
     created_date DATETIME2 NOT NULL DEFAULT GETDATE(),
 	modified_date DATETIME2 NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT FK_booking_resource FOREIGN KEY (resource_id)
+        REFERENCES dbo.resource (id),
+
+    CONSTRAINT UQ_booking_id_resource_id UNIQUE (id, resource_id)
 );
 
+-- Orders the bookings exported since a given time, see `iter_bookings`.
+CREATE INDEX IX_booking_created_date_id ON dbo.booking (created_date, id);
+
+-- The resource of a booking is repeated on its dates so that a date can only be
+-- booked once per resource, and so that the (resource_id, date) index answers
+-- the availability of one or many resources with seeks.
 CREATE TABLE dbo.booking_dates (
     id INT IDENTITY(1,1) PRIMARY KEY,
     booking_id VARCHAR(36) NOT NULL,
+    resource_id VARCHAR(36) NOT NULL DEFAULT 'main',
     date DATE NOT NULL,
-    CONSTRAINT FK_booking_dates_bookings FOREIGN KEY (booking_id) 
-        REFERENCES dbo.booking (id) ON DELETE CASCADE,
+    CONSTRAINT FK_booking_dates_bookings FOREIGN KEY (booking_id, resource_id) 
+        REFERENCES dbo.booking (id, resource_id) ON DELETE CASCADE,
+
+    CONSTRAINT UQ_booking_dates_resource_id_date UNIQUE (resource_id, date)
+);
 
-    CONSTRAINT UQ_booking_dates_date UNIQUE (date)
+-- Finds the dates of a booking, and keeps its cascade delete from scanning.
+CREATE INDEX IX_booking_dates_booking_id ON dbo.booking_dates (booking_id);
+
+-- Change feed of booked dates, see `SqlRepository.get_changes`. The rowversion
+-- of a change orders it, and together with MIN_ACTIVE_ROWVERSION() lets readers
+-- skip the changes of transactions not yet committed.
+CREATE TABLE dbo.booking_dates_log (
+    version ROWVERSION NOT NULL,
+    resource_id VARCHAR(36) NOT NULL,
+    date DATE NOT NULL,
+    booked BIT NOT NULL,
+    CONSTRAINT PK_booking_dates_log PRIMARY KEY (version)
 );
+
+CREATE INDEX IX_booking_dates_log_resource_id_version
+    ON dbo.booking_dates_log (resource_id, version);
+GO
+
+CREATE TRIGGER dbo.TR_booking_dates_log ON dbo.booking_dates
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO dbo.booking_dates_log (resource_id, date, booked)
+    SELECT resource_id, date, 0 FROM deleted;
+
+    INSERT INTO dbo.booking_dates_log (resource_id, date, booked)
+    SELECT resource_id, date, 1 FROM inserted;
+END;
+GO
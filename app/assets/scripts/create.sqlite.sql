@@ -0,0 +1,71 @@
+CREATE TABLE IF NOT EXISTS resource (
+    id VARCHAR(36) PRIMARY KEY NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    created_date TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    modified_date TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+INSERT OR IGNORE INTO resource (id, name) VALUES ('main', 'Meeting room');
+
+CREATE TABLE IF NOT EXISTS booking (
+    id VARCHAR(36) PRIMARY KEY NOT NULL,
+    resource_id VARCHAR(36) NOT NULL DEFAULT 'main',
+    customer_name VARCHAR(100),
+    created_date TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    modified_date TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+    CONSTRAINT FK_booking_resource FOREIGN KEY (resource_id)
+        REFERENCES resource (id),
+
+    CONSTRAINT UQ_booking_id_resource_id UNIQUE (id, resource_id)
+);
+
+CREATE INDEX IF NOT EXISTS IX_booking_created_date_id
+    ON booking (created_date, id);
+
+-- See create.sql for why the resource is repeated on booking dates.
+CREATE TABLE IF NOT EXISTS booking_dates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    booking_id VARCHAR(36) NOT NULL,
+    resource_id VARCHAR(36) NOT NULL DEFAULT 'main',
+    date TEXT NOT NULL,
+    CONSTRAINT FK_booking_dates_bookings FOREIGN KEY (booking_id, resource_id)
+        REFERENCES booking (id, resource_id) ON DELETE CASCADE,
+
+    CONSTRAINT UQ_booking_dates_resource_id_date UNIQUE (resource_id, date)
+);
+
+CREATE INDEX IF NOT EXISTS IX_booking_dates_booking_id
+    ON booking_dates (booking_id);
+
+-- Change feed of booked dates, see `SqliteRepository.get_changes`. Writers are
+-- serialized, so versions are committed in order.
+CREATE TABLE IF NOT EXISTS booking_dates_log (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    resource_id VARCHAR(36) NOT NULL,
+    date TEXT NOT NULL,
+    booked INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS IX_booking_dates_log_resource_id_version
+    ON booking_dates_log (resource_id, version);
+
+CREATE TRIGGER IF NOT EXISTS TR_booking_dates_log_insert
+AFTER INSERT ON booking_dates
+BEGIN
+    INSERT INTO booking_dates_log (resource_id, date, booked)
+    VALUES (NEW.resource_id, NEW.date, 1);
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_booking_dates_log_update
+AFTER UPDATE OF resource_id, date ON booking_dates
+BEGIN
+    INSERT INTO booking_dates_log (resource_id, date, booked)
+    VALUES (OLD.resource_id, OLD.date, 0), (NEW.resource_id, NEW.date, 1);
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_booking_dates_log_delete
+AFTER DELETE ON booking_dates
+BEGIN
+    INSERT INTO booking_dates_log (resource_id, date, booked)
+    VALUES (OLD.resource_id, OLD.date, 0);
+END;
@@ -0,0 +1,63 @@
+"""Benchmark availability checks over large numbers of dates.
+
+Compares the services, which check one date at a time, with the vectorized
+engine of `booking.availability`.
+
+Usage:
+    python -m benchmarks.bench_availability --booked 1000000 --queries 100000
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.shared import measure, print_results
+from booking.availability import AvailabilityIndex, np
+from booking.services import _get_availabilities, _get_availability_runs
+
+
+def main() -> None:
+    """Run the availability benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--booked", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if np is None:
+        parser.error("The availability engine requires NumPy.")
+
+    # Book about half of the days of a period twice as long.
+    start = date(2000, 1, 1)
+    span = 2 * args.booked
+    booked_dates = sorted(
+        start + timedelta(days=d) for d in random.sample(range(span), args.booked)
+    )
+    queries = [
+        start + timedelta(days=random.randrange(span)) for _ in range(args.queries)
+    ]
+    end = start + timedelta(days=span - 1)
+
+    index = AvailabilityIndex(booked_dates)
+
+    results = {
+        "index build": measure(lambda: AvailabilityIndex(booked_dates), args.repeat),
+        "batch (services)": measure(
+            lambda: _get_availabilities(queries, booked_dates), args.repeat
+        ),
+        "batch (engine)": measure(lambda: index.is_available(queries), args.repeat),
+        "range runs (services)": measure(
+            lambda: _get_availability_runs(start, end, booked_dates), args.repeat
+        ),
+        "range runs (engine)": measure(lambda: index.runs(start, end), args.repeat),
+    }
+
+    print_results(
+        f"Availability ({args.booked} booked dates, {args.queries} queries, "
+        f"{span} days range)",
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
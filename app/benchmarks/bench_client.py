@@ -0,0 +1,83 @@
+"""Benchmark a chat turn of the LLM client from a recorded cassette.
+
+The turn asks for the availability of a week, which the model answers with a
+`check_availability` tool call against a SQLite repository. With the default
+latency scale of 0, the benchmark measures the overhead of the client and
+tool dispatch alone. The shipped cassette is synthetic; record a live one with
+`--record`, which needs the OpenAI environment variables.
+
+Usage:
+    python -m benchmarks.bench_client --latency-scale 0 --repeat 200
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.bench_repository import create_bookings
+from benchmarks.shared import measure, print_results
+from booking.ai.cassette import RecordingClient, ReplayClient
+from booking.ai.client import LLMClient
+from booking.config import get_openai_client, get_sqlite_connection
+from booking.repository import SqliteRepository
+
+CASSETTE_PATH = os.path.join(
+    os.path.dirname(__file__), "cassettes", "check_availability.json"
+)
+MODEL = "gpt-4o-mini"
+TOOLS = [("booking.services", "check_availability")]
+USER_MESSAGE = "Is the room free every day from 2030-01-01 to 2030-01-07?"
+SYSTEM_PROMPT = "You are a booking agent. Use the tools to answer."
+
+
+def main() -> None:
+    """Run the client benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cassette", default=CASSETTE_PATH)
+    parser.add_argument("--latency-scale", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        connection = get_sqlite_connection(os.path.join(tmp_dir, "bench.db"))
+        repo = SqliteRepository(connection)
+        for booking in create_bookings(50):
+            repo.add(booking)
+
+        if args.record:
+            recording_client = RecordingClient(get_openai_client(), args.cassette)
+            LLMClient(recording_client, MODEL, repo, TOOLS).chat(
+                USER_MESSAGE, SYSTEM_PROMPT
+            )
+            print(f"Recorded {len(recording_client.interactions)} interactions.")
+            return
+
+        replay_client = ReplayClient(args.cassette, latency_scale=args.latency_scale)
+        llm_client = LLMClient(replay_client, MODEL, repo, TOOLS)
+
+        def run_turn() -> None:
+            replay_client.rewind()
+            llm_client.conversation_id = None
+            llm_client.chat(USER_MESSAGE, SYSTEM_PROMPT)
+
+        results = {"chat turn": measure(run_turn, args.repeat)}
+        connection.close()
+
+    print_results(f"LLMClient (latency scale {args.latency_scale})", results)
+    print_results(
+        "Model routes",
+        {
+            name: {
+                "calls": stats.calls,
+                "mean_ms": stats.mean_latency * 1000,
+                "input_tokens": stats.input_tokens,
+                "output_tokens": stats.output_tokens,
+            }
+            for name, stats in llm_client.router.stats.items()
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
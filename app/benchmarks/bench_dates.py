@@ -0,0 +1,54 @@
+"""Benchmark batched date parsing against parsing one date at a time.
+
+Usage:
+    python -m benchmarks.bench_dates --dates 100000 --distinct 1000
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.shared import measure, print_results
+from booking.dates import np, parse_ordinals
+
+
+def create_dates(count: int, distinct: int) -> list[str]:
+    """Create ISO dates drawn from a window of distinct days."""
+    start = date(2030, 1, 1)
+    return [
+        (start + timedelta(days=random.randrange(distinct))).isoformat()
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    """Run the date parsing benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dates", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    values = create_dates(args.dates, args.distinct)
+
+    results = {
+        "fromisoformat": measure(
+            lambda: [date.fromisoformat(str(d)).toordinal() for d in values],
+            args.repeat,
+        ),
+        "parse_ordinals (pure python)": measure(
+            lambda: parse_ordinals(values, use_numpy=False), args.repeat
+        ),
+    }
+    if np is not None:
+        results["parse_ordinals (numpy)"] = measure(
+            lambda: parse_ordinals(values, use_numpy=True), args.repeat
+        )
+
+    print_results(
+        f"Date parsing ({args.dates} dates, {args.distinct} distinct)", results
+    )
+
+
+if __name__ == "__main__":
+    main()
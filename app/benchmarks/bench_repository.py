@@ -0,0 +1,130 @@
+"""Benchmark repository backends.
+
+Usage:
+    python -m benchmarks.bench_repository --backend sqlite --bookings 1000 --rooms 10
+
+The SQL backend writes to the database of AZURE_SQL_CONNECTIONSTRING, whose
+queries commit, so it must be confirmed with --allow-writes. The benchmark
+bookings and rooms are deleted afterwards.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from typing import Any
+
+from benchmarks.shared import measure, print_results
+from booking.config import get_database_connection, get_sqlite_connection
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractRepository, SqliteRepository, SqlRepository
+
+
+def create_bookings(
+    count: int,
+    start: date = date(2030, 1, 1),
+    resource_ids: list[str] | None = None,
+) -> list[Booking]:
+    """Create two-day bookings spread over the resources, without overlaps."""
+    resource_ids = resource_ids or [DEFAULT_RESOURCE]
+
+    return [
+        Booking(
+            f"bench-{i}",
+            [
+                (start + timedelta(days=2 * (i // len(resource_ids)) + d)).isoformat()
+                for d in range(2)
+            ],
+            f"Customer {i}",
+            resource_ids[i % len(resource_ids)],
+        )
+        for i in range(count)
+    ]
+
+
+def run(
+    repo: AbstractRepository,
+    bookings: list[Booking],
+    resource_ids: list[str],
+    repeat: int,
+) -> None:
+    """Load the resources and bookings into the repository and measure its reads."""
+    for resource_id in resource_ids:
+        if resource_id != DEFAULT_RESOURCE:
+            repo.add_resource(resource_id, resource_id)
+
+    loaded = iter(bookings)
+    dates = [random.choice(bookings).dates[0] + timedelta(days=d) for d in range(5)]
+
+    results = {
+        "add": measure(lambda: repo.add(next(loaded)), repeat=len(bookings)),
+        "get": measure(lambda: repo.get(random.choice(bookings).id_), repeat),
+        "get_booked_dates": measure(repo.get_booked_dates, repeat),
+        "get_available_resources": measure(
+            lambda: repo.get_available_resources(dates), repeat
+        ),
+    }
+
+    print_results(
+        f"{type(repo).__name__} ({len(bookings)} bookings, "
+        f"{len(resource_ids)} rooms)",
+        results,
+    )
+
+
+def delete_benchmark_data(connection: Any) -> None:
+    """Delete the bookings and rooms created by the benchmark, and commit.
+
+    Args:
+        connection (Any): The connection to the SQL database.
+    """
+    connection.rollback()
+
+    with connection.cursor() as cursor:
+        # The dates of the bookings are deleted in cascade.
+        cursor.execute("DELETE FROM dbo.booking WHERE id LIKE 'bench-%'")
+        cursor.execute("DELETE FROM dbo.resource WHERE id LIKE 'bench-room-%'")
+
+
+def main() -> None:
+    """Run the repository benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=["sqlite", "sql"], default="sqlite")
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--rooms", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument(
+        "--allow-writes",
+        action="store_true",
+        help="Confirm that the SQL backend may write to the configured database.",
+    )
+    args = parser.parse_args()
+
+    if args.backend == "sql" and not args.allow_writes:
+        parser.error("The SQL backend writes to the configured database, see --help.")
+
+    resource_ids = [DEFAULT_RESOURCE] + [
+        f"bench-room-{i}" for i in range(1, args.rooms)
+    ]
+    bookings = create_bookings(args.bookings, resource_ids=resource_ids)
+
+    if args.backend == "sql":
+        connection = get_database_connection()
+        try:
+            run(SqlRepository(connection), bookings, resource_ids, args.repeat)
+        finally:
+            delete_benchmark_data(connection)
+            connection.close()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        connection = get_sqlite_connection(os.path.join(tmp_dir, "bench.db"))
+        try:
+            run(SqliteRepository(connection), bookings, resource_ids, args.repeat)
+        finally:
+            connection.close()
+
+
+if __name__ == "__main__":
+    main()
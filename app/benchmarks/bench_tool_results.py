@@ -0,0 +1,75 @@
+"""Benchmark the size of tool results sent back to the model.
+
+Tokens are counted with tiktoken when it is installed, and estimated from the
+number of characters otherwise. As results are chained through
+`previous_response_id`, the savings are paid again on every later turn.
+
+Usage:
+    python -m benchmarks.bench_tool_results --turns 10
+"""
+
+import argparse
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from booking.ai.encoders import CompactResultEncoder, JsonResultEncoder
+from booking.ai.ratelimit import CHARS_PER_TOKEN
+
+
+def get_token_counter() -> Callable[[str], int]:
+    """Get a tiktoken counter, or a character based estimate without it."""
+    try:
+        import tiktoken  # pylint: disable=import-outside-toplevel
+
+        encoding = tiktoken.get_encoding("o200k_base")
+    except (ImportError, OSError):
+        print("tiktoken unavailable, estimating tokens from characters.\n")
+        return lambda text: len(text) // CHARS_PER_TOKEN
+
+    return lambda text: len(encoding.encode(text))
+
+
+def create_availability(days: int, booked_every: int) -> dict[str, bool]:
+    """Create an availability result with bookings of two days at intervals."""
+    start = date(2030, 1, 1)
+
+    return {
+        (start + timedelta(days=d)).isoformat(): d % booked_every > 1
+        for d in range(days)
+    }
+
+
+SCENARIOS = {
+    "1 week, mostly free": create_availability(7, 30),
+    "1 month, weekly bookings": create_availability(31, 7),
+    "3 months, weekly bookings": create_availability(92, 7),
+    "1 year, busy": create_availability(365, 4),
+}
+
+
+def main() -> None:
+    """Run the tool results benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    count_tokens = get_token_counter()
+    encoders = {"json": JsonResultEncoder(), "compact": CompactResultEncoder()}
+
+    print(f"{'scenario':<28}{'json':>8}{'compact':>9}{'saved':>8}{'saved/conv':>12}")
+
+    for name, result in SCENARIOS.items():
+        tokens = {
+            key: count_tokens(encoder.encode("check_availability", result))
+            for key, encoder in encoders.items()
+        }
+        saved = tokens["json"] - tokens["compact"]
+
+        print(
+            f"{name:<28}{tokens['json']:>8}{tokens['compact']:>9}"
+            f"{saved / tokens['json']:>8.0%}{saved * args.turns:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Shared benchmarking utilities."""
+
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def measure(func: Callable[[], Any], repeat: int = 100) -> dict[str, float]:
+    """Measure the latency of a function.
+
+    Args:
+        func (Callable[[], Any]): The function to call.
+        repeat (int): The number of calls to measure.
+
+    Returns:
+        dict[str, float]: The minimum, median and 95th percentile latencies
+            in milliseconds.
+    """
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+
+    return {
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[int(0.95 * (len(timings) - 1))],
+    }
+
+
+def print_results(title: str, results: dict[str, dict[str, float | int]]) -> None:
+    """Print benchmark results as an aligned table.
+
+    Integer values, such as counts, are printed without decimals.
+
+    Args:
+        title (str): The benchmark title.
+        results (dict[str, dict[str, float | int]]): Measurements keyed by case
+            name.
+    """
+    print(title)
+
+    if not results:
+        return
+
+    width = max(len(name) for name in results)
+    columns = list(next(iter(results.values())))
+    print("  ".join([" " * width] + [f"{c:>12}" for c in columns]))
+
+    for name, values in results.items():
+        cells = [
+            f"{values[c]:>12d}" if isinstance(values[c], int) else f"{values[c]:>12.3f}"
+            for c in columns
+        ]
+        print("  ".join([name.ljust(width)] + cells))
@@ -0,0 +1,142 @@
+"""Record and replay of OpenAI calls for deterministic, offline runs.
+
+`RecordingClient` wraps an OpenAI client and captures every
+`responses.create` request, response and latency to a JSON cassette file.
+`ReplayClient` serves a cassette back, with the recorded latency or a scaled
+one, so that `LLMClient` can be benchmarked and tested without the live
+service. Both expose the `responses.create` interface used by `LLMClient`.
+"""
+
+import json
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from openai import AzureOpenAI
+from openai.types.responses import Response
+
+
+CASSETTE_VERSION = 1
+# Request fields compared against the cassette on replay by default. Tool
+# definitions and instructions are left out so that docstring edits do not
+# invalidate recordings.
+DEFAULT_MATCH_ON = ("model", "input", "previous_response_id")
+
+
+class CassetteMismatch(ValueError):
+    """Custom exception for requests not matching the replayed cassette."""
+
+
+class RecordingClient:
+    """OpenAI client wrapper recording `responses.create` calls to a cassette."""
+
+    def __init__(self, openai_client: AzureOpenAI, path: str) -> None:
+        self.client = openai_client
+        self.path = path
+        self.responses = self
+        self.interactions = []
+
+    def create(self, **kwargs: Any) -> Response:
+        """Call the wrapped client and record the interaction.
+
+        Returns:
+            Response: The response of the wrapped client.
+        """
+        start = time.perf_counter()
+        response = self.client.responses.create(**kwargs)
+        latency = time.perf_counter() - start
+
+        self.interactions.append(
+            {
+                "request": _to_json(
+                    {k: v for k, v in kwargs.items() if k != "timeout"}
+                ),
+                "response": response.model_dump(mode="json"),
+                "latency": latency,
+            }
+        )
+        self.save()
+
+        return response
+
+    def save(self) -> None:
+        """Write the interactions recorded so far to the cassette file."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": self.interactions},
+                f,
+                indent=2,
+            )
+
+
+class ReplayClient:
+    """Fake OpenAI client serving the interactions of a cassette in order."""
+
+    def __init__(
+        self,
+        path: str,
+        latency_scale: float = 1.0,
+        match_on: Iterable[str] | None = DEFAULT_MATCH_ON,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the replay client.
+
+        Args:
+            path (str): The path of the cassette file.
+            latency_scale (float): The factor applied to the recorded latencies,
+                0 to replay without waiting.
+            match_on (Iterable[str] | None): The request fields which must match
+                the recorded ones, or None to skip request matching.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            cassette = json.load(f)
+
+        if cassette.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {path}.")
+
+        self.path = path
+        self.interactions = cassette["interactions"]
+        self.latency_scale = latency_scale
+        self.match_on = tuple(match_on) if match_on is not None else ()
+        self.sleep = sleep
+        self.responses = self
+        self.position = 0
+
+    def create(self, **kwargs: Any) -> Response:
+        """Return the next recorded response after the scaled latency.
+
+        Raises:
+            CassetteMismatch: If the cassette is exhausted, or the request does
+                not match the recorded one.
+
+        Returns:
+            Response: The recorded response.
+        """
+        if self.position >= len(self.interactions):
+            raise CassetteMismatch(f"No more interactions in {self.path}.")
+
+        interaction = self.interactions[self.position]
+        request = _to_json(kwargs)
+
+        for field in self.match_on:
+            if request.get(field) != interaction["request"].get(field):
+                raise CassetteMismatch(
+                    f"Request field '{field}' of interaction {self.position} "
+                    f"does not match {self.path}."
+                )
+
+        self.position += 1
+
+        if self.latency_scale > 0:
+            self.sleep(interaction["latency"] * self.latency_scale)
+
+        return Response.model_validate(interaction["response"])
+
+    def rewind(self) -> None:
+        """Replay the cassette from its first interaction again."""
+        self.position = 0
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a request to its JSON representation, as stored in cassettes."""
+    return json.loads(json.dumps(value, default=str))
@@ -1,21 +1,62 @@
 """Client for interacting with LLMs."""
 
+import functools
 import importlib
 import json
 import logging
+import sqlite3
+import time
 from collections.abc import Callable
 from typing import Any
 
-from openai import AzureOpenAI
-from openai.types.responses import ResponseFunctionToolCall
-
+import pyodbc
+from openai import APITimeoutError, AzureOpenAI
+from openai.types.responses import Response, ResponseFunctionToolCall
+
+from booking.ai.encoders import JsonResultEncoder, ResultEncoder
+from booking.ai.isolation import (
+    ToolMemoryExceeded,
+    ToolPool,
+    ToolResultTooLarge,
+    ToolTimeout,
+    ToolWorkerCrashed,
+)
+from booking.ai.ratelimit import AdaptiveRateLimiter, estimate_tokens
+from booking.ai.routing import ModelRouter, Route
 from booking.ai.tools import get_tool_definition
+from booking.ai.validators import Validator, compile_validator
+from booking.cache import Prefetcher
+from booking.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    deadline_scope,
+    get_current_deadline,
+)
+from booking.logs import turn_scope
+from booking.model import InvalidBookingDates
+from booking.profiling import TurnProfiler
 from booking.repository import AbstractRepository
+from booking.services import UnknownRoomError
 
 
 logger = logging.getLogger("app")
 
 
+@functools.cache
+def compile_tool(tool: Callable) -> tuple[dict[str, Any], Validator]:
+    """Generate the definition and the argument validator of a tool, once.
+
+    Args:
+        tool (Callable): The tool function.
+
+    Returns:
+        tuple[dict[str, Any], Validator]: The tool definition, shared by all
+            clients and not to be modified, and its validator.
+    """
+    tool_definition = get_tool_definition(tool)
+    return tool_definition, compile_validator(tool_definition)
+
+
 class LLMClient:
     """Client for interacting with LLMs."""
 
@@ -25,24 +66,98 @@ class LLMClient:
         model: str,
         repository: AbstractRepository,
         tools: list[tuple[str, str]],
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        result_encoder: ResultEncoder | None = None,
+        prefetcher: Prefetcher | None = None,
+        turn_timeout: float | None = None,
+        profiler: TurnProfiler | None = None,
+        router: ModelRouter | None = None,
+        tool_pool: ToolPool | None = None,
     ):
-        self.client = openai_client
+        if router is not None and router.default != model:
+            raise ValueError(
+                f"The default model of the router, {router.default}, is not {model}."
+            )
+
+        # Throttled calls are retried by the limiter, which backs off all callers
+        # together, so the SDK must not retry them first on its own timer.
+        self.client = (
+            openai_client.with_options(max_retries=0) if rate_limiter else openai_client
+        )
         self.model = model
+        self.router = router or ModelRouter(model)
+        self.tool_pool = tool_pool
         self.repository = repository
-
-        self.tools = self._resolve_tools(tools) if tools else {}
-
-        tools_definition = []
-        for tool in self.tools.values():
-            tools_definition.append(get_tool_definition(tool))
+        self.rate_limiter = rate_limiter
+        self.result_encoder = result_encoder or JsonResultEncoder()
+        self.prefetcher = prefetcher
+        self.turn_timeout = turn_timeout
+        self.profiler = profiler or TurnProfiler.from_environment()
+
+        with self.profiler.profile("tools"):
+            self.tools = self._resolve_tools(tools) if tools else {}
+
+            tools_definition = []
+            validators = {}
+            for name, tool in self.tools.items():
+                tool_definition, validators[name] = compile_tool(tool)
+                tools_definition.append(tool_definition)
+
+        # The repository cannot be shared with worker processes.
+        for name in tool_pool.tools if tool_pool else ():
+            if name not in self.tools:
+                raise ValueError(f"Isolated tool {name} is not a tool of the client.")
+            if "repo" in compile_tool(self.tools[name])[0]["parameters"]["properties"]:
+                raise ValueError(f"Isolated tool {name} cannot use the repository.")
 
         self.tools_definition = tools_definition
+        self.validators = validators
         self.conversation_id = None
 
-    def chat(self, user_message: str, system_prompt: str = None) -> str:
-        """Process a user message and return the LLM response."""
-        response = self.client.responses.create(
-            model=self.model,
+    def chat(
+        self,
+        user_message: str,
+        system_prompt: str = None,
+        timeout: float = None,
+        profile: bool = False,
+    ) -> str:
+        """Process a user message and return the LLM response.
+
+        Args:
+            user_message (str): The message of the user.
+            system_prompt (str): The instructions given to the model.
+            timeout (float): The time budget of the turn in seconds, covering the
+                model calls, tool calls and repository queries. Defaults to the
+                `turn_timeout` of the client.
+            profile (bool): Whether to profile this turn regardless of sampling.
+
+        Raises:
+            DeadlineExceeded: If the turn did not complete within its time budget.
+                The conversation is then left as it was before the turn.
+
+        Returns:
+            str: The response of the model.
+        """
+        timeout = self.turn_timeout if timeout is None else timeout
+        deadline = Deadline(timeout) if timeout is not None else None
+
+        with (
+            turn_scope(),
+            self.profiler.profile("chat", force=profile),
+            deadline_scope(deadline),
+        ):
+            return self._chat(user_message, system_prompt)
+
+    def _chat(self, user_message: str, system_prompt: str) -> str:
+        """Process a user message within the current deadline."""
+        deadline = get_current_deadline()
+
+        # Warm the data the tools are likely to need while the model generates.
+        if self.prefetcher:
+            self.prefetcher.start()
+
+        response = self._create_response(
+            self.router.route_message(user_message),
             instructions=system_prompt,
             input=user_message,
             previous_response_id=self.conversation_id,
@@ -52,26 +167,37 @@ class LLMClient:
         # Process tool calls if any
         tool_messages = []
 
+        # The prefetch may share the connection of the repository with the tools.
+        if self.prefetcher and any(
+            isinstance(output, ResponseFunctionToolCall) for output in response.output
+        ):
+            self._wait_for_prefetch()
+
         for output in response.output:
             if isinstance(output, ResponseFunctionToolCall):
                 function_name = output.name
-                arguments = json.loads(output.arguments)
+                try:
+                    arguments = json.loads(output.arguments)
+                except json.JSONDecodeError:
+                    arguments = None
 
                 # Process function call
+                if deadline:
+                    deadline.check("tool call")
                 result = self._process_tool_call(function_name, arguments)
 
                 tool_messages.append(
                     {
                         "type": "function_call_output",
                         "call_id": output.call_id,
-                        "output": json.dumps(result),
+                        "output": self.result_encoder.encode(function_name, result),
                     }
                 )
 
         # If there were tool calls, send their results back to the LLM
         if tool_messages:
-            response = self.client.responses.create(
-                model=self.model,
+            response = self._create_response(
+                self.router.route_tool_results(),
                 input=tool_messages,
                 previous_response_id=response.id,
             )
@@ -80,6 +206,75 @@ class LLMClient:
 
         return response.output_text
 
+    def _wait_for_prefetch(self) -> None:
+        """Wait for the running prefetch, if any, within the current deadline.
+
+        Raises:
+            DeadlineExceeded: If the deadline passed before the prefetch completed.
+        """
+        deadline = get_current_deadline()
+
+        try:
+            self.prefetcher.wait(deadline.remaining() if deadline else None)
+        except TimeoutError as exc:
+            raise DeadlineExceeded("prefetch") from exc
+
+    def _create_response(self, route: Route, **kwargs: Any) -> Response:
+        """Create a model response, within the rate limits if a limiter is set.
+
+        The request is sent to the model of the route, and times out with the
+        current deadline, if any. Its latency, including any wait for the rate
+        limiter, and token use are recorded on the route.
+
+        Args:
+            route (Route): The route of the call, see `ModelRouter`.
+
+        Raises:
+            DeadlineExceeded: If the deadline passed before or during the call.
+
+        Returns:
+            Response: The model response.
+        """
+        deadline = get_current_deadline()
+        if deadline:
+            deadline.check("model call")
+            kwargs["timeout"] = deadline.remaining()
+
+        kwargs["model"] = route.model
+        start = time.perf_counter()
+
+        try:
+            if not self.rate_limiter:
+                response = self.client.responses.create(**kwargs)
+            else:
+                response = self.rate_limiter.call(
+                    self.client.responses.create, estimate_tokens(**kwargs), **kwargs
+                )
+        except APITimeoutError as exc:
+            self.router.record_error(route)
+            if deadline and deadline.expired:
+                raise DeadlineExceeded("model call") from exc
+            raise
+        except Exception:
+            self.router.record_error(route)
+            raise
+
+        seconds = time.perf_counter() - start
+        self.router.record(route, seconds, response.usage)
+        logger.debug(
+            "Model call %s took %.3fs.",
+            route.name,
+            seconds,
+            extra={
+                "event": "model_call",
+                "route": route.name,
+                "model": route.model,
+                "seconds": seconds,
+            },
+        )
+
+        return response
+
     def _resolve_tools(self, tools: list[tuple[str, str]]) -> dict[str, Callable]:
         """Resolve functions from the provided tool definitions.
         This method imports the specified modules and retrieves the specified
@@ -142,16 +337,63 @@ class LLMClient:
     def _process_tool_call(self, function_name: str, arguments: dict[str, Any]) -> Any:
         """Call the specified tool with the provided arguments and returns its result.
 
+        The arguments are validated first. Unknown tools and invalid arguments are
+        reported back to the model as an error result, without calling the tool.
+        Tools isolated by the tool pool run in its worker processes, and their
+        timeouts, memory errors and oversized results are reported as error
+        results too, as are unknown rooms, invalid booking dates and dates
+        already booked.
+
         Args:
             function_name (str): The name of the tool to call.
             arguments (dict[str, Any]): The keyword arguments to pass to the tool.
 
         Returns:
-            Any: The result of the tool call.
+            Any: The result of the tool call, or an error result.
         """
-        func = self.tools.get(function_name)
+        validator = self.validators.get(function_name)
+        if validator is None:
+            logger.warning("The model called the unknown tool %s.", function_name)
+            return {"error": f"Unknown tool '{function_name}'."}
+
+        errors = validator(arguments)
+        if errors:
+            logger.debug("Invalid arguments for tool %s: %s", function_name, errors)
+            return {"error": "Invalid arguments.", "details": errors}
+
+        func = self.tools[function_name]
 
         if "repo" in arguments:
             arguments["repo"] = self.repository
 
-        return func(**arguments)
+        start = time.perf_counter()
+        if self.tool_pool and function_name in self.tool_pool.tools:
+            try:
+                result = self.tool_pool.call(func, arguments)
+            except (
+                ToolTimeout,
+                ToolResultTooLarge,
+                ToolMemoryExceeded,
+                ToolWorkerCrashed,
+            ) as exc:
+                logger.warning("Isolated tool %s failed: %s", function_name, exc)
+                return {"error": f"The tool '{function_name}' failed to complete."}
+        else:
+            try:
+                result = func(**arguments)
+            except (UnknownRoomError, InvalidBookingDates) as exc:
+                logger.debug("Tool %s rejected its arguments: %s", function_name, exc)
+                return {"error": str(exc)}
+            except (pyodbc.IntegrityError, sqlite3.IntegrityError) as exc:
+                logger.debug("Tool %s conflicts with a booking: %s", function_name, exc)
+                return {"error": "The dates are already booked."}
+        seconds = time.perf_counter() - start
+
+        logger.debug(
+            "Tool call %s took %.3fs.",
+            function_name,
+            seconds,
+            extra={"event": "tool_call", "tool": function_name, "seconds": seconds},
+        )
+
+        return result
@@ -0,0 +1,197 @@
+"""Encoders serializing tool results sent back to the model."""
+
+import json
+from datetime import date
+from typing import Any, Protocol
+
+from booking.dates import format_run
+
+
+class ResultEncoder(Protocol):
+    """Interface for tool result encoders."""
+
+    def encode(self, function_name: str, result: Any) -> str:
+        """Serialize the result of a tool call."""
+
+
+class JsonResultEncoder:
+    """Encode tool results as plain JSON."""
+
+    def encode(self, function_name: str, result: Any) -> str:
+        """Serialize the result of a tool call.
+
+        Args:
+            function_name (str): The name of the tool that was called.
+            result (Any): The result of the tool call.
+
+        Returns:
+            str: The JSON encoded result.
+        """
+        return json.dumps(result)
+
+
+class CompactResultEncoder:
+    """Encode tool results as compact JSON, within a size cap per tool.
+
+    Availability maps such as `{"2023-10-01": true, ...}` are range-compressed
+    into runs of consecutive available and booked dates. Results over the cap
+    are trimmed item by item, so that the model still receives valid JSON.
+    """
+
+    def __init__(
+        self, max_chars: dict[str, int] | None = None, default_max_chars: int = 4000
+    ) -> None:
+        """Initialize the encoder.
+
+        Args:
+            max_chars (dict[str, int] | None): The size caps per tool name.
+            default_max_chars (int): The size cap of tools not in `max_chars`.
+        """
+        self.max_chars = max_chars or {}
+        self.default_max_chars = default_max_chars
+
+    def encode(self, function_name: str, result: Any) -> str:
+        """Serialize the result of a tool call.
+
+        Args:
+            function_name (str): The name of the tool that was called.
+            result (Any): The result of the tool call.
+
+        Returns:
+            str: The compact JSON encoded result. When it exceeds the size cap
+                of the tool, `{"result": <trimmed result>, "truncated": <number
+                of dropped items>}` instead, with as many items as fit.
+        """
+        if is_availability(result):
+            result = compress_availability(result)
+
+        text = _dumps(result)
+        max_chars = self.max_chars.get(function_name, self.default_max_chars)
+
+        if len(text) <= max_chars:
+            return text
+
+        # Binary search of the largest number of items kept per list and dict
+        # within the cap, as the size grows with it.
+        low, high = 0, _max_length(result) - 1
+        while low < high:
+            limit = (low + high + 1) // 2
+            if len(_dumps_trimmed(result, limit)) <= max_chars:
+                low = limit
+            else:
+                high = limit - 1
+
+        return _dumps_trimmed(result, low)
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value as compact JSON."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _dumps_trimmed(value: Any, limit: int) -> str:
+    """Serialize a value trimmed to `limit` items, with the number dropped."""
+    trimmed, dropped = _trim(value, limit)
+    return _dumps({"result": trimmed, "truncated": dropped})
+
+
+def _trim(value: Any, limit: int) -> tuple[Any, int]:
+    """Trim a value to `limit` items per list and dict, or characters if a string.
+
+    Strings within lists and dicts, such as dates, are kept whole, and only a
+    string result is cut to `limit` characters.
+
+    Returns:
+        tuple[Any, int]: The trimmed value, and the number of items dropped.
+    """
+    if isinstance(value, str):
+        return value[:limit], max(0, len(value) - limit)
+
+    return _trim_items(value, limit)
+
+
+def _trim_items(value: Any, limit: int) -> tuple[Any, int]:
+    """Keep the first `limit` items of every list and dict in a value."""
+    if isinstance(value, (list, tuple)):
+        items = [_trim_items(v, limit) for v in value[:limit]]
+        dropped = max(0, len(value) - limit) + sum(n for _, n in items)
+        return [v for v, _ in items], dropped
+
+    if isinstance(value, dict):
+        entries = [(k, *_trim_items(v, limit)) for k, v in list(value.items())[:limit]]
+        dropped = max(0, len(value) - limit) + sum(n for _, _, n in entries)
+        return {k: v for k, v, _ in entries}, dropped
+
+    return value, 0
+
+
+def _max_length(value: Any) -> int:
+    """Get the length of a string, or of the longest list or dict in a value."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return max([len(value), *map(_max_items, value)])
+    if isinstance(value, dict):
+        return max([len(value), *map(_max_items, value.values())])
+    return 0
+
+
+def _max_items(value: Any) -> int:
+    """Get the length of the longest list or dict in a value, ignoring strings."""
+    return 0 if isinstance(value, str) else _max_length(value)
+
+
+def is_availability(result: Any) -> bool:
+    """Check whether a result is a non-empty map of ISO dates to booleans."""
+    if not isinstance(result, dict) or not result:
+        return False
+
+    try:
+        return all(
+            isinstance(v, bool) and date.fromisoformat(k) for k, v in result.items()
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def compress_availability(availability: dict[str, bool]) -> dict[str, list]:
+    """Compress an availability map into runs of consecutive dates.
+
+    Args:
+        availability (dict[str, bool]): Dates in ISO format mapped to their
+            availability.
+
+    Returns:
+        dict[str, list]: The available and booked dates, as single ISO dates
+            or `[first, last]` ranges of consecutive dates.
+
+    Example:
+        >>> compress_availability(
+        ...     {"2023-10-01": True, "2023-10-02": True, "2023-10-03": False}
+        ... )
+        {'available': [['2023-10-01', '2023-10-02']], 'booked': ['2023-10-03']}
+    """
+    runs = {True: [], False: []}
+    dates = sorted((date.fromisoformat(k), v) for k, v in availability.items())
+
+    start = end = None
+    current = None
+
+    for date_, available in dates:
+        if (
+            start is not None
+            and available == current
+            and date_.toordinal() == end.toordinal() + 1
+        ):
+            end = date_
+            continue
+
+        if start is not None:
+            runs[current].append(format_run(start, end))
+        start = end = date_
+        current = available
+
+    if start is not None:
+        runs[current].append(format_run(start, end))
+
+    return {"available": runs[True], "booked": runs[False]}
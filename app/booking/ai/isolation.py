@@ -0,0 +1,308 @@
+"""Execution of designated tools in a pool of worker processes.
+
+Tools resolved from arbitrary modules run in the process of the client by
+default, where a CPU-heavy tool holds the GIL and a hanging one blocks the
+turn. A `ToolPool` runs the tools designated for isolation in warm worker
+processes instead, with a per-call timeout, a memory limit per worker and a
+limit on the size of results. A worker exceeding its limits is replaced.
+Isolated tools cannot use the repository, which is not shared with workers,
+so I/O-bound tools stay in-process.
+"""
+
+import logging
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Memory limits are only set on Unix
+    resource = None
+
+from booking.deadline import DeadlineExceeded, get_current_deadline
+
+
+logger = logging.getLogger("app")
+
+
+class ToolTimeout(TimeoutError):
+    """Custom exception for isolated tool calls exceeding their timeout."""
+
+
+class ToolResultTooLarge(ValueError):
+    """Custom exception for isolated tool results exceeding the size limit."""
+
+
+class ToolMemoryExceeded(MemoryError):
+    """Custom exception for isolated tool calls exceeding the worker memory limit."""
+
+
+class ToolWorkerCrashed(RuntimeError):
+    """Custom exception for worker processes exiting during a tool call."""
+
+
+@dataclass
+class ToolPoolStats:
+    """Counters of isolated tool calls and of their serialization costs."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    crashes: int = 0
+    memory_errors: int = 0
+    pickle_seconds: float = 0.0
+    unpickle_seconds: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+class ToolPool:
+    """Pool of warm worker processes running isolated tools."""
+
+    def __init__(
+        self,
+        tools: Iterable[str],
+        max_workers: int = 2,
+        timeout: float = 10.0,
+        memory_limit: int | None = None,
+        max_result_bytes: int = 1_000_000,
+        start_method: str = "spawn",
+    ) -> None:
+        """Initialize the pool. Workers are started by `start` or the first call.
+
+        Args:
+            tools (Iterable[str]): The names of the tools to isolate.
+            max_workers (int): The number of worker processes.
+            timeout (float): The maximum duration of a call in seconds.
+            memory_limit (int | None): The maximum address space of a worker in
+                bytes, or None for no limit. Only enforced on Unix.
+            max_result_bytes (int): The maximum size of a pickled result.
+            start_method (str): The multiprocessing start method of the workers.
+        """
+        if max_workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+
+        self.tools = frozenset(tools)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_result_bytes = max_result_bytes
+        self.context = multiprocessing.get_context(start_method)
+        self.stats = ToolPoolStats()
+
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        """Start the worker processes, unless already started."""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.max_workers):
+                self._idle.put(self._spawn())
+            self._started = True
+
+    def close(self) -> None:
+        """Stop the idle worker processes."""
+        with self._lock:
+            while not self._idle.empty():
+                self._idle.get_nowait().stop()
+            self._started = False
+
+    def call(self, func: Callable, arguments: dict[str, Any]) -> Any:
+        """Run a tool in a worker process.
+
+        The call times out with the pool timeout, or the current deadline if
+        sooner. Every call is counted in the stats, and the ones raising an
+        exception are counted as failures too.
+
+        Args:
+            func (Callable): The tool, a module-level function.
+            arguments (dict[str, Any]): The keyword arguments of the tool.
+
+        Raises:
+            ToolTimeout: If the call did not complete in time.
+            ToolResultTooLarge: If the pickled result exceeds `max_result_bytes`.
+            ToolMemoryExceeded: If the tool ran out of memory under the memory
+                limit of the worker, which is then replaced.
+            ToolWorkerCrashed: If the worker process exited during the call, or
+                its result could not be unpickled.
+            DeadlineExceeded: If the deadline passed before or during the call.
+            Exception: Any exception raised by the tool itself.
+
+        Returns:
+            Any: The result of the tool.
+        """
+        with self._lock:
+            self.stats.calls += 1
+
+        try:
+            return self._call(func, arguments)
+        except Exception:
+            with self._lock:
+                self.stats.failures += 1
+            raise
+
+    def _call(self, func: Callable, arguments: dict[str, Any]) -> Any:
+        """Run a tool in a worker process, see `call`."""
+        self.start()
+
+        deadline = get_current_deadline()
+        timeout = self.timeout
+        if deadline:
+            deadline.check("tool call")
+            timeout = min(timeout, deadline.remaining())
+
+        # The wait for a free worker counts towards the timeout of the call.
+        end = time.monotonic() + timeout
+
+        start = time.perf_counter()
+        payload = pickle.dumps((func, arguments), protocol=pickle.HIGHEST_PROTOCOL)
+        pickle_seconds = time.perf_counter() - start
+
+        try:
+            worker = self._idle.get(timeout=max(0.0, end - time.monotonic()))
+        except queue.Empty as exc:
+            raise ToolTimeout(f"No worker was free to run {func.__name__}.") from exc
+
+        try:
+            data = worker.run(payload, end - time.monotonic())
+        except TimeoutError as exc:
+            self._replace(worker, timeouts=1)
+            if deadline and deadline.expired:
+                raise DeadlineExceeded("tool call") from exc
+            raise ToolTimeout(f"Tool {func.__name__} timed out.") from exc
+        except (EOFError, OSError) as exc:
+            self._replace(worker, crashes=1)
+            raise ToolWorkerCrashed(f"Worker crashed running {func.__name__}.") from exc
+
+        start = time.perf_counter()
+        try:
+            status, value = pickle.loads(data)
+        except Exception as exc:
+            self._replace(worker, crashes=1)
+            raise ToolWorkerCrashed(
+                f"The result of {func.__name__} could not be unpickled."
+            ) from exc
+        unpickle_seconds = time.perf_counter() - start
+
+        if status == "memory":
+            self._replace(worker, memory_errors=1)
+        else:
+            self._idle.put(worker)
+
+        with self._lock:
+            self.stats.pickle_seconds += pickle_seconds
+            self.stats.unpickle_seconds += unpickle_seconds
+            self.stats.bytes_sent += len(payload)
+            self.stats.bytes_received += len(data)
+
+        if status == "memory":
+            raise ToolMemoryExceeded(
+                f"Tool {func.__name__} exceeded the memory limit of "
+                f"{self.memory_limit} bytes."
+            )
+        if status == "too_large":
+            raise ToolResultTooLarge(
+                f"The result of {func.__name__} is {value} bytes, "
+                f"over the limit of {self.max_result_bytes}."
+            )
+        if status == "error":
+            raise value
+
+        return value
+
+    def _spawn(self) -> "_Worker":
+        """Start a new worker process."""
+        return _Worker(self.context, self.memory_limit, self.max_result_bytes)
+
+    def _replace(
+        self,
+        worker: "_Worker",
+        timeouts: int = 0,
+        crashes: int = 0,
+        memory_errors: int = 0,
+    ) -> None:
+        """Kill a worker in an unknown state and start a replacement."""
+        worker.stop()
+        logger.warning("Replaced an isolated tool worker.")
+
+        with self._lock:
+            self.stats.timeouts += timeouts
+            self.stats.crashes += crashes
+            self.stats.memory_errors += memory_errors
+
+        self._idle.put(self._spawn())
+
+
+class _Worker:
+    """A worker process and the pipe to it."""
+
+    def __init__(
+        self, context: Any, memory_limit: int | None, max_result_bytes: int
+    ) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection, memory_limit, max_result_bytes),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+
+    def run(self, payload: bytes, timeout: float) -> bytes:
+        """Send a call to the worker and wait for its pickled result."""
+        self.connection.send_bytes(payload)
+
+        if not self.connection.poll(max(0.0, timeout)):
+            raise TimeoutError()
+
+        return self.connection.recv_bytes()
+
+    def stop(self) -> None:
+        """Kill the worker process."""
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+def _worker_main(
+    connection: Any, memory_limit: int | None, max_result_bytes: int
+) -> None:
+    """Run tool calls received from the pool until the pipe is closed."""
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    while True:
+        try:
+            payload = connection.recv_bytes()
+        except EOFError:
+            return
+
+        try:
+            func, arguments = pickle.loads(payload)
+            data = pickle.dumps(("ok", func(**arguments)), pickle.HIGHEST_PROTOCOL)
+        except MemoryError:
+            # Reported apart, as the worker may be left in an unknown state.
+            data = pickle.dumps(("memory", None))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            data = _pickle_error(exc)
+
+        if len(data) > max_result_bytes:
+            data = pickle.dumps(("too_large", len(data)))
+
+        connection.send_bytes(data)
+
+
+def _pickle_error(exc: Exception) -> bytes:
+    """Pickle an exception raised by a tool, or a description of it."""
+    try:
+        return pickle.dumps(("error", exc), pickle.HIGHEST_PROTOCOL)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return pickle.dumps(("error", RuntimeError(f"{type(exc).__name__}: {exc}")))
@@ -0,0 +1,277 @@
+"""Client-side rate limiting for OpenAI calls.
+
+Requests and tokens per minute are metered with token buckets sized just
+under the deployment quota, and concurrency is adjusted with AIMD: it grows
+additively while calls succeed and is cut multiplicatively when the service
+throttles. A throttled call pauses every caller sharing the limiter for the
+`retry-after` period, so workers back off together instead of each retrying on
+its own timer.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from openai import RateLimitError
+
+from booking.deadline import Deadline, DeadlineExceeded, get_current_deadline
+
+
+logger = logging.getLogger("app")
+
+# Rough number of characters per token, used to estimate request sizes.
+CHARS_PER_TOKEN = 4
+# Pause applied when a throttling response does not say how long to wait.
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity."""
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+
+        self._tokens = capacity
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take tokens from the bucket, going into debt if needed.
+
+        Args:
+            amount (float): The number of tokens to take.
+
+        Returns:
+            float: The number of seconds to wait before the reservation is
+                covered by the refill.
+        """
+        self._refill()
+        self._tokens -= min(amount, self.capacity)
+
+        if self._tokens >= 0:
+            return 0.0
+
+        return -self._tokens / self.refill_per_second
+
+    def refund(self, amount: float) -> None:
+        """Give tokens back to the bucket, or take more if `amount` is negative."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last update."""
+        now = self.clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(
+            self.capacity, self._tokens + elapsed * self.refill_per_second
+        )
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket rate limiter with AIMD concurrency control.
+
+    A single instance is meant to be shared by all sessions of a process, see
+    `config.get_rate_limiter`.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int = 16,
+        headroom: float = 0.9,
+        max_retries: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute (int): The deployment requests per minute quota.
+            tokens_per_minute (int): The deployment tokens per minute quota.
+            max_concurrency (int): The maximum number of concurrent calls.
+            headroom (float): The fraction of the quotas to use.
+            max_retries (int): The number of retries of a throttled call.
+        """
+        if not 0 < headroom <= 1:
+            raise ValueError("The headroom must be in the (0, 1] range.")
+
+        rpm = requests_per_minute * headroom
+        tpm = tokens_per_minute * headroom
+
+        self.requests = TokenBucket(rpm, rpm / 60, clock)
+        self.tokens = TokenBucket(tpm, tpm / 60, clock)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.clock = clock
+        self.sleep = sleep
+
+        self.concurrency = float(max_concurrency)
+        self.throttled = 0
+
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def call(self, func: Callable[..., Any], tokens: int, **kwargs: Any) -> Any:
+        """Call `func(**kwargs)` within the limits, retrying when throttled.
+
+        Under a deadline, the waits for a slot and for capacity are bounded by
+        the remaining time, and each attempt gets the remaining time as its
+        `timeout` argument.
+
+        Args:
+            func (Callable[..., Any]): The function performing the OpenAI call.
+            tokens (int): The estimated number of tokens used by the call.
+
+        Raises:
+            RateLimitError: If the call is still throttled after all retries.
+            DeadlineExceeded: If the deadline passes, or would pass, before an
+                attempt can be made.
+
+        Returns:
+            Any: The result of the call.
+        """
+        deadline = get_current_deadline()
+        attempt = 0
+
+        while True:
+            if deadline:
+                deadline.check("rate limit")
+
+            with self._slot(deadline):
+                self._wait_for_capacity(tokens, deadline)
+
+                if deadline:
+                    kwargs["timeout"] = deadline.remaining()
+
+                try:
+                    response = func(**kwargs)
+                except RateLimitError as exc:
+                    retry_after = get_retry_after(exc)
+                    self._on_throttle(tokens, retry_after)
+
+                    if attempt >= self.max_retries:
+                        raise
+
+                    attempt += 1
+                    logger.warning(
+                        "Throttled by OpenAI, retrying after %s seconds (%d/%d).",
+                        retry_after,
+                        attempt,
+                        self.max_retries,
+                    )
+                    continue
+
+            self._on_success(tokens, response)
+            return response
+
+    @contextmanager
+    def _slot(self, deadline: Deadline | None = None) -> Iterator[None]:
+        """Hold one of the concurrency slots for the duration of a call."""
+        with self._condition:
+            while self._in_flight >= max(1, int(self.concurrency)):
+                if not self._condition.wait(deadline.remaining() if deadline else None):
+                    raise DeadlineExceeded("rate limit")
+            self._in_flight += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def _wait_for_capacity(self, tokens: int, deadline: Deadline | None = None) -> None:
+        """Reserve a request and its tokens, then wait until they are available.
+
+        Raises:
+            DeadlineExceeded: If the wait would outlast the deadline. The
+                reservation is then given back.
+        """
+        with self._condition:
+            delay = max(
+                self.requests.reserve(1),
+                self.tokens.reserve(tokens),
+                self._paused_until - self.clock(),
+            )
+
+            if deadline and delay > deadline.remaining():
+                self.requests.refund(1)
+                self.tokens.refund(tokens)
+                raise DeadlineExceeded("rate limit")
+
+        if delay > 0:
+            self.sleep(delay)
+
+    def _on_success(self, tokens: int, response: Any) -> None:
+        """Grow concurrency additively and settle the token estimate."""
+        usage = getattr(response, "usage", None)
+        actual = getattr(usage, "total_tokens", None)
+
+        with self._condition:
+            self.concurrency = min(
+                self.max_concurrency, self.concurrency + 1 / self.concurrency
+            )
+            if isinstance(actual, int):
+                self.tokens.refund(tokens - actual)
+            self._condition.notify()
+
+    def _on_throttle(self, tokens: int, retry_after: float | None) -> None:
+        """Halve concurrency and pause every caller for the retry period."""
+        with self._condition:
+            self.throttled += 1
+            self.tokens.refund(tokens)
+            self.concurrency = max(1.0, self.concurrency / 2)
+
+            if retry_after is None:
+                retry_after = DEFAULT_RETRY_AFTER
+            self._paused_until = max(self._paused_until, self.clock() + retry_after)
+
+
+def get_retry_after(exc: RateLimitError) -> float | None:
+    """Get the retry delay in seconds requested by a throttling response.
+
+    Args:
+        exc (RateLimitError): The throttling error.
+
+    Returns:
+        float | None: The number of seconds to wait, if the response says so.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+
+    return None
+
+
+def estimate_tokens(**kwargs: Any) -> int:
+    """Estimate the number of tokens of a `responses.create` call.
+
+    Returns:
+        int: The estimated number of input tokens, plus the output allowance
+            given by `max_output_tokens` when set.
+    """
+    payload = {k: kwargs.get(k) for k in ("instructions", "input", "tools")}
+    size = len(json.dumps(payload, default=str))
+
+    return size // CHARS_PER_TOKEN + (kwargs.get("max_output_tokens") or 0)
@@ -0,0 +1,160 @@
+"""Routing of the model calls of a turn to model deployments.
+
+A turn makes up to two model calls: one answering the user message, and a
+follow-up turning tool results into the reply. The follow-up mostly rephrases
+a small availability result, and a user message giving explicit dates leaves
+little to interpret, so both can be routed to a smaller, faster deployment
+while other messages go to the default one. Latency and token use are
+recorded per route to measure the effect.
+"""
+
+import os
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+
+DEFAULT_ROUTE = "default"
+SIMPLE_ROUTE = "simple"
+TOOL_RESULTS_ROUTE = "tool_results"
+# Longest user message, in words, considered simple.
+SIMPLE_MAX_WORDS = 30
+
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+
+
+class Route(NamedTuple):
+    """The route of a model call, and the model it is sent to."""
+
+    name: str
+    model: str
+
+
+@dataclass
+class RouteStats:
+    """Latency and token use of the calls of a route."""
+
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean duration of the successful calls, in seconds."""
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+def is_simple_message(user_message: str) -> bool:
+    """Check whether a user message is short and gives its dates explicitly.
+
+    Args:
+        user_message (str): The message of the user.
+
+    Returns:
+        bool: True if the message can be answered by a smaller model.
+    """
+    return (
+        len(user_message.split()) <= SIMPLE_MAX_WORDS
+        and _ISO_DATE.search(user_message) is not None
+    )
+
+
+class ModelRouter:
+    """Routing policy choosing the model of each call of a turn.
+
+    Without a `simple` or `tool_results` model, every call goes to the default
+    model, as with a single fixed model.
+    """
+
+    def __init__(
+        self,
+        default: str,
+        simple: str | None = None,
+        tool_results: str | None = None,
+        is_simple: Callable[[str], bool] = is_simple_message,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            default (str): The model of ambiguous or complex user messages.
+            simple (str | None): The model of simple user messages, if any.
+            tool_results (str | None): The model of the calls answering with tool
+                results, if any.
+            is_simple (Callable[[str], bool]): The classifier of simple messages.
+        """
+        self.default = default
+        self.simple = simple
+        self.tool_results = tool_results
+        self.is_simple = is_simple
+        self.stats: dict[str, RouteStats] = {}
+
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, default: str) -> "ModelRouter":
+        """Create a router with the models of the environment.
+
+        The smaller models are read from the OPENAI_SIMPLE_MODEL and
+        OPENAI_TOOL_RESULTS_MODEL environment variables.
+
+        Args:
+            default (str): The default model.
+
+        Returns:
+            ModelRouter: The router.
+        """
+        return cls(
+            default,
+            simple=os.getenv("OPENAI_SIMPLE_MODEL") or None,
+            tool_results=os.getenv("OPENAI_TOOL_RESULTS_MODEL") or None,
+        )
+
+    def route_message(self, user_message: str) -> Route:
+        """Route the call answering a user message.
+
+        Args:
+            user_message (str): The message of the user.
+
+        Returns:
+            Route: The route of the call.
+        """
+        if self.simple and self.is_simple(user_message):
+            return Route(SIMPLE_ROUTE, self.simple)
+        return Route(DEFAULT_ROUTE, self.default)
+
+    def route_tool_results(self) -> Route:
+        """Route the call answering with tool results.
+
+        Returns:
+            Route: The route of the call.
+        """
+        return Route(TOOL_RESULTS_ROUTE, self.tool_results or self.default)
+
+    def record(self, route: Route, seconds: float, usage: Any = None) -> None:
+        """Record a successful call of a route.
+
+        Args:
+            route (Route): The route of the call.
+            seconds (float): The duration of the call.
+            usage (Any): The token usage of the response, if reported.
+        """
+        with self._lock:
+            stats = self.stats.setdefault(route.name, RouteStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            if usage is not None:
+                stats.input_tokens += usage.input_tokens
+                stats.output_tokens += usage.output_tokens
+
+    def record_error(self, route: Route) -> None:
+        """Record a failed call of a route.
+
+        Args:
+            route (Route): The route of the call.
+        """
+        with self._lock:
+            self.stats.setdefault(route.name, RouteStats()).errors += 1
@@ -0,0 +1,129 @@
+"""Validators for tool arguments generated by the model.
+
+Validators are compiled once from the tool definitions produced by
+`get_tool_definition`, so that invalid arguments are reported back to the model
+before the tool is called.
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from datetime import date
+from typing import Any
+
+
+# A validator returns the errors of the arguments, or an empty list when valid.
+Validator = Callable[[dict[str, Any]], list[str]]
+Check = Callable[[str, Any], str | None]
+
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+ISO_DATE_HINT = "YYYY-MM-DD"
+
+JSON_TYPES = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+def compile_validator(
+    definition: dict[str, Any], injected: Iterable[str] = ("repo",)
+) -> Validator:
+    """Compile a validator for the arguments of a tool.
+
+    String properties, or arrays of strings, whose description mentions the
+    YYYY-MM-DD format are validated as ISO 8601 dates.
+
+    Args:
+        definition (dict[str, Any]): The tool definition, see `get_tool_definition`.
+        injected (Iterable[str]): Arguments injected by the client rather than the
+            model, which are not validated.
+
+    Returns:
+        Validator: A function returning the list of errors of the arguments.
+    """
+    parameters = definition.get("parameters", {})
+    properties = parameters.get("properties", {})
+    injected = set(injected)
+
+    required = [name for name in parameters.get("required", []) if name not in injected]
+    checks = {
+        name: _compile_property(schema)
+        for name, schema in properties.items()
+        if name not in injected
+    }
+    allow_additional = parameters.get("additionalProperties", True)
+
+    def validate(arguments: dict[str, Any]) -> list[str]:
+        if not isinstance(arguments, dict):
+            return ["Arguments must be an object."]
+
+        errors = [
+            f"Missing required argument '{n}'." for n in required if n not in arguments
+        ]
+
+        for name, value in arguments.items():
+            check = checks.get(name)
+
+            if check:
+                error = check(name, value)
+                if error:
+                    errors.append(error)
+            elif name not in injected and not allow_additional:
+                errors.append(f"Unexpected argument '{name}'.")
+
+        return errors
+
+    return validate
+
+
+def _compile_property(schema: dict[str, Any]) -> Check:
+    """Compile the check of a single property."""
+    is_date = ISO_DATE_HINT in schema.get("description", "")
+
+    if schema.get("type") == "array":
+        item_check = _compile_value(schema.get("items", {}).get("type"), is_date)
+
+        def check_array(name: str, value: Any) -> str | None:
+            if not isinstance(value, list):
+                return f"Argument '{name}' must be an array."
+
+            for i, item in enumerate(value):
+                error = item_check(f"{name}[{i}]", item)
+                if error:
+                    return error
+
+            return None
+
+        return check_array
+
+    return _compile_value(schema.get("type"), is_date)
+
+
+def _compile_value(json_type: str | None, is_date: bool) -> Check:
+    """Compile the check of a scalar value."""
+    type_check = JSON_TYPES.get(json_type, lambda v: True)
+
+    def check_value(name: str, value: Any) -> str | None:
+        if not type_check(value):
+            return f"Argument '{name}' must be of type {json_type}."
+
+        if is_date and not _is_iso_date(value):
+            return f"Argument '{name}' must be a valid date ({ISO_DATE_HINT})."
+
+        return None
+
+    return check_value
+
+
+def _is_iso_date(value: str) -> bool:
+    """Check that a string is a valid date in the YYYY-MM-DD format."""
+    if not ISO_DATE_PATTERN.fullmatch(value):
+        return False
+
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+
+    return True
@@ -0,0 +1,212 @@
+"""Vectorized availability queries over large date ranges.
+
+Booked dates are held as a sorted `datetime64[D]` array, 8 bytes per date,
+and queries are answered with binary searches over it, so that reports over
+months or years of dates, or millions of query dates, run in NumPy rather than
+one date at a time. The index is a building block for such reports, and is not
+used by the tools, which query a few dates at a time.
+"""
+
+from collections.abc import Sequence
+from datetime import date
+from typing import Any, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is in the requirements
+    np = None
+
+from booking.dates import format_run, parse_ordinals
+from booking.model import DEFAULT_RESOURCE
+from booking.repository import AbstractRepository
+
+
+# Ordinal of the NumPy datetime64 epoch, 1970-01-01.
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class AvailabilityRuns(NamedTuple):
+    """Runs of consecutive days with the same availability."""
+
+    starts: Any  # np.ndarray of datetime64[D], the first day of each run.
+    lengths: Any  # np.ndarray of int64, the number of days of each run.
+    available: Any  # np.ndarray of bool, the availability of each run.
+
+    def to_dict(self) -> dict[str, list]:
+        """Format the runs as single ISO dates or `[first, last]` ranges.
+
+        Returns:
+            dict[str, list]: The available and booked runs, in the format of
+                `ai.encoders.compress_availability`.
+        """
+        runs = {True: [], False: []}
+        ends = self.starts + (self.lengths - 1)
+
+        for start, end, available in zip(
+            self.starts.tolist(), ends.tolist(), self.available.tolist()
+        ):
+            runs[available].append(format_run(start, end))
+
+        return {"available": runs[True], "booked": runs[False]}
+
+
+class AvailabilityIndex:
+    """Sorted booked dates of a resource, queried in batches."""
+
+    def __init__(self, booked_dates: Any) -> None:
+        """Initialize the index.
+
+        Args:
+            booked_dates (Any): The booked dates, as dates, ISO strings or a
+                `datetime64` array, in any order.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("The availability engine requires NumPy.")
+
+        self.booked = _sorted_unique(_to_days(booked_dates))
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Sequence[int]) -> "AvailabilityIndex":
+        """Create an index from date ordinals, e.g. `BookedDatesView.ordinals`.
+
+        Args:
+            ordinals (Sequence[int]): The ordinals of the booked dates.
+
+        Returns:
+            AvailabilityIndex: The index.
+        """
+        if np is None:
+            raise ImportError("The availability engine requires NumPy.")
+
+        return cls(_ordinals_to_days(np.asarray(ordinals)))
+
+    @classmethod
+    def from_repository(
+        cls, repository: AbstractRepository, resource_id: str = DEFAULT_RESOURCE
+    ) -> "AvailabilityIndex":
+        """Create an index of the booked dates of a resource.
+
+        Args:
+            repository (AbstractRepository): The repository to load from.
+            resource_id (str): The ID of the resource.
+
+        Returns:
+            AvailabilityIndex: The index.
+        """
+        return cls(repository.get_booked_dates(resource_id))
+
+    def __len__(self) -> int:
+        return len(self.booked)
+
+    def is_available(self, dates: Any) -> Any:
+        """Check the availability of a batch of dates.
+
+        Args:
+            dates (Any): The dates to check, as dates, ISO strings or a
+                `datetime64` array, in any order.
+
+        Returns:
+            np.ndarray: A boolean array, True where the date is available.
+        """
+        days = _to_days(dates)
+
+        if not len(self.booked):
+            return np.ones(len(days), dtype=bool)
+
+        pos = np.searchsorted(self.booked, days)
+        booked = self.booked[np.minimum(pos, len(self.booked) - 1)] == days
+
+        return ~booked
+
+    def availability(self, start: date | str, end: date | str) -> Any:
+        """Get the availability of every day in a range, 1 byte per day.
+
+        Args:
+            start (date | str): The first day of the range.
+            end (date | str): The last day of the range, included.
+
+        Returns:
+            np.ndarray: A boolean array, True where the day is available.
+        """
+        first, last = np.datetime64(start, "D"), np.datetime64(end, "D")
+        if last < first:
+            raise ValueError("The end of the range must not be before its start.")
+
+        flags = np.ones((last - first).astype(int) + 1, dtype=bool)
+        flags[(self._booked_between(first, last) - first).astype(int)] = False
+
+        return flags
+
+    def runs(self, start: date | str, end: date | str) -> AvailabilityRuns:
+        """Get the availability of a range as runs of consecutive days.
+
+        Args:
+            start (date | str): The first day of the range.
+            end (date | str): The last day of the range, included.
+
+        Returns:
+            AvailabilityRuns: The runs, in chronological order.
+        """
+        flags = self.availability(start, end)
+        boundaries = np.flatnonzero(flags[1:] != flags[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        lengths = np.diff(np.concatenate((starts, [len(flags)])))
+
+        return AvailabilityRuns(
+            np.datetime64(start, "D") + starts, lengths, flags[starts]
+        )
+
+    def count_booked(self, start: date | str, end: date | str) -> int:
+        """Count the booked days in a range, without materializing it.
+
+        Args:
+            start (date | str): The first day of the range.
+            end (date | str): The last day of the range, included.
+
+        Returns:
+            int: The number of booked days.
+        """
+        return len(
+            self._booked_between(np.datetime64(start, "D"), np.datetime64(end, "D"))
+        )
+
+    def _booked_between(self, first: Any, last: Any) -> Any:
+        """Get the booked days in a range, as a view of the index."""
+        lo = np.searchsorted(self.booked, first, side="left")
+        hi = np.searchsorted(self.booked, last, side="right")
+
+        return self.booked[lo:hi]
+
+
+def _to_days(dates: Any) -> Any:
+    """Convert dates, ISO strings or a datetime64 array to a `datetime64[D]` array."""
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        return dates.astype("datetime64[D]")
+
+    if not isinstance(dates, Sequence):
+        dates = list(dates)
+
+    if dates and isinstance(dates[0], date):
+        # Much faster than letting NumPy convert the date objects.
+        ordinals = np.fromiter(map(date.toordinal, dates), np.int64, len(dates))
+    else:
+        ordinals = np.frombuffer(parse_ordinals(dates), dtype=np.int32)
+
+    return _ordinals_to_days(ordinals)
+
+
+def _sorted_unique(days: Any) -> Any:
+    """Sort and deduplicate days, an order of magnitude faster than `np.unique`."""
+    days = np.sort(days)
+    keep = np.ones(len(days), dtype=bool)
+    np.not_equal(days[1:], days[:-1], out=keep[1:])
+
+    return days[keep]
+
+
+def _ordinals_to_days(ordinals: Any) -> Any:
+    """Convert an array of date ordinals to a `datetime64[D]` array."""
+    return (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
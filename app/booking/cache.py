@@ -0,0 +1,287 @@
+"""In-memory caching of booking data."""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractRepository, BookedDateChange
+from booking.singleflight import SingleFlight
+
+
+logger = logging.getLogger("app")
+
+
+@dataclass
+class CacheStats:
+    """Counters of cache hits, misses and incremental refreshes."""
+
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of reads served from memory, between 0 and 1."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedRepository:
+    """Repository wrapper caching booked dates in memory for a limited time.
+
+    Booked dates are cached per resource. Concurrent misses share a single
+    query, and the cache of a resource is invalidated by the bookings added
+    through this repository.
+
+    In incremental mode, expired booked dates are brought up to date with the
+    changes made since they were loaded, including by other instances, rather
+    than reloaded, so that a refresh costs as much as the changes. Bookings
+    added through this repository are applied to the cached dates directly.
+    """
+
+    def __init__(
+        self,
+        repository: AbstractRepository,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        incremental: bool = False,
+    ) -> None:
+        """Initialize the cached repository.
+
+        Args:
+            repository (AbstractRepository): The repository to cache.
+            ttl (float): The number of seconds booked dates are kept in memory.
+            incremental (bool): Whether to refresh expired booked dates from the
+                change feed of the repository, which must then implement
+                `ChangeTrackingRepository`.
+        """
+        self.repository = repository
+        self.ttl = ttl
+        self.clock = clock
+        self.incremental = incremental
+        self.stats = CacheStats()
+        self.singleflight = SingleFlight()
+
+        self._lock = threading.Lock()
+        # Resource ID -> (booked dates, expiry time, change version).
+        self._booked_dates: dict[str, tuple[Sequence[date], float, int | None]] = {}
+        self._generation = 0
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        return self.repository.get(id_)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource, from memory when cached."""
+        with self._lock:
+            booked_dates = self._get_cached(resource_id)
+            if booked_dates is not None:
+                self.stats.hits += 1
+                return booked_dates
+            self.stats.misses += 1
+
+        return self.singleflight.do(
+            ("booked_dates", resource_id), self._load, resource_id
+        )
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, from the repository."""
+        return self.repository.get_available_resources(dates, resource_ids)
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking and update or invalidate the cached booked dates."""
+        self.repository.add(booking)
+
+        if not self.incremental:
+            self.invalidate(booking.resource_id)
+            return
+
+        with self._lock:
+            # Loads in progress may not see the booking, their results are dropped.
+            self._generation += 1
+            cached = self._booked_dates.get(booking.resource_id)
+            if cached is None:
+                return
+
+            booked_dates, expires_at, version = cached
+            # Applied again by the next refresh, which is harmless.
+            changes = [
+                BookedDateChange(version, booking.resource_id, date_, True)
+                for date_ in booking.dates
+            ]
+            self._booked_dates[booking.resource_id] = (
+                _apply_changes(booked_dates, changes),
+                expires_at,
+                version,
+            )
+
+    def warm(self, resource_id: str = DEFAULT_RESOURCE) -> None:
+        """Load booked dates in memory unless they are already cached."""
+        with self._lock:
+            if self._get_cached(resource_id) is not None:
+                return
+
+        self.singleflight.do(("booked_dates", resource_id), self._load, resource_id)
+
+    def invalidate(self, resource_id: str | None = None) -> None:
+        """Drop the cached booked dates, including the ones being loaded.
+
+        Args:
+            resource_id (str | None): The resource to invalidate, or None for all.
+        """
+        with self._lock:
+            if resource_id is None:
+                self._booked_dates.clear()
+            else:
+                self._booked_dates.pop(resource_id, None)
+            self._generation += 1
+
+    def prune_changes(self) -> int:
+        """Delete the changes of the repository no longer needed by this cache.
+
+        Only valid when this cache is the only reader of the change feed. With
+        several instances, prune through the oldest version any of them needs
+        with the `prune_changes` of the repository instead.
+
+        Returns:
+            int: The number of deleted changes.
+        """
+        current = self.repository.get_change_version()
+
+        with self._lock:
+            # Loads in progress may hold older versions, their results are dropped.
+            self._generation += 1
+            versions = [v for _, _, v in self._booked_dates.values() if v is not None]
+
+        return self.repository.prune_changes(min([current, *versions]))
+
+    def _get_cached(self, resource_id: str) -> list[date] | None:
+        """Get the cached booked dates of a resource if they have not expired."""
+        booked_dates, expires_at, _ = self._booked_dates.get(
+            resource_id, (None, 0.0, None)
+        )
+
+        if booked_dates is not None and self.clock() < expires_at:
+            return booked_dates
+        return None
+
+    def _load(self, resource_id: str) -> list[date]:
+        """Query the booked dates and cache them unless invalidated meanwhile."""
+        with self._lock:
+            generation = self._generation
+            cached = self._booked_dates.get(resource_id)
+
+        version = None
+        if self.incremental and cached is not None:
+            version, changes = self.repository.get_changes(cached[2], resource_id)
+            booked_dates = _apply_changes(cached[0], changes)
+            self.stats.refreshes += 1
+        else:
+            if self.incremental:
+                # Taken first, changes made during the query are applied twice
+                # at worst, which is harmless.
+                version = self.repository.get_change_version()
+            booked_dates = self.repository.get_booked_dates(resource_id)
+
+        with self._lock:
+            if generation == self._generation:
+                self._booked_dates[resource_id] = (
+                    booked_dates,
+                    self.clock() + self.ttl,
+                    version,
+                )
+
+        return booked_dates
+
+
+def _apply_changes(
+    booked_dates: Sequence[date], changes: list[BookedDateChange]
+) -> Sequence[date]:
+    """Apply booked-date changes to a copy of sorted booked dates."""
+    if not changes:
+        return booked_dates
+
+    # Cached dates may still be read by other threads, so they are not modified.
+    updated = list(booked_dates)
+
+    for change in changes:
+        pos = bisect_left(updated, change.date)
+        present = pos < len(updated) and updated[pos] == change.date
+
+        if change.booked and not present:
+            updated.insert(pos, change.date)
+        elif not change.booked and present:
+            del updated[pos]
+
+    return updated
+
+
+class Prefetcher:
+    """Run a warm-up function in the background, at most once at a time.
+
+    Used by `LLMClient` to warm a cache while the model is generating, e.g.
+    `Prefetcher(cached_repository.warm)`.
+
+    The warm-up function runs on a background thread, concurrently with the
+    caller. Database connections such as pyodbc's must not run queries from two
+    threads at once, so the caller must either wait for the prefetch before
+    querying the same connection, as `LLMClient` does before running tools, or
+    warm a repository with a connection of its own.
+    """
+
+    def __init__(self, warm: Callable[[], Any]) -> None:
+        self.warm = warm
+        self.started = 0
+        self.failed = 0
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="prefetcher"
+        )
+        self._lock = threading.Lock()
+        self._future = None
+
+    def start(self) -> Future:
+        """Start prefetching, unless a prefetch is already running.
+
+        Returns:
+            Future: The running prefetch.
+        """
+        with self._lock:
+            if self._future is None or self._future.done():
+                self.started += 1
+                self._future = self._executor.submit(self._run)
+
+            return self._future
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for the running prefetch, if any, to complete.
+
+        Args:
+            timeout (float | None): The maximum number of seconds to wait.
+        """
+        with self._lock:
+            future = self._future
+
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """Wait for the running prefetch and stop the background thread."""
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        """Run the warm-up function, logging failures instead of raising."""
+        try:
+            self.warm()
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.failed += 1
+            logger.exception("Prefetch failed.")
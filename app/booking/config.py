@@ -1,15 +1,38 @@
 """Config file for the booking app."""
 
+import functools
 import os
+import sqlite3
 import struct
+from pathlib import Path
 
 import pyodbc
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from openai import AzureOpenAI
 
+from booking.ai.ratelimit import AdaptiveRateLimiter
+
 # This connection option is defined by microsoft in msodbcsql.h
 SQL_COPT_SS_ACCESS_TOKEN = 1256
 OPENAI_API_VERSION = "2025-03-01-preview"
+SQLITE_SCHEMA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "assets", "scripts", "create.sqlite.sql"
+)
+SQL_TOKEN_SCOPE = "https://database.windows.net/.default"
+OPENAI_TOKEN_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+@functools.cache
+def get_credential() -> DefaultAzureCredential:
+    """Get the Azure credential shared by the process.
+
+    Sharing it runs the discovery of the credential chain once, and lets its
+    tokens be reused until they expire.
+
+    Returns:
+        DefaultAzureCredential: The shared credential.
+    """
+    return DefaultAzureCredential(exclude_interactive_browser_credential=False)
 
 
 def get_database_connection() -> pyodbc.Connection:
@@ -28,10 +51,7 @@ def get_database_connection() -> pyodbc.Connection:
             "The AZURE_SQL_CONNECTIONSTRING environment variable is not set."
         )
 
-    credential = DefaultAzureCredential(exclude_interactive_browser_credential=False)
-    token_bytes = credential.get_token(
-        "https://database.windows.net/.default"
-    ).token.encode("UTF-16-LE")
+    token_bytes = get_credential().get_token(SQL_TOKEN_SCOPE).token.encode("UTF-16-LE")
     token_struct = struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
 
     connection = pyodbc.connect(
@@ -41,8 +61,74 @@ def get_database_connection() -> pyodbc.Connection:
     return connection
 
 
-def get_openai_client() -> AzureOpenAI:
-    """Get an Azure OpenAI client.
+def get_sqlite_connection(database: str | None = None) -> sqlite3.Connection:
+    """Get a connection to an embedded SQLite database, creating its schema.
+
+    The database is opened in WAL mode so readers do not block the writer, and
+    foreign keys are enforced to keep the cascade delete of booking dates.
+
+    Args:
+        database (str | None): Path to the database file. Defaults to the
+            SQLITE_DATABASE environment variable.
+
+    Returns:
+        sqlite3.Connection: A connection to the SQLite database.
+
+    Raises:
+        ValueError: If no database is given and the environment variable
+            SQLITE_DATABASE is not set.
+    """
+    database = database or os.getenv("SQLITE_DATABASE")
+    if not database:
+        raise ValueError("The SQLITE_DATABASE environment variable is not set.")
+
+    connection = sqlite3.connect(database, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA foreign_keys = ON")
+
+    with open(SQLITE_SCHEMA_PATH, "r", encoding="utf-8") as f:
+        connection.executescript(f.read())
+
+    return connection
+
+
+def get_sqlite_readonly_connection(database: str | None = None) -> sqlite3.Connection:
+    """Get a read-only connection to an existing SQLite database.
+
+    Unlike `get_sqlite_connection`, the file is neither created nor migrated,
+    so a mistyped path fails instead of yielding an empty database.
+
+    Args:
+        database (str | None): Path to the database file. Defaults to the
+            SQLITE_DATABASE environment variable.
+
+    Returns:
+        sqlite3.Connection: A read-only connection to the SQLite database.
+
+    Raises:
+        ValueError: If no database is given and the environment variable
+            SQLITE_DATABASE is not set.
+        sqlite3.OperationalError: If the database file does not exist.
+    """
+    database = database or os.getenv("SQLITE_DATABASE")
+    if not database:
+        raise ValueError("The SQLITE_DATABASE environment variable is not set.")
+
+    uri = f"{Path(database).absolute().as_uri()}?mode=ro"
+
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+@functools.cache
+def get_openai_client(max_retries: int = 2) -> AzureOpenAI:
+    """Get the Azure OpenAI client shared by the process.
+
+    Sharing it reuses its HTTP connection pool across conversations.
+
+    Args:
+        max_retries (int): The number of retries of the SDK. `LLMClient` turns
+            them off when given a rate limiter, which retries on its own.
 
     Returns:
         AzureOpenAI: An Azure OpenAI client.
@@ -51,14 +137,33 @@ def get_openai_client() -> AzureOpenAI:
     if not endpoint:
         raise ValueError("The OPENAI_ENDPOINT environment variable is not set.")
 
-    token_provider = get_bearer_token_provider(
-        DefaultAzureCredential(), "https://cognitiveservices.azure.com/.default"
-    )
+    token_provider = get_bearer_token_provider(get_credential(), OPENAI_TOKEN_SCOPE)
 
     openai_client = AzureOpenAI(
         api_version=OPENAI_API_VERSION,
         azure_endpoint=endpoint,
         azure_ad_token_provider=token_provider,
+        max_retries=max_retries,
     )
 
     return openai_client
+
+
+@functools.cache
+def get_rate_limiter() -> AdaptiveRateLimiter | None:
+    """Get the rate limiter shared by all OpenAI calls of the process.
+
+    The quotas are read from the OPENAI_REQUESTS_PER_MINUTE and
+    OPENAI_TOKENS_PER_MINUTE environment variables.
+
+    Returns:
+        AdaptiveRateLimiter | None: The shared rate limiter, or None if the quotas
+            are not set.
+    """
+    requests_per_minute = os.getenv("OPENAI_REQUESTS_PER_MINUTE")
+    tokens_per_minute = os.getenv("OPENAI_TOKENS_PER_MINUTE")
+
+    if not requests_per_minute or not tokens_per_minute:
+        return None
+
+    return AdaptiveRateLimiter(int(requests_per_minute), int(tokens_per_minute))
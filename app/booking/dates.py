@@ -0,0 +1,172 @@
+"""Batched parsing of ISO 8601 dates.
+
+Dates are parsed to their proleptic Gregorian ordinals (see `date.toordinal`),
+which are compact to store in an `array` and cheap to compare, sort or turn
+into runs. Repeated strings, such as the dates of the next weeks asked about
+over and over, are served from a bounded cache. Large batches are parsed in a
+single vectorized pass with NumPy.
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is in the requirements
+    np = None
+
+
+# Number of distinct strings whose ordinal is kept in memory.
+CACHE_SIZE = 4096
+# Smallest batch parsed with NumPy, below which the cached path is faster.
+NUMPY_THRESHOLD = 2048
+# Days in each month of a common year.
+_DAYS_IN_MONTH = (
+    np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    if np is not None
+    else None
+)
+# Ordinal of March 1st of the proleptic year 0, i.e. 0000-03-01.
+_MARCH_1ST_OF_YEAR_0 = date(1, 3, 1).toordinal() - 365
+
+
+def parse_ordinals(values: Sequence[Any], use_numpy: bool | None = None) -> array:
+    """Parse ISO 8601 dates (YYYY-MM-DD) to an array of ordinals, in order.
+
+    Values are parsed from their string representation, so `date` objects are
+    accepted as well.
+
+    Args:
+        values (Sequence[Any]): The dates to parse.
+        use_numpy (bool | None): Whether to parse with NumPy. Defaults to doing so
+            for batches of at least `NUMPY_THRESHOLD` dates. Ignored when NumPy
+            is not installed.
+
+    Raises:
+        ValueError: If any of the values is not a valid date.
+
+    Returns:
+        array: The ordinals of the dates, as a signed int array.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None and len(values) >= NUMPY_THRESHOLD
+
+    if use_numpy and np is not None:
+        ordinals = _parse_ordinals_numpy(values)
+        if ordinals is not None:
+            return ordinals
+
+    # Also the fallback of batches NumPy rejects, to raise the standard error.
+    if len(values) <= CACHE_SIZE:
+        return array("i", [_parse_ordinal(str(value)) for value in values])
+
+    # Larger batches would only churn the cache, so they bypass it.
+    return array("i", [date.fromisoformat(str(v)).toordinal() for v in values])
+
+
+def parse_dates(values: Sequence[Any], use_numpy: bool | None = None) -> list[date]:
+    """Parse ISO 8601 dates (YYYY-MM-DD), in order.
+
+    Args:
+        values (Sequence[Any]): The dates to parse.
+        use_numpy (bool | None): Whether to parse with NumPy, see `parse_ordinals`.
+
+    Raises:
+        ValueError: If any of the values is not a valid date.
+
+    Returns:
+        list[date]: The parsed dates.
+    """
+    return to_dates(parse_ordinals(values, use_numpy))
+
+
+def to_dates(ordinals: Iterable[int]) -> list[date]:
+    """Convert ordinals back to dates."""
+    return [date.fromordinal(ordinal) for ordinal in ordinals]
+
+
+def format_run(first: date, last: date) -> str | list[str]:
+    """Format a run of consecutive dates as one ISO date or a [first, last] range."""
+    if first == last:
+        return first.isoformat()
+
+    return [first.isoformat(), last.isoformat()]
+
+
+def has_duplicates(ordinals: Sequence[int]) -> bool:
+    """Check whether any ordinal appears more than once."""
+    ordered = sorted(ordinals)
+    return any(a == b for a, b in zip(ordered, ordered[1:]))
+
+
+def is_consecutive(ordinals: Sequence[int]) -> bool:
+    """Check whether unique ordinals form a run of consecutive days."""
+    return not ordinals or max(ordinals) - min(ordinals) == len(ordinals) - 1
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_ordinal(value: str) -> int:
+    """Parse a single ISO 8601 date to its ordinal, with caching."""
+    return date.fromisoformat(value).toordinal()
+
+
+def _parse_ordinals_numpy(values: Sequence[Any]) -> array | None:
+    """Parse YYYY-MM-DD strings in a single vectorized pass.
+
+    The strings are laid out as rows of 10 ASCII characters whose digits are
+    converted and range checked column-wise, which is several times faster
+    than NumPy's own datetime parsing. Any other format is left to the scalar
+    path.
+
+    Returns:
+        array | None: The ordinals, or None if any value is not such a string.
+    """
+    try:
+        if max(map(len, values), default=0) != 10:
+            return None
+        buffer = "".join(values).encode("ascii")
+    except (TypeError, UnicodeEncodeError):
+        return None
+
+    if len(buffer) != 10 * len(values):
+        return None
+
+    chars = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 10)
+    # Digits map to 0-9 and any other character above 9, as bytes wrap around.
+    digits = chars - np.uint8(ord("0"))
+    invalid = digits > 9
+    invalid[:, 4] = chars[:, 4] != ord("-")
+    invalid[:, 7] = chars[:, 7] != ord("-")
+
+    if invalid.any():
+        return None
+
+    digits = digits.astype(np.int32)
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+
+    if ((year < 1) | (month < 1) | (month > 12) | (day < 1)).any():
+        return None
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    if (day > _DAYS_IN_MONTH[month - 1] + (leap & (month == 2))).any():
+        return None
+
+    # Days before the month in a March-based year, which puts leap days last.
+    shifted_year = year - (month <= 2)
+    shifted_month = (month + 9) % 12
+    day_of_year = (153 * shifted_month + 2) // 5 + day - 1
+    ordinals = (
+        shifted_year * 365
+        + shifted_year // 4
+        - shifted_year // 100
+        + shifted_year // 400
+        + day_of_year
+        + _MARCH_1ST_OF_YEAR_0
+    )
+
+    return array("i", ordinals.astype(np.int32).tobytes())
@@ -0,0 +1,81 @@
+"""Deadlines bounding the time spent on a chat turn.
+
+The deadline of the current turn is held in a context variable, so that the
+layers below the client, such as repository queries, can apply the remaining
+time budget without it being passed through every call.
+"""
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_current_deadline: ContextVar["Deadline | None"] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Custom exception raised when the time budget of a turn is exhausted."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"Deadline exceeded during {stage}.")
+        self.stage = stage
+
+
+class Deadline:
+    """A point in time after which the remaining work must be cancelled."""
+
+    def __init__(
+        self, timeout: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize the deadline.
+
+        Args:
+            timeout (float): The number of seconds from now until the deadline.
+        """
+        self.timeout = timeout
+        self.clock = clock
+        self.expires_at = clock() + timeout
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.clock() >= self.expires_at
+
+    def remaining(self) -> float:
+        """Get the number of seconds left before the deadline, 0 when expired."""
+        return max(0.0, self.expires_at - self.clock())
+
+    def check(self, stage: str) -> None:
+        """Ensure that the deadline has not passed before starting a stage.
+
+        Args:
+            stage (str): The name of the stage about to start.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceeded(stage)
+
+
+def get_current_deadline() -> Deadline | None:
+    """Get the deadline of the current context, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Make a deadline the current one for the duration of the block.
+
+    Args:
+        deadline (Deadline | None): The deadline, or None to run without one.
+    """
+    token = _current_deadline.set(deadline)
+
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,131 @@
+"""Export all bookings to JSON Lines or CSV, e.g. for a data warehouse.
+
+Bookings are streamed from the repository and written one at a time, so memory
+use does not grow with the number of bookings.
+
+Usage:
+    python -m booking.entrypoints.export --backend sqlite --format csv out.csv
+    python -m booking.entrypoints.export --since 2024-01-01T00:00:00 > out.jsonl
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TextIO
+
+from booking.config import get_database_connection, get_sqlite_readonly_connection
+from booking.repository import BookingRecord, SqliteRepository, SqlRepository
+
+
+CSV_FIELDS = ("id", "resource_id", "customer_name", "created_date", "dates")
+
+
+def write_jsonl(records: Iterable[BookingRecord], f: TextIO) -> int:
+    """Write booking records as JSON Lines, one booking per line.
+
+    Args:
+        records (Iterable[BookingRecord]): The bookings to write.
+        f (TextIO): The file to write to.
+
+    Returns:
+        int: The number of bookings written.
+    """
+    count = 0
+
+    for record in records:
+        f.write(
+            json.dumps(
+                {
+                    "id": record.id,
+                    "resource_id": record.resource_id,
+                    "customer_name": record.customer_name,
+                    "created_date": record.created_date.isoformat(),
+                    "dates": [d.isoformat() for d in record.dates],
+                }
+            )
+        )
+        f.write("\n")
+        count += 1
+
+    return count
+
+
+def write_csv(records: Iterable[BookingRecord], f: TextIO) -> int:
+    """Write booking records as CSV, with the dates of a booking space-separated.
+
+    Args:
+        records (Iterable[BookingRecord]): The bookings to write.
+        f (TextIO): The file to write to.
+
+    Returns:
+        int: The number of bookings written.
+    """
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+
+    for record in records:
+        writer.writerow(
+            (
+                record.id,
+                record.resource_id,
+                record.customer_name,
+                record.created_date.isoformat(),
+                " ".join(d.isoformat() for d in record.dates),
+            )
+        )
+        count += 1
+
+    return count
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the export."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", nargs="?", help="Output file, stdout by default.")
+    parser.add_argument("--backend", choices=["sqlite", "sql"], default="sql")
+    parser.add_argument(
+        "--database", help="SQLite database, SQLITE_DATABASE by default."
+    )
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only export the bookings created at or after this ISO 8601 time.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if args.batch_size < 1:
+        parser.error("The batch size must be at least 1.")
+
+    if args.backend == "sqlite":
+        connection = get_sqlite_readonly_connection(args.database)
+        repo = SqliteRepository(connection)
+    else:
+        connection = get_database_connection()
+        repo = SqlRepository(connection)
+
+    records = repo.iter_bookings(args.since, args.batch_size)
+    write = WRITERS[args.format]
+
+    try:
+        if args.output is None:
+            count = write(records, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                count = write(records, f)
+    finally:
+        connection.close()
+
+    print(f"Exported {count} bookings.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
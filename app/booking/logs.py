@@ -0,0 +1,280 @@
+"""Structured logging off the request threads.
+
+Records of the `app` logger are put on a bounded queue and written by a
+background thread, so that slow file or network handlers never block a turn.
+When the queue fills up, records below WARNING are sampled, and any record is
+dropped once it is full, rather than stalling the caller. Records carry the
+ID of the turn they were logged in, and are written as JSON lines with their
+`extra` fields, e.g. `logger.debug("...", extra={"event": "tool_call"})`.
+"""
+
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractRepository
+
+
+logger = logging.getLogger("app")
+
+_current_turn_id: ContextVar[str | None] = ContextVar("current_turn_id", default=None)
+# Attributes of every log record, which are not structured fields.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "turn_id",
+}
+
+
+def get_turn_id() -> str | None:
+    """Get the ID of the current turn, if any."""
+    return _current_turn_id.get()
+
+
+@contextmanager
+def turn_scope(turn_id: str | None = None) -> Iterator[str]:
+    """Tag the records logged in the block with a turn ID.
+
+    Args:
+        turn_id (str | None): The ID of the turn. Defaults to a new random ID.
+
+    Yields:
+        str: The ID of the turn.
+    """
+    turn_id = turn_id or uuid.uuid4().hex[:16]
+    token = _current_turn_id.set(turn_id)
+
+    try:
+        yield turn_id
+    finally:
+        _current_turn_id.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, with their extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "turn_id": getattr(record, "turn_id", None) or get_turn_id(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+
+        return json.dumps(payload, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler which samples and drops records instead of blocking."""
+
+    def __init__(
+        self,
+        queue_: queue.Queue,
+        sample_rate: float = 0.1,
+        high_water: float = 0.5,
+        sampler: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the handler.
+
+        Args:
+            queue_ (queue.Queue): The bounded queue read by the listener.
+            sample_rate (float): The fraction of records below WARNING kept while
+                the queue is above its high-water mark.
+            high_water (float): The fraction of the queue size above which
+                records are sampled.
+        """
+        super().__init__(queue_)
+        self.sample_rate = sample_rate
+        self.high_water_size = max(1, int(queue_.maxsize * high_water))
+        self.sampler = sampler
+        self.dropped = 0
+        self.sampled_out = 0
+
+        self._counters_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, unless it is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._counters_lock:
+                self.dropped += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record, sampling the ones below WARNING under pressure."""
+        if (
+            record.levelno < logging.WARNING
+            and self.queue.maxsize > 0
+            and self.queue.qsize() >= self.high_water_size
+            and self.sampler() >= self.sample_rate
+        ):
+            with self._counters_lock:
+                self.sampled_out += 1
+            return
+
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy a record for the queue, leaving its formatting to the listener.
+
+        The message is merged with its arguments and the traceback is rendered
+        now, while they are still valid, and the turn ID of the calling thread
+        is attached.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.turn_id = get_turn_id()
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+class BackgroundLogging:
+    """Route the records of a logger through a queue to background handlers.
+
+    Usage:
+        with BackgroundLogging([logging.FileHandler("app.log")]):
+            ...
+    """
+
+    def __init__(
+        self,
+        handlers: list[logging.Handler],
+        logger_name: str = "app",
+        level: int = logging.INFO,
+        max_queue_size: int = 10_000,
+        sample_rate: float = 0.1,
+    ) -> None:
+        """Initialize the background logging.
+
+        Args:
+            handlers (list[logging.Handler]): The handlers writing the records.
+                Handlers without a formatter get a `JsonFormatter`.
+            logger_name (str): The name of the logger to route.
+            level (int): The level of the logger.
+            max_queue_size (int): The maximum number of records waiting to be
+                written.
+            sample_rate (float): The fraction of records below WARNING kept when
+                the queue is more than half full.
+        """
+        if max_queue_size < 1:
+            raise ValueError("The queue size must be at least 1.")
+
+        for handler in handlers:
+            if handler.formatter is None:
+                handler.setFormatter(JsonFormatter())
+
+        self.logger = logging.getLogger(logger_name)
+        self.level = level
+        self.handler = NonBlockingQueueHandler(
+            queue.Queue(max_queue_size), sample_rate=sample_rate
+        )
+        self.listener = QueueListener(
+            self.handler.queue, *handlers, respect_handler_level=True
+        )
+
+    def start(self) -> None:
+        """Start the background writer and attach the queue to the logger."""
+        self.listener.start()
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(self.level)
+        # Handlers of parent loggers would write on the request threads.
+        self.logger.propagate = False
+
+    def stop(self) -> None:
+        """Detach the queue from the logger and write the remaining records."""
+        self.logger.removeHandler(self.handler)
+        self.logger.propagate = True
+        self.listener.stop()
+
+    def __enter__(self) -> "BackgroundLogging":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class LoggedRepository:
+    """Repository wrapper logging the duration of each query at DEBUG level."""
+
+    def __init__(self, repository: AbstractRepository) -> None:
+        self.repository = repository
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        with _timed("get"):
+            return self.repository.get(id_)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource, sorted."""
+        with _timed("get_booked_dates", resource_id=resource_id):
+            return self.repository.get_booked_dates(resource_id)
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, sorted by ID."""
+        with _timed("get_available_resources", dates=len(dates)):
+            return self.repository.get_available_resources(dates, resource_ids)
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+        with _timed("add", resource_id=booking.resource_id):
+            self.repository.add(booking)
+
+
+@contextmanager
+def _timed(method: str, **fields) -> Iterator[None]:
+    """Log the duration and outcome of a repository call."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        yield
+        return
+
+    start = time.perf_counter()
+    error = None
+
+    try:
+        yield
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        logger.debug(
+            "Repository call %s took %.3fs.",
+            method,
+            seconds,
+            extra={
+                "event": "repository_call",
+                "method": method,
+                "seconds": seconds,
+                "error": error,
+                **fields,
+            },
+        )
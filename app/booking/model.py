@@ -2,6 +2,13 @@
 
 from datetime import date
 
+from booking.dates import has_duplicates, is_consecutive, parse_ordinals, to_dates
+
+
+# The room booked when none is specified, which is the only room of
+# single-room deployments.
+DEFAULT_RESOURCE = "main"
+
 
 class InvalidBookingDates(ValueError):
     """Custom exception for invalid booking dates."""
@@ -10,16 +17,24 @@ class InvalidBookingDates(ValueError):
 class Booking:
     """Booking model"""
 
-    def __init__(self, id_: str, dates: list[str], customer_name: str) -> None:
+    def __init__(
+        self,
+        id_: str,
+        dates: list[str],
+        customer_name: str,
+        resource_id: str = DEFAULT_RESOURCE,
+    ) -> None:
         """Initialize the Booking model.
 
         Args:
             dates (list[str]): List of dates to check in ISO 8601 format (YYYY-MM-DD).
+            resource_id (str): The ID of the booked room.
         """
         self.id_ = id_
         self._dates = []
-        self.dates = self.validate_dates(dates)
+        self.dates = dates
         self.customer_name = customer_name
+        self.resource_id = resource_id
 
     @property
     def dates_iso(self) -> list[str]:
@@ -50,36 +65,32 @@ class Booking:
         Returns:
             list[date]: A list of validated dates.
         """
-        validated_dates = []
-
         if not dates:
             raise InvalidBookingDates("Dates list cannot be empty.")
 
         if len(dates) > 5:
             raise InvalidBookingDates("No more than 5 dates can be booked at a time.")
 
-        if len(dates) != len(set(dates)):
-            raise InvalidBookingDates("Dates must be unique.")
-
         try:
-            validated_dates = [date.fromisoformat(str(d)) for d in dates]
+            ordinals = parse_ordinals(dates)
         except ValueError as e:
             raise InvalidBookingDates(
                 f"Invalid date format. Expected format is (YYYY-MM-DD): {e}"
             ) from e
 
-        if len(dates) > 1:
-            dates_int = [d.toordinal() for d in validated_dates]
-            if max(dates_int) - min(dates_int) != len(dates_int) - 1:
-                raise InvalidBookingDates("Dates must be consecutive.")
+        if has_duplicates(ordinals):
+            raise InvalidBookingDates("Dates must be unique.")
+
+        if not is_consecutive(ordinals):
+            raise InvalidBookingDates("Dates must be consecutive.")
 
-        return validated_dates
+        return to_dates(ordinals)
 
     def __repr__(self) -> str:
         """Return a string representation of the Booking model."""
         return (
             f"Booking(id_={self.id_}, dates={self.dates_iso}, "
-            f"customer_name={self.customer_name})"
+            f"customer_name={self.customer_name}, resource_id={self.resource_id})"
         )
 
     def __eq__(self, other: object) -> bool:
@@ -90,6 +101,7 @@ class Booking:
             self.id_ == other.id_
             and self.dates == other.dates
             and self.customer_name == other.customer_name
+            and self.resource_id == other.resource_id
         )
 
     def __hash__(self) -> int:
@@ -0,0 +1,178 @@
+"""Occupancy of the rooms per day, week and month.
+
+The number of rooms booked on each day is aggregated in memory when loaded,
+and kept up to date by the bookings added through `OccupancyRepository`, so
+that the occupancy of a month or a year is computed from one counter per day
+instead of the booked dates of every room.
+"""
+
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractRepository
+
+
+PERIODS = ("day", "week", "month")
+# Longest range, in days, of an occupancy query: five years.
+MAX_DAYS = 5 * 366
+
+
+class OccupancyIndex:
+    """Number of booked rooms per day, over a fixed set of rooms."""
+
+    def __init__(self, resource_ids: Iterable[str]) -> None:
+        self.resource_ids = frozenset(resource_ids)
+        # Date ordinal -> number of rooms booked on the day.
+        self.booked_rooms: Counter[int] = Counter()
+
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_repository(
+        cls, repository: AbstractRepository, resource_ids: Iterable[str]
+    ) -> "OccupancyIndex":
+        """Aggregate the booked dates of rooms.
+
+        Args:
+            repository (AbstractRepository): The repository to load from.
+            resource_ids (Iterable[str]): The IDs of the rooms.
+
+        Returns:
+            OccupancyIndex: The index.
+        """
+        index = cls(resource_ids)
+
+        for resource_id in index.resource_ids:
+            index.add_dates(repository.get_booked_dates(resource_id))
+
+        return index
+
+    def add_dates(self, dates: Iterable[date]) -> None:
+        """Count newly booked dates of a room.
+
+        Args:
+            dates (Iterable[date]): The dates, booked once each.
+        """
+        with self._lock:
+            self.booked_rooms.update(d.toordinal() for d in dates)
+
+    def occupancy(
+        self, start: date, end: date, period: str = "day"
+    ) -> list[dict[str, str | int | float]]:
+        """Get the occupancy of the rooms over a range, per period.
+
+        Args:
+            start (date): The first day of the range.
+            end (date): The last day of the range, included.
+            period (str): "day", "week" (ISO weeks) or "month".
+
+        Raises:
+            ValueError: If the range is reversed or longer than `MAX_DAYS`, or
+                the period unknown.
+
+        Returns:
+            list[dict[str, str | int | float]]: For each period overlapping the
+                range, its label, the numbers of booked and bookable room-days
+                within the range, and their ratio.
+        """
+        if end < start:
+            raise ValueError("The end date must not be before the start date.")
+        if (end - start).days >= MAX_DAYS:
+            raise ValueError(f"The range must not be longer than {MAX_DAYS} days.")
+        if period not in PERIODS:
+            raise ValueError(f"The period must be one of {', '.join(PERIODS)}.")
+
+        with self._lock:
+            daily = [
+                self.booked_rooms.get(ordinal, 0)
+                for ordinal in range(start.toordinal(), end.toordinal() + 1)
+            ]
+
+        rooms = len(self.resource_ids)
+        # Period label -> [booked room-days, days].
+        totals: dict[str, list[int]] = {}
+
+        for offset, booked in enumerate(daily):
+            total = totals.setdefault(
+                _label(start + timedelta(days=offset), period), [0, 0]
+            )
+            total[0] += booked
+            total[1] += 1
+
+        return [
+            {
+                "period": label,
+                "booked": booked,
+                "capacity": days * rooms,
+                "rate": round(booked / (days * rooms), 3) if rooms else 0.0,
+            }
+            for label, (booked, days) in totals.items()
+        ]
+
+
+class OccupancyRepository:
+    """Repository wrapper keeping an occupancy index up to date.
+
+    Only the bookings added through this repository update the index. Call
+    `reload` to pick up the bookings added by other processes.
+    """
+
+    def __init__(
+        self, repository: AbstractRepository, resource_ids: Iterable[str]
+    ) -> None:
+        """Initialize the repository and aggregate the booked dates.
+
+        Args:
+            repository (AbstractRepository): The repository to wrap.
+            resource_ids (Iterable[str]): The IDs of the rooms.
+        """
+        self.repository = repository
+        self.resource_ids = frozenset(resource_ids)
+        self.index = OccupancyIndex.from_repository(repository, self.resource_ids)
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        return self.repository.get(id_)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource, sorted."""
+        return self.repository.get_booked_dates(resource_id)
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, sorted by ID."""
+        return self.repository.get_available_resources(dates, resource_ids)
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking and count its dates."""
+        self.repository.add(booking)
+
+        if booking.resource_id in self.resource_ids:
+            self.index.add_dates(booking.dates)
+
+    def get_occupancy(
+        self, start: date, end: date, period: str = "day"
+    ) -> list[dict[str, str | int | float]]:
+        """Get the occupancy of the rooms over a range, per period.
+
+        See `OccupancyIndex.occupancy`.
+        """
+        return self.index.occupancy(start, end, period)
+
+    def reload(self) -> None:
+        """Aggregate the booked dates from the wrapped repository again."""
+        self.index = OccupancyIndex.from_repository(self.repository, self.resource_ids)
+
+
+def _label(day: date, period: str) -> str:
+    """Get the label of the period of a day, e.g. "2023-10", "2023-W40"."""
+    if period == "month":
+        return f"{day.year}-{day.month:02d}"
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.isoformat()
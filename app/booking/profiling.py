@@ -0,0 +1,144 @@
+"""On-demand profiling of chat turns and repository calls.
+
+A sampled fraction of turns, or the turns explicitly asked for, run under
+cProfile and each writes its own `.prof` file, which can be inspected with
+`python -m pstats <file>` or any pstats-compatible viewer.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractRepository
+
+
+logger = logging.getLogger("app")
+
+DEFAULT_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "booking-profiles")
+
+# Whether a block is being profiled on the current thread, by any profiler.
+_profiling = threading.local()
+
+
+class TurnProfiler:
+    """Profile a sampled fraction of turns with a deterministic profiler."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        sample_rate: float = 1.0,
+        sampler: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            output_dir (str): The directory where profile files are written.
+            sample_rate (float): The fraction of turns to profile, between 0 and 1.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("The sample rate must be in the [0, 1] range.")
+
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.sampler = sampler
+
+    @classmethod
+    def from_environment(cls) -> "TurnProfiler":
+        """Create a profiler from the environment.
+
+        Sampling is enabled by the BOOKING_PROFILE_SAMPLE_RATE environment
+        variable, and profiles are written to BOOKING_PROFILE_DIR, or to a
+        temporary directory by default. Without a sample rate, only the blocks
+        explicitly asked for are profiled.
+
+        Returns:
+            TurnProfiler: The profiler.
+        """
+        output_dir = os.getenv("BOOKING_PROFILE_DIR") or DEFAULT_PROFILE_DIR
+        sample_rate = float(os.getenv("BOOKING_PROFILE_SAMPLE_RATE") or 0)
+
+        return cls(output_dir, sample_rate)
+
+    @contextmanager
+    def profile(self, label: str, force: bool = False) -> Iterator[str | None]:
+        """Profile the block if it is sampled, and write its profile file.
+
+        Blocks nested in a profiled block are covered by the outer profile and
+        are not profiled separately.
+
+        Args:
+            label (str): The label of the block, used in the file name.
+            force (bool): Whether to profile the block regardless of sampling.
+
+        Yields:
+            str | None: The path of the profile file, or None if not profiled.
+        """
+        if getattr(_profiling, "active", False) or not (
+            force or self.sampler() < self.sample_rate
+        ):
+            yield None
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active, e.g. in another thread.
+            logger.debug("Skipped profiling %s, a profiler is already active.", label)
+            yield None
+            return
+
+        path = os.path.join(
+            self.output_dir,
+            f"{label}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.prof",
+        )
+        _profiling.active = True
+
+        try:
+            yield path
+        finally:
+            profiler.disable()
+            _profiling.active = False
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            profiler.dump_stats(path)
+            logger.info("Wrote profile of %s to %s", label, path)
+
+
+class ProfiledRepository:
+    """Repository wrapper profiling sampled calls to the wrapped repository."""
+
+    def __init__(self, repository: AbstractRepository, profiler: TurnProfiler):
+        self.repository = repository
+        self.profiler = profiler
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        with self.profiler.profile("repository.get"):
+            return self.repository.get(id_)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource, sorted."""
+        with self.profiler.profile("repository.get_booked_dates"):
+            return self.repository.get_booked_dates(resource_id)
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, sorted by ID."""
+        with self.profiler.profile("repository.get_available_resources"):
+            return self.repository.get_available_resources(dates, resource_ids)
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+        with self.profiler.profile("repository.add"):
+            self.repository.add(booking)
@@ -1,11 +1,20 @@
 """Repository module for managing bookings."""
 
-from datetime import date
-from typing import Protocol
+import asyncio
+import contextvars
+import math
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, NamedTuple, Protocol
 
 import pyodbc
 
-from booking.model import Booking
+from booking.deadline import DeadlineExceeded, get_current_deadline
+from booking.model import DEFAULT_RESOURCE, Booking
 
 
 class AbstractRepository(Protocol):
@@ -14,15 +23,76 @@ class AbstractRepository(Protocol):
     def get(self, id_: str) -> Booking | None:
         """Get a booking by ID."""
 
-    def get_booked_dates(self) -> list[date]:
-        """Get all bookings."""
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource, sorted."""
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, sorted by ID."""
 
     def add(self, booking: Booking) -> None:
         """Add a new booking."""
 
 
+class BookedDateChange(NamedTuple):
+    """A date booked or released on a resource, from a change feed."""
+
+    version: int
+    resource_id: str
+    date: date
+    booked: bool
+
+
+class BookingRecord(NamedTuple):
+    """A booking as exported, without the validation of `Booking`."""
+
+    id: str
+    resource_id: str
+    customer_name: str | None
+    created_date: datetime
+    dates: tuple[date, ...]
+
+
+class ChangeTrackingRepository(AbstractRepository, Protocol):
+    """Repository interface for bookings with a feed of booked-date changes."""
+
+    def get_change_version(self) -> int:
+        """Get the version of the latest change visible to all readers."""
+
+    def get_changes(
+        self, since: int, resource_id: str | None = None
+    ) -> tuple[int, list[BookedDateChange]]:
+        """Get the booked-date changes made after a version, and the new version."""
+
+    def prune_changes(self, through: int) -> int:
+        """Delete the booked-date changes up to a version, no longer needed."""
+
+
+class AbstractAsyncRepository(Protocol):
+    """Async repository interface for bookings."""
+
+    async def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+
+    async def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource, sorted."""
+
+    async def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, sorted by ID."""
+
+    async def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+
+
 class SqlRepository:
-    """SQL repository for bookings."""
+    """SQL repository for bookings.
+
+    Queries run within a deadline (see `deadline.deadline_scope`) time out when
+    the deadline passes.
+    """
 
     def __init__(self, connection: pyodbc.Connection) -> None:
         self.connection = connection
@@ -36,9 +106,10 @@ class SqlRepository:
         Returns:
             Booking | None: The retrived booking object or None if not found.
         """
-        with self.connection.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(
-                "SELECT id, customer_name FROM dbo.booking WHERE id = ?", id_
+                "SELECT id, customer_name, resource_id FROM dbo.booking WHERE id = ?",
+                id_,
             )
             row = cursor.fetchone()
             if not row:
@@ -50,20 +121,47 @@ class SqlRepository:
             rows = cursor.fetchall()
             dates = [r.date for r in rows]
 
-            return Booking(row.id, dates, row.customer_name)
+            return Booking(row.id, dates, row.customer_name, row.resource_id)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource.
 
-    def get_booked_dates(self) -> list[date]:
-        """Get all booked dates.
+        Args:
+            resource_id (str): The ID of the resource.
 
         Returns:
             list[date]: A list of booked dates.
         """
-        with self.connection.cursor() as cursor:
-            cursor.execute("SELECT [date] FROM dbo.booking_dates")
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT [date] FROM dbo.booking_dates WHERE resource_id = ? "
+                "ORDER BY [date]",
+                resource_id,
+            )
             rows = cursor.fetchall()
-            dates = [r.date for r in rows]
 
-        return sorted(dates)
+        return [r.date for r in rows]
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, in a single query.
+
+        Args:
+            dates (list[date]): The dates the resources must be free on.
+            resource_ids (list[str] | None): The resources to consider, or None for
+                all resources.
+
+        Returns:
+            list[str]: The IDs of the free resources, sorted.
+        """
+        query, params = _available_resources_query("dbo.", dates, resource_ids)
+
+        with self._cursor() as cursor:
+            cursor.execute(query, *params)
+            rows = cursor.fetchall()
+
+        return [r.id for r in rows]
 
     def add(self, booking: Booking) -> None:
         """Add a new booking.
@@ -71,13 +169,626 @@ class SqlRepository:
         Args:
             booking (Booking): A booking object to add.
         """
-        with self.connection.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(
-                "INSERT INTO dbo.booking (id, customer_name) VALUES (?, ?)",
+                "INSERT INTO dbo.booking (id, resource_id, customer_name) "
+                "VALUES (?, ?, ?)",
                 booking.id_,
+                booking.resource_id,
                 booking.customer_name,
             )
             cursor.executemany(
-                "INSERT INTO dbo.booking_dates (booking_id, [date]) VALUES (?, ?)",
-                [(booking.id_, str(date)) for date in booking.dates],
+                "INSERT INTO dbo.booking_dates (booking_id, resource_id, [date]) "
+                "VALUES (?, ?, ?)",
+                [
+                    (booking.id_, booking.resource_id, str(date))
+                    for date in booking.dates
+                ],
             )
+
+    def add_resource(self, resource_id: str, name: str) -> None:
+        """Add a new bookable resource.
+
+        Args:
+            resource_id (str): The ID of the resource.
+            name (str): The display name of the resource.
+        """
+        with self._cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO dbo.resource (id, name) VALUES (?, ?)", resource_id, name
+            )
+
+    def get_change_version(self) -> int:
+        """Get the version of the latest change visible to all readers.
+
+        Changes of transactions still in progress may get a lower version once
+        committed, so the version stops below the oldest active one.
+
+        Returns:
+            int: The change version.
+        """
+        with self._cursor() as cursor:
+            cursor.execute("SELECT CONVERT(BIGINT, MIN_ACTIVE_ROWVERSION()) - 1")
+            return cursor.fetchone()[0]
+
+    def get_changes(
+        self, since: int, resource_id: str | None = None
+    ) -> tuple[int, list[BookedDateChange]]:
+        """Get the booked-date changes made after a version.
+
+        Args:
+            since (int): The version of the last change already applied, e.g. from
+                `get_change_version`.
+            resource_id (str | None): The resource to get changes for, or None for
+                all resources.
+
+        Returns:
+            tuple[int, list[BookedDateChange]]: The version to pass next, and the
+                changes in the order they were made.
+        """
+        version = self.get_change_version()
+        query = (
+            "SELECT CONVERT(BIGINT, version) AS version, resource_id, [date], booked "
+            "FROM dbo.booking_dates_log "
+            "WHERE version > CONVERT(BINARY(8), CAST(? AS BIGINT)) "
+            "AND version <= CONVERT(BINARY(8), CAST(? AS BIGINT))"
+        )
+        params = [since, version]
+        if resource_id is not None:
+            query += " AND resource_id = ?"
+            params.append(resource_id)
+
+        with self._cursor() as cursor:
+            cursor.execute(query + " ORDER BY version", *params)
+            rows = cursor.fetchall()
+
+        return version, [
+            BookedDateChange(r.version, r.resource_id, r.date, bool(r.booked))
+            for r in rows
+        ]
+
+    def prune_changes(self, through: int) -> int:
+        """Delete the booked-date changes made up to a version.
+
+        Readers must no longer need them: pass the oldest version any reader
+        will pass to `get_changes`, e.g. from `CachedRepository.prune_changes`.
+
+        Args:
+            through (int): The version of the last change to delete.
+
+        Returns:
+            int: The number of deleted changes.
+        """
+        with self._cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM dbo.booking_dates_log "
+                "WHERE version <= CONVERT(BINARY(8), CAST(? AS BIGINT))",
+                through,
+            )
+            return cursor.rowcount
+
+    def iter_bookings(
+        self, since: datetime | None = None, batch_size: int = 1000
+    ) -> Iterator[BookingRecord]:
+        """Stream all bookings, fetching rows in batches.
+
+        Only a batch of rows is held in memory at a time, whatever the number of
+        bookings. The connection cannot run other queries until the iteration
+        completes or the generator is closed.
+
+        Args:
+            since (datetime | None): The creation time of the first bookings to
+                include, or None for all bookings.
+            batch_size (int): The number of rows fetched at a time.
+
+        Yields:
+            BookingRecord: The bookings, by creation time and ID.
+        """
+        query, params = _bookings_query("dbo.", since)
+
+        with self._cursor() as cursor:
+            cursor.execute(query, *params)
+            yield from _group_booking_rows(lambda: cursor.fetchmany(batch_size))
+
+    @contextmanager
+    def _cursor(self) -> Iterator[pyodbc.Cursor]:
+        """Open a cursor whose queries time out with the current deadline."""
+        deadline = get_current_deadline()
+
+        if deadline is None:
+            with self.connection.cursor() as cursor:
+                yield cursor
+            return
+
+        deadline.check("SQL query")
+        previous_timeout = self.connection.timeout
+        self.connection.timeout = max(1, math.ceil(deadline.remaining()))
+
+        try:
+            with self.connection.cursor() as cursor:
+                yield cursor
+        except pyodbc.OperationalError as exc:
+            if deadline.expired:
+                raise DeadlineExceeded("SQL query") from exc
+            raise
+        finally:
+            self.connection.timeout = previous_timeout
+
+
+class SqliteRepository:
+    """Embedded SQLite repository for bookings.
+
+    Uses the schema from `assets/scripts/create.sqlite.sql`, see
+    `config.get_sqlite_connection`. As with `SqlRepository`, transactions are
+    committed by the owner of the connection, and queries are interrupted when
+    the current deadline passes.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID.
+
+        Args:
+            id_ (str): The ID of the booking to retrieve.
+
+        Returns:
+            Booking | None: The retrieved booking object or None if not found.
+        """
+        with self._deadline_guard():
+            row = self.connection.execute(
+                "SELECT id, customer_name, resource_id FROM booking WHERE id = ?",
+                (id_,),
+            ).fetchone()
+            if not row:
+                return None
+
+            rows = self.connection.execute(
+                "SELECT [date] FROM booking_dates WHERE booking_id = ? ORDER BY [date]",
+                (id_,),
+            ).fetchall()
+            dates = [r[0] for r in rows]
+
+        return Booking(row[0], dates, row[1], row[2])
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource.
+
+        Args:
+            resource_id (str): The ID of the resource.
+
+        Returns:
+            list[date]: A list of booked dates.
+        """
+        with self._deadline_guard():
+            rows = self.connection.execute(
+                "SELECT [date] FROM booking_dates WHERE resource_id = ? "
+                "ORDER BY [date]",
+                (resource_id,),
+            ).fetchall()
+
+        return [date.fromisoformat(r[0]) for r in rows]
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, in a single query.
+
+        Args:
+            dates (list[date]): The dates the resources must be free on.
+            resource_ids (list[str] | None): The resources to consider, or None for
+                all resources.
+
+        Returns:
+            list[str]: The IDs of the free resources, sorted.
+        """
+        query, params = _available_resources_query("", dates, resource_ids)
+
+        with self._deadline_guard():
+            rows = self.connection.execute(query, params).fetchall()
+
+        return [r[0] for r in rows]
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking.
+
+        Args:
+            booking (Booking): A booking object to add.
+        """
+        with self._deadline_guard():
+            self.connection.execute(
+                "INSERT INTO booking (id, resource_id, customer_name) VALUES (?, ?, ?)",
+                (booking.id_, booking.resource_id, booking.customer_name),
+            )
+            self.connection.executemany(
+                "INSERT INTO booking_dates (booking_id, resource_id, [date]) "
+                "VALUES (?, ?, ?)",
+                [
+                    (booking.id_, booking.resource_id, str(date_))
+                    for date_ in booking.dates
+                ],
+            )
+
+    def add_resource(self, resource_id: str, name: str) -> None:
+        """Add a new bookable resource.
+
+        Args:
+            resource_id (str): The ID of the resource.
+            name (str): The display name of the resource.
+        """
+        with self._deadline_guard():
+            self.connection.execute(
+                "INSERT INTO resource (id, name) VALUES (?, ?)", (resource_id, name)
+            )
+
+    def get_change_version(self) -> int:
+        """Get the version of the latest committed change.
+
+        Returns:
+            int: The change version.
+        """
+        with self._deadline_guard():
+            row = self.connection.execute(
+                "SELECT COALESCE(MAX(version), 0) FROM booking_dates_log"
+            ).fetchone()
+
+        return row[0]
+
+    def get_changes(
+        self, since: int, resource_id: str | None = None
+    ) -> tuple[int, list[BookedDateChange]]:
+        """Get the booked-date changes made after a version.
+
+        Args:
+            since (int): The version of the last change already applied, e.g. from
+                `get_change_version`.
+            resource_id (str | None): The resource to get changes for, or None for
+                all resources.
+
+        Returns:
+            tuple[int, list[BookedDateChange]]: The version to pass next, and the
+                changes in the order they were made.
+        """
+        version = self.get_change_version()
+        query = (
+            "SELECT version, resource_id, [date], booked FROM booking_dates_log "
+            "WHERE version > ? AND version <= ?"
+        )
+        params = [since, version]
+        if resource_id is not None:
+            query += " AND resource_id = ?"
+            params.append(resource_id)
+
+        with self._deadline_guard():
+            rows = self.connection.execute(query + " ORDER BY version", params)
+            changes = [
+                BookedDateChange(r[0], r[1], date.fromisoformat(r[2]), bool(r[3]))
+                for r in rows
+            ]
+
+        return version, changes
+
+    def prune_changes(self, through: int) -> int:
+        """Delete the booked-date changes made up to a version.
+
+        Readers must no longer need them, see `SqlRepository.prune_changes`.
+        The latest change is always kept, as the change version is read from it.
+
+        Args:
+            through (int): The version of the last change to delete.
+
+        Returns:
+            int: The number of deleted changes.
+        """
+        with self._deadline_guard():
+            cursor = self.connection.execute(
+                "DELETE FROM booking_dates_log WHERE version <= ? "
+                "AND version < (SELECT MAX(version) FROM booking_dates_log)",
+                (through,),
+            )
+
+        return cursor.rowcount
+
+    def iter_bookings(
+        self, since: datetime | None = None, batch_size: int = 1000
+    ) -> Iterator[BookingRecord]:
+        """Stream all bookings, fetching rows in batches.
+
+        Only a batch of rows is held in memory at a time, whatever the number of
+        bookings.
+
+        Args:
+            since (datetime | None): The creation time of the first bookings to
+                include, or None for all bookings.
+            batch_size (int): The number of rows fetched at a time.
+
+        Yields:
+            BookingRecord: The bookings, by creation time and ID.
+        """
+        if since is not None:
+            # Timestamps are stored as text, which compares in time order.
+            since = since.isoformat(sep=" ", timespec="milliseconds")
+        query, params = _bookings_query("", since)
+
+        with self._deadline_guard():
+            cursor = self.connection.execute(query, params)
+            try:
+                yield from _group_booking_rows(
+                    lambda: cursor.fetchmany(batch_size),
+                    datetime.fromisoformat,
+                    date.fromisoformat,
+                )
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def _deadline_guard(self) -> Iterator[None]:
+        """Interrupt the queries of the block when the current deadline passes."""
+        deadline = get_current_deadline()
+
+        if deadline is None:
+            yield
+            return
+
+        deadline.check("SQLite query")
+        self.connection.set_progress_handler(lambda: deadline.expired, 1000)
+
+        try:
+            yield
+        except sqlite3.OperationalError as exc:
+            if deadline.expired:
+                raise DeadlineExceeded("SQLite query") from exc
+            raise
+        finally:
+            self.connection.set_progress_handler(None, 0)
+
+
+class AsyncSqlRepository:
+    """Async SQL repository for bookings.
+
+    pyodbc is synchronous, so queries run on a dedicated, bounded thread pool
+    instead of the event loop. Each worker thread lazily opens and keeps its own
+    connection, which makes the executor size the size of the connection pool.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], pyodbc.Connection],
+        pool_size: int = 4,
+    ) -> None:
+        """Initialize the async SQL repository.
+
+        Args:
+            connection_factory (Callable[[], pyodbc.Connection]): A callable returning
+                a new database connection, e.g. `config.get_database_connection`.
+            pool_size (int): The maximum number of concurrent queries and
+                connections.
+        """
+        if pool_size < 1:
+            raise ValueError("The pool size must be at least 1.")
+
+        self.connection_factory = connection_factory
+        self.pool_size = pool_size
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="sql-repository"
+        )
+        self._local = threading.local()
+        self._connections: list[pyodbc.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    async def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID.
+
+        Args:
+            id_ (str): The ID of the booking to retrieve.
+
+        Returns:
+            Booking | None: The retrieved booking object or None if not found.
+        """
+        return await self._run(SqlRepository.get, id_)
+
+    async def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource.
+
+        Args:
+            resource_id (str): The ID of the resource.
+
+        Returns:
+            list[date]: A list of booked dates.
+        """
+        return await self._run(SqlRepository.get_booked_dates, resource_id)
+
+    async def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, in a single query.
+
+        Args:
+            dates (list[date]): The dates the resources must be free on.
+            resource_ids (list[str] | None): The resources to consider, or None for
+                all resources.
+
+        Returns:
+            list[str]: The IDs of the free resources, sorted.
+        """
+        return await self._run(
+            SqlRepository.get_available_resources, dates, resource_ids
+        )
+
+    async def add(self, booking: Booking) -> None:
+        """Add a new booking and commit it.
+
+        Args:
+            booking (Booking): A booking object to add.
+        """
+        await self._run(SqlRepository.add, booking, commit=True)
+
+    def close(self) -> None:
+        """Shut down the executor and close all pooled connections."""
+        self._executor.shutdown(wait=True)
+
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+    async def __aenter__(self) -> "AsyncSqlRepository":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def _run(
+        self, method: Callable[..., Any], *args: Any, commit: bool = False
+    ) -> Any:
+        """Run a `SqlRepository` method on the executor with a pooled connection.
+
+        The context, and so the current deadline, is carried over to the worker
+        thread. The call stops being awaited once the deadline passes, while the
+        query itself is cancelled by its own timeout.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(
+            self._executor, context.run, self._execute, method, args, commit
+        )
+
+        deadline = get_current_deadline()
+        if deadline is None:
+            return await future
+
+        try:
+            return await asyncio.wait_for(future, deadline.remaining())
+        except asyncio.TimeoutError as exc:
+            raise DeadlineExceeded("SQL query") from exc
+
+    def _execute(
+        self, method: Callable[..., Any], args: tuple[Any, ...], commit: bool
+    ) -> Any:
+        """Execute a `SqlRepository` method on the current worker's connection."""
+        connection = self._get_connection()
+
+        try:
+            result = method(SqlRepository(connection), *args)
+            if commit:
+                connection.commit()
+        except Exception:
+            if commit:
+                connection.rollback()
+            raise
+
+        return result
+
+    def _get_connection(self) -> pyodbc.Connection:
+        """Get the connection owned by the current worker thread."""
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = self.connection_factory()
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+
+        return connection
+
+
+def _available_resources_query(
+    schema: str, dates: list[date], resource_ids: list[str] | None
+) -> tuple[str, list[Any]]:
+    """Build the query selecting the resources free on all the dates.
+
+    The anti-join is answered from the (resource_id, date) unique index.
+
+    Args:
+        schema (str): The prefix of the table names, e.g. "dbo.".
+        dates (list[date]): The dates the resources must be free on.
+        resource_ids (list[str] | None): The resources to consider, or None for
+            all resources.
+
+    Returns:
+        tuple[str, list[Any]]: The query and its parameters.
+    """
+    conditions = []
+    params: list[Any] = []
+
+    if resource_ids is not None:
+        if not resource_ids:
+            return f"SELECT id FROM {schema}resource WHERE 1 = 0", []
+
+        conditions.append(f"r.id IN ({', '.join('?' * len(resource_ids))})")
+        params.extend(resource_ids)
+
+    if dates:
+        conditions.append(
+            f"NOT EXISTS (SELECT 1 FROM {schema}booking_dates d "
+            f"WHERE d.resource_id = r.id AND d.[date] IN "
+            f"({', '.join('?' * len(dates))}))"
+        )
+        params.extend(str(date_) for date_ in dates)
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    return f"SELECT r.id FROM {schema}resource r{where} ORDER BY r.id", params
+
+
+def _bookings_query(schema: str, since: Any) -> tuple[str, list[Any]]:
+    """Build the query of all booking dates, grouped by booking.
+
+    Args:
+        schema (str): The schema prefix of the tables, e.g. "dbo.".
+        since (Any): The creation time of the first bookings to include, in the
+            representation of the backend, or None.
+
+    Returns:
+        tuple[str, list[Any]]: The query and its parameters.
+    """
+    query = (
+        "SELECT b.id, b.resource_id, b.customer_name, b.created_date, d.[date] "
+        f"FROM {schema}booking AS b "
+        f"JOIN {schema}booking_dates AS d ON d.booking_id = b.id"
+    )
+    params = []
+
+    if since is not None:
+        query += " WHERE b.created_date >= ?"
+        params.append(since)
+
+    return query + " ORDER BY b.created_date, b.id, d.[date]", params
+
+
+def _group_booking_rows(
+    fetch: Callable[[], list],
+    parse_datetime: Callable[[Any], datetime] | None = None,
+    parse_date: Callable[[Any], date] | None = None,
+) -> Iterator[BookingRecord]:
+    """Group consecutive booking date rows into booking records.
+
+    Args:
+        fetch (Callable[[], list]): A callable returning the next batch of rows,
+            or an empty list once exhausted.
+        parse_datetime (Callable[[Any], datetime] | None): A callable converting
+            creation times, if the backend does not return datetimes.
+        parse_date (Callable[[Any], date] | None): A callable converting booked
+            dates, if the backend does not return dates.
+
+    Yields:
+        BookingRecord: The booking records, in the order of the rows.
+    """
+    booking, dates = None, []
+
+    while rows := fetch():
+        for id_, resource_id, customer_name, created_date, date_ in rows:
+            if booking is not None and booking[0] != id_:
+                yield BookingRecord(*booking, tuple(dates))
+                dates = []
+
+            if not dates:
+                if parse_datetime is not None:
+                    created_date = parse_datetime(created_date)
+                booking = (id_, resource_id, customer_name, created_date)
+            dates.append(parse_date(date_) if parse_date is not None else date_)
+
+    if booking is not None:
+        yield BookingRecord(*booking, tuple(dates))
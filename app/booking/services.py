@@ -1,18 +1,32 @@
 """Services module for managing bookings."""
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from datetime import date
 from uuid import uuid4
 
-from booking.model import Booking
-from booking.repository import AbstractRepository
+from booking.dates import format_run, parse_dates
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.occupancy import OccupancyIndex, OccupancyRepository
+from booking.repository import AbstractAsyncRepository, AbstractRepository
 
 
-def check_availability(dates: list[str], repo: AbstractRepository) -> dict[str, bool]:
+class UnknownRoomError(ValueError):
+    """Custom exception for rooms which do not exist."""
+
+
+def check_availability(
+    dates: list[str], repo: AbstractRepository, resource_id: str = DEFAULT_RESOURCE
+) -> dict[str, bool]:
     """Check availability of dates.
 
     Args:
         dates (list[str]): A list of dates to check availability for. Expected format is YYYY-MM-DD.
         repo (AbstractRepository): A repository instance to check against.
+        resource_id (str): The ID of the room to check, "main" unless the user names another room.
+
+    Raises:
+        ValueError: If a date is invalid, or the room does not exist.
 
     Returns:
         dict[str, bool]: A dictionary with dates as keys and availability as values.
@@ -22,25 +36,153 @@ def check_availability(dates: list[str], repo: AbstractRepository) -> dict[str,
         >>> check_availability(["2023-10-01", "2023-10-02"], repo)
         {'2023-10-01': False, '2023-10-02': True}
     """
-    availabilities = {}
+    input_dates = _parse_dates(dates)
+    booked_dates = repo.get_booked_dates(resource_id)
+    if not booked_dates:
+        _check_room(repo, resource_id)
 
-    try:
-        input_dates = [date.fromisoformat(str(d)) for d in dates]
-    except ValueError as e:
-        raise ValueError(
-            f"Invalid date format. Expected format is (YYYY-MM-DD): {e}"
-        ) from e
+    return _get_availabilities(input_dates, booked_dates)
+
+
+async def check_availability_async(
+    dates: list[str],
+    repo: AbstractAsyncRepository,
+    resource_id: str = DEFAULT_RESOURCE,
+) -> dict[str, bool]:
+    """Check availability of dates against an async repository.
+
+    Args:
+        dates (list[str]): A list of dates to check availability for. Expected format is YYYY-MM-DD.
+        repo (AbstractAsyncRepository): An async repository instance to check against.
+        resource_id (str): The ID of the room to check, "main" unless the user names another room.
+
+    Raises:
+        ValueError: If a date is invalid, or the room does not exist.
 
-    booked_dates = repo.get_booked_dates()
+    Returns:
+        dict[str, bool]: A dictionary with dates as keys and availability as values.
+            True if available, False if booked.
+    """
+    input_dates = _parse_dates(dates)
+    booked_dates = await repo.get_booked_dates(resource_id)
+    if not booked_dates:
+        await _check_room_async(repo, resource_id)
+
+    return _get_availabilities(input_dates, booked_dates)
+
+
+def check_availability_range(
+    start_date: str,
+    end_date: str,
+    repo: AbstractRepository,
+    resource_id: str = DEFAULT_RESOURCE,
+) -> dict[str, list]:
+    """Check availability of every date in a period, such as a whole month.
 
-    for date_ in input_dates:
-        availabilities[date_.isoformat()] = date_ not in booked_dates
+    Args:
+        start_date (str): The first date of the period. Expected format is YYYY-MM-DD.
+        end_date (str): The last date of the period, included. Expected format is YYYY-MM-DD.
+        repo (AbstractRepository): A repository instance to check against.
+        resource_id (str): The ID of the room to check, "main" unless the user names another room.
 
-    return availabilities
+    Raises:
+        ValueError: If a date is invalid, the period ends before it starts, or
+            the room does not exist.
+
+    Returns:
+        dict[str, list]: The available and booked dates, as single dates or
+            [first, last] ranges of consecutive dates.
+
+    Example:
+        >>> check_availability_range("2023-10-01", "2023-10-31", repo)
+        {'available': ['2023-10-01', ['2023-10-04', '2023-10-31']],
+         'booked': [['2023-10-02', '2023-10-03']]}
+    """
+    start, end = _parse_dates([start_date, end_date])
+    if end < start:
+        raise ValueError("The end date must not be before the start date.")
+
+    booked_dates = repo.get_booked_dates(resource_id)
+    if not booked_dates:
+        _check_room(repo, resource_id)
+
+    return _get_availability_runs(start, end, booked_dates)
+
+
+def get_occupancy(
+    start_date: str, end_date: str, period: str, repo: AbstractRepository
+) -> list[dict]:
+    """Get how full the rooms are over a period, such as a month or a quarter.
+
+    Args:
+        start_date (str): The first date of the period. Expected format is YYYY-MM-DD.
+        end_date (str): The last date of the period, included. Expected format is YYYY-MM-DD.
+        period (str): The breakdown of the occupancy, "day", "week" or "month".
+        repo (AbstractRepository): A repository instance to count the booked
+            dates of. An `OccupancyRepository` answers from its daily counts,
+            other repositories from the booked dates of every room.
+
+    Raises:
+        ValueError: If a date or the breakdown is invalid, or the period ends
+            before it starts or spans more than five years.
+
+    Returns:
+        list[dict]: For each day, week or month, its booked and bookable
+            room-days and the occupancy rate, between 0 and 1.
+
+    Example:
+        >>> get_occupancy("2023-10-01", "2023-11-30", "month", repo)
+        [{'period': '2023-10', 'booked': 31, 'capacity': 62, 'rate': 0.5},
+         {'period': '2023-11', 'booked': 6, 'capacity': 60, 'rate': 0.1}]
+    """
+    start, end = _parse_dates([start_date, end_date])
+
+    if isinstance(repo, OccupancyRepository):
+        return repo.get_occupancy(start, end, period)
+
+    # All rooms, as none are excluded by booked dates when no dates are given.
+    index = OccupancyIndex.from_repository(repo, repo.get_available_resources([]))
+
+    return index.occupancy(start, end, period)
+
+
+def find_available_rooms(dates: list[str], repo: AbstractRepository) -> list[str]:
+    """Find the rooms which are free on all the given dates.
+
+    Args:
+        dates (list[str]): A list of dates the rooms must be free on. Expected format is YYYY-MM-DD.
+        repo (AbstractRepository): A repository instance to check against.
+
+    Returns:
+        list[str]: The IDs of the free rooms, sorted.
+
+    Example:
+        >>> find_available_rooms(["2023-10-01", "2023-10-02"], repo)
+        ['annex', 'main']
+    """
+    return repo.get_available_resources(_parse_dates(dates))
+
+
+async def find_available_rooms_async(
+    dates: list[str], repo: AbstractAsyncRepository
+) -> list[str]:
+    """Find the rooms which are free on all the given dates, asynchronously.
+
+    Args:
+        dates (list[str]): A list of dates the rooms must be free on. Expected format is YYYY-MM-DD.
+        repo (AbstractAsyncRepository): An async repository instance to check against.
+
+    Returns:
+        list[str]: The IDs of the free rooms, sorted.
+    """
+    return await repo.get_available_resources(_parse_dates(dates))
 
 
 def create_booking(
-    dates: list[str], customer_name: str, repo: AbstractRepository
+    dates: list[str],
+    customer_name: str,
+    repo: AbstractRepository,
+    resource_id: str = DEFAULT_RESOURCE,
 ) -> str:
     """Create a new booking for the specified dates and customer.
 
@@ -48,13 +190,135 @@ def create_booking(
         dates (list[str]): List of dates to book in ISO format (YYYY-MM-DD).
         customer_name (str): Name of the customer making the booking.
         repo (AbstractRepository): Repository to store the booking.
+        resource_id (str): The ID of the room to book, "main" unless the user names another room.
+
+    Raises:
+        UnknownRoomError: If the room does not exist.
 
     Returns:
         str: The ID of the newly created booking.
     """
+    _check_room(repo, resource_id)
     booking_id = str(uuid4())
 
-    booking = Booking(booking_id, dates, customer_name)
+    booking = Booking(booking_id, dates, customer_name, resource_id)
     repo.add(booking)
 
-    return booking_id
\ No newline at end of file
+    return booking_id
+
+
+async def create_booking_async(
+    dates: list[str],
+    customer_name: str,
+    repo: AbstractAsyncRepository,
+    resource_id: str = DEFAULT_RESOURCE,
+) -> str:
+    """Create a new booking for the specified dates and customer.
+
+    Args:
+        dates (list[str]): List of dates to book in ISO format (YYYY-MM-DD).
+        customer_name (str): Name of the customer making the booking.
+        repo (AbstractAsyncRepository): Async repository to store the booking.
+        resource_id (str): The ID of the room to book, "main" unless the user names another room.
+
+    Raises:
+        UnknownRoomError: If the room does not exist.
+
+    Returns:
+        str: The ID of the newly created booking.
+    """
+    await _check_room_async(repo, resource_id)
+    booking_id = str(uuid4())
+
+    booking = Booking(booking_id, dates, customer_name, resource_id)
+    await repo.add(booking)
+
+    return booking_id
+
+
+def _parse_dates(dates: list[str]) -> list[date]:
+    """Parse a list of ISO 8601 dates.
+
+    Raises:
+        ValueError: If any of the dates is not in the YYYY-MM-DD format.
+    """
+    try:
+        return parse_dates(dates)
+    except ValueError as e:
+        raise ValueError(
+            f"Invalid date format. Expected format is (YYYY-MM-DD): {e}"
+        ) from e
+
+
+def _check_room(repo: AbstractRepository, resource_id: str) -> None:
+    """Check that a room exists.
+
+    Raises:
+        UnknownRoomError: If the room does not exist.
+    """
+    if not repo.get_available_resources([], [resource_id]):
+        raise UnknownRoomError(f"Unknown room '{resource_id}'.")
+
+
+async def _check_room_async(repo: AbstractAsyncRepository, resource_id: str) -> None:
+    """Check that a room exists, against an async repository.
+
+    Raises:
+        UnknownRoomError: If the room does not exist.
+    """
+    if not await repo.get_available_resources([], [resource_id]):
+        raise UnknownRoomError(f"Unknown room '{resource_id}'.")
+
+
+def _get_availabilities(
+    input_dates: list[date], booked_dates: Sequence[date]
+) -> dict[str, bool]:
+    """Map each input date to its availability given the sorted booked dates."""
+    return {
+        date_.isoformat(): not _is_booked(date_, booked_dates) for date_ in input_dates
+    }
+
+
+def _get_availability_runs(
+    start: date, end: date, booked_dates: Sequence[date]
+) -> dict[str, list]:
+    """Group the days of a period into runs, given the sorted booked dates.
+
+    Only the booked dates within the period are visited, so long periods cost
+    no more than short ones.
+    """
+    runs = {"available": [], "booked": []}
+    first = bisect_left(booked_dates, start)
+    last = bisect_right(booked_dates, end)
+
+    day = start.toordinal()
+    pos = first
+    while pos < last:
+        run_start = booked_dates[pos].toordinal()
+        run_end = run_start
+        pos += 1
+        while pos < last and booked_dates[pos].toordinal() == run_end + 1:
+            run_end += 1
+            pos += 1
+
+        if day < run_start:
+            runs["available"].append(_format_run(day, run_start - 1))
+        runs["booked"].append(_format_run(run_start, run_end))
+        day = run_end + 1
+
+    if day <= end.toordinal():
+        runs["available"].append(_format_run(day, end.toordinal()))
+
+    return runs
+
+
+def _format_run(first: int, last: int) -> str | list[str]:
+    """Format a run of date ordinals, see `dates.format_run`."""
+    return format_run(date.fromordinal(first), date.fromordinal(last))
+
+
+def _is_booked(date_: date, booked_dates: Sequence[date]) -> bool:
+    """Binary search a date in the sorted booked dates, without copying them."""
+    pos = bisect_left(booked_dates, date_)
+
+    return pos < len(booked_dates) and booked_dates[pos] == date_
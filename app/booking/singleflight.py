@@ -0,0 +1,206 @@
+"""Request coalescing for concurrent identical repository reads.
+
+Concurrent callers asking for the same key share a single in-flight call and
+its result instead of each issuing their own query. Results are shared as-is,
+so callers must not mutate them.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractAsyncRepository, AbstractRepository
+
+
+@dataclass
+class CoalescingStats:
+    """Counters describing how many calls were coalesced."""
+
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of calls served by another caller's in-flight execution."""
+        return self.calls - self.executions
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of calls that were coalesced, between 0 and 1."""
+        return self.coalesced / self.calls if self.calls else 0.0
+
+
+class SingleFlight:
+    """Thread-based singleflight: one execution per key at a time."""
+
+    def __init__(self) -> None:
+        self.stats = CoalescingStats()
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Call `func(*args)`, or wait for the in-flight call with the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            func (Callable[..., Any]): The function to execute.
+
+        Returns:
+            Any: The result of the shared execution. Exceptions are propagated
+                to every waiting caller.
+        """
+        with self._lock:
+            self.stats.calls += 1
+            future = self._calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats.executions += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args)
+        except BaseException as exc:
+            self._forget(key)
+            future.set_exception(exc)
+            raise
+
+        self._forget(key)
+        future.set_result(result)
+
+        return result
+
+    def _forget(self, key: Hashable) -> None:
+        """Remove a completed call so that later callers execute again."""
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """Asyncio-based singleflight: one execution per key at a time."""
+
+    def __init__(self) -> None:
+        self.stats = CoalescingStats()
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Any:
+        """Await `func(*args)`, or the in-flight call with the same key.
+
+        The shared call is shielded, so cancelling one waiting caller does not
+        cancel the execution for the others.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            func (Callable[..., Awaitable[Any]]): The coroutine function to execute.
+
+        Returns:
+            Any: The result of the shared execution.
+        """
+        self.stats.calls += 1
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func(*args))
+            self._calls[key] = task
+            self.stats.executions += 1
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task)
+
+
+class CoalescingRepository:
+    """Repository wrapper coalescing concurrent identical reads."""
+
+    def __init__(self, repository: AbstractRepository) -> None:
+        self.repository = repository
+        self.singleflight = SingleFlight()
+
+    @property
+    def stats(self) -> CoalescingStats:
+        """Coalescing counters for all reads."""
+        return self.singleflight.stats
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        return self.singleflight.do(("get", id_), self.repository.get, id_)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource."""
+        return self.singleflight.do(
+            ("get_booked_dates", resource_id),
+            self.repository.get_booked_dates,
+            resource_id,
+        )
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates."""
+        return self.singleflight.do(
+            ("get_available_resources", *_resources_key(dates, resource_ids)),
+            self.repository.get_available_resources,
+            dates,
+            resource_ids,
+        )
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+        self.repository.add(booking)
+
+
+class AsyncCoalescingRepository:
+    """Async repository wrapper coalescing concurrent identical reads."""
+
+    def __init__(self, repository: AbstractAsyncRepository) -> None:
+        self.repository = repository
+        self.singleflight = AsyncSingleFlight()
+
+    @property
+    def stats(self) -> CoalescingStats:
+        """Coalescing counters for all reads."""
+        return self.singleflight.stats
+
+    async def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        return await self.singleflight.do(("get", id_), self.repository.get, id_)
+
+    async def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource."""
+        return await self.singleflight.do(
+            ("get_booked_dates", resource_id),
+            self.repository.get_booked_dates,
+            resource_id,
+        )
+
+    async def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates."""
+        return await self.singleflight.do(
+            ("get_available_resources", *_resources_key(dates, resource_ids)),
+            self.repository.get_available_resources,
+            dates,
+            resource_ids,
+        )
+
+    async def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+        await self.repository.add(booking)
+
+
+def _resources_key(
+    dates: list[date], resource_ids: list[str] | None
+) -> tuple[tuple[date, ...], tuple[str, ...] | None]:
+    """Get a hashable key for the arguments of `get_available_resources`."""
+    return tuple(dates), tuple(resource_ids) if resource_ids is not None else None
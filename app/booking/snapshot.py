@@ -0,0 +1,362 @@
+"""Shared booked-date snapshot for multi-process workers.
+
+A snapshot is a memory-mapped file holding a small header followed by the
+sorted ordinals of all booked dates as int32 values:
+
+    magic (4s) | format (uint32) | version (uint64) | count (uint32) | ordinals
+
+One process per host, the one holding the snapshot lock, refreshes the
+snapshot from the repository and publishes it with an atomic file replace.
+Every worker maps the file and answers lookups with a binary search over the
+mapped ordinals, without copying them or querying the database.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date
+from typing import Any
+
+import pyodbc
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import AbstractRepository, SqlRepository
+
+
+logger = logging.getLogger("app")
+
+SNAPSHOT_MAGIC = b"BKDS"
+SNAPSHOT_FORMAT = 1
+HEADER = struct.Struct("<4sIQI")
+
+
+class InvalidSnapshot(ValueError):
+    """Custom exception for unreadable snapshot files."""
+
+
+class BookedDatesView(Sequence):
+    """Read-only, zero-copy view of sorted booked dates."""
+
+    def __init__(self, ordinals: Sequence[int], version: int) -> None:
+        self._ordinals = ordinals
+        self.version = version
+
+    @property
+    def ordinals(self) -> Sequence[int]:
+        """The sorted ordinals of the booked dates, without copying them."""
+        return self._ordinals
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [date.fromordinal(o) for o in self._ordinals[index]]
+        return date.fromordinal(self._ordinals[index])
+
+    def __iter__(self) -> Iterator[date]:
+        return (date.fromordinal(o) for o in self._ordinals)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, date):
+            return False
+
+        ordinal = value.toordinal()
+        pos = bisect_left(self._ordinals, ordinal)
+
+        return pos < len(self._ordinals) and self._ordinals[pos] == ordinal
+
+
+class SnapshotWriter:
+    """Publish booked-date snapshots to a file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.version = 0
+        self.reload_version()
+
+    def publish(self, booked_dates: Iterable[date]) -> int:
+        """Atomically replace the snapshot with the given booked dates.
+
+        Args:
+            booked_dates (Iterable[date]): The booked dates, in any order.
+
+        Returns:
+            int: The version of the published snapshot.
+        """
+        ordinals = array("i", sorted({d.toordinal() for d in booked_dates}))
+        self.version += 1
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(
+                    HEADER.pack(
+                        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, self.version, len(ordinals)
+                    )
+                )
+                f.write(ordinals.tobytes())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return self.version
+
+    def reload_version(self) -> int:
+        """Continue from the version of the existing snapshot, if any.
+
+        Needed after taking over from another writer, whose snapshots have
+        moved the version on since this writer was created.
+
+        Returns:
+            int: The version of the existing snapshot, or 0.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                magic, _, version, _ = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            magic, version = None, 0
+
+        self.version = version if magic == SNAPSHOT_MAGIC else 0
+        return self.version
+
+
+class SnapshotReader:
+    """Read booked dates from a memory-mapped snapshot file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file_id = None
+        self._view = None
+        self._lock = threading.Lock()
+
+    def booked_dates(self) -> BookedDatesView:
+        """Get a view of the latest published booked dates.
+
+        Returns:
+            BookedDatesView: The booked dates of the latest snapshot.
+
+        Raises:
+            FileNotFoundError: If no snapshot was published yet.
+            InvalidSnapshot: If the file is not a valid snapshot.
+        """
+        stat = os.stat(self.path)
+        file_id = (stat.st_dev, stat.st_ino)
+
+        with self._lock:
+            if file_id != self._file_id:
+                self._view = self._map()
+                self._file_id = file_id
+
+            return self._view
+
+    def _map(self) -> BookedDatesView:
+        """Map the snapshot file and return a view over its ordinals.
+
+        The mapping is kept alive by the views referencing it, and closed once
+        the last of them is garbage collected.
+        """
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise InvalidSnapshot(f"Snapshot {self.path} is truncated.")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, format_, version, count = HEADER.unpack_from(mapped)
+        if magic != SNAPSHOT_MAGIC or format_ != SNAPSHOT_FORMAT:
+            raise InvalidSnapshot(f"{self.path} is not a booked-date snapshot.")
+
+        end = HEADER.size + count * 4
+        if len(mapped) < end:
+            raise InvalidSnapshot(f"Snapshot {self.path} is truncated.")
+
+        ordinals = memoryview(mapped)[HEADER.size : end].cast("i")
+
+        return BookedDatesView(ordinals, version)
+
+
+class SnapshotRefresher:
+    """Keep a snapshot current from a repository in a background thread.
+
+    A snapshot holds the booked dates of a single resource. Only one refresher
+    per snapshot path is active across processes; the others find the snapshot
+    lock taken and try again every interval, so that one of them takes over
+    when the active refresher stops or its process dies.
+    """
+
+    def __init__(
+        self,
+        repository: AbstractRepository,
+        path: str,
+        interval: float = 5.0,
+        resource_id: str = DEFAULT_RESOURCE,
+    ) -> None:
+        """Initialize the refresher.
+
+        The repository is queried from the background thread, so it must have a
+        connection of its own: pyodbc connections must not run queries from two
+        threads at once. See `from_connection_factory`.
+
+        Args:
+            repository (AbstractRepository): The repository to read the booked
+                dates from, not shared with the request threads.
+            path (str): The path of the snapshot file.
+            interval (float): The number of seconds between refreshes.
+            resource_id (str): The resource whose booked dates are published.
+        """
+        self.repository = repository
+        self.writer = SnapshotWriter(path)
+        self.interval = interval
+        self.resource_id = resource_id
+
+        self._lock_file = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_connection_factory(
+        cls,
+        connection_factory: Callable[[], pyodbc.Connection],
+        path: str,
+        interval: float = 5.0,
+        resource_id: str = DEFAULT_RESOURCE,
+    ) -> "SnapshotRefresher":
+        """Create a refresher querying a dedicated database connection.
+
+        Args:
+            connection_factory (Callable[[], pyodbc.Connection]): A callable
+                returning a new database connection, e.g.
+                `config.get_database_connection`.
+            path (str): The path of the snapshot file.
+            interval (float): The number of seconds between refreshes.
+            resource_id (str): The resource whose booked dates are published.
+
+        Returns:
+            SnapshotRefresher: The refresher, not started yet.
+        """
+        return cls(SqlRepository(connection_factory()), path, interval, resource_id)
+
+    def refresh(self) -> int:
+        """Publish a snapshot of the current booked dates.
+
+        Returns:
+            int: The version of the published snapshot.
+        """
+        return self.writer.publish(self.repository.get_booked_dates(self.resource_id))
+
+    def start(self) -> bool:
+        """Start refreshing, at once if no other process holds the snapshot lock.
+
+        Returns:
+            bool: True if this refresher became the active one right away.
+        """
+        active = self._acquire_lock()
+        if active:
+            self.refresh()
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="snapshot-refresher", daemon=True
+        )
+        self._thread.start()
+
+        return active
+
+    def stop(self) -> None:
+        """Stop refreshing and release the snapshot lock."""
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _run(self) -> None:
+        """Refresh the snapshot until stopped, once holding the snapshot lock."""
+        while not self._stop.wait(self.interval):
+            if self._lock_file is None and not self._acquire_lock():
+                continue
+
+            try:
+                self.refresh()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to refresh the booked-date snapshot.")
+
+    def _acquire_lock(self) -> bool:
+        """Try to take the cross-process snapshot lock without blocking."""
+        lock_file = open(  # pylint: disable=consider-using-with
+            f"{self.writer.path}.lock", "a", encoding="utf-8"
+        )
+
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+
+        self._lock_file = lock_file
+        # Snapshots may have been published by the previous holder of the lock.
+        self.writer.reload_version()
+
+        return True
+
+
+class SnapshotRepository:
+    """Repository answering booked-date reads of a resource from a shared snapshot.
+
+    Booked dates may lag behind the database by up to the refresh interval.
+    Reads of other resources and writes still go to the wrapped repository,
+    which enforces unique dates.
+    """
+
+    def __init__(
+        self,
+        repository: AbstractRepository,
+        reader: SnapshotReader,
+        resource_id: str = DEFAULT_RESOURCE,
+    ) -> None:
+        self.repository = repository
+        self.reader = reader
+        self.resource_id = resource_id
+
+    def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        return self.repository.get(id_)
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> Sequence[date]:
+        """Get all booked dates from the snapshot, falling back to the repository."""
+        if resource_id != self.resource_id:
+            return self.repository.get_booked_dates(resource_id)
+
+        try:
+            return self.reader.booked_dates()
+        except (FileNotFoundError, InvalidSnapshot):
+            logger.warning("Booked-date snapshot unavailable, querying repository.")
+            return self.repository.get_booked_dates(resource_id)
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates, from the repository."""
+        return self.repository.get_available_resources(dates, resource_ids)
+
+    def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+        self.repository.add(booking)
@@ -0,0 +1,201 @@
+"""Warm-up of the process before it serves its first request.
+
+Without warm-up, the first conversation of a worker pays for the discovery of
+the credential chain, token fetches, loading the ODBC driver and opening a
+connection, importing the tool modules and generating their schemas, and
+setting up the OpenAI client. A `Warmup` runs these steps at startup,
+sequentially or in parallel, times each of them, and backs a readiness check.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from booking.ai.client import compile_tool
+from booking.config import (
+    OPENAI_TOKEN_SCOPE,
+    SQL_TOKEN_SCOPE,
+    get_credential,
+    get_database_connection,
+    get_openai_client,
+    get_sqlite_connection,
+)
+
+
+logger = logging.getLogger("app")
+
+
+@dataclass
+class StepResult:
+    """Outcome of a warm-up step."""
+
+    name: str
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the step succeeded."""
+        return self.error is None
+
+
+class Warmup:
+    """Run warm-up steps and report whether the process is ready."""
+
+    def __init__(
+        self,
+        steps: dict[str, Callable[[], Any]],
+        parallel: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Initialize the warm-up.
+
+        Args:
+            steps (dict[str, Callable[[], Any]]): The steps to run, by name.
+            parallel (bool): Whether to run the steps concurrently, in which case
+                they must not depend on each other.
+        """
+        self.steps = steps
+        self.parallel = parallel
+        self.clock = clock
+        self.results: dict[str, StepResult] = {}
+
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether every step ran and succeeded."""
+        with self._lock:
+            return len(self.results) == len(self.steps) and all(
+                result.ok for result in self.results.values()
+            )
+
+    def run(self) -> dict[str, StepResult]:
+        """Run the steps, recording failures rather than raising them.
+
+        Can be called again to retry after a failure.
+
+        Returns:
+            dict[str, StepResult]: The results of the steps, in step order.
+        """
+        start = self.clock()
+
+        if self.parallel and len(self.steps) > 1:
+            with ThreadPoolExecutor(
+                max_workers=len(self.steps), thread_name_prefix="warmup"
+            ) as executor:
+                results = list(executor.map(self._run_step, self.steps.items()))
+        else:
+            results = [self._run_step(step) for step in self.steps.items()]
+
+        with self._lock:
+            self.results = {result.name: result for result in results}
+
+        logger.info(
+            "Warm-up %s in %.3fs.",
+            "succeeded" if self.ready else "failed",
+            self.clock() - start,
+        )
+
+        return self.results
+
+    def status(self) -> dict[str, Any]:
+        """Get the readiness of the process, e.g. for a readiness probe.
+
+        Returns:
+            dict[str, Any]: Whether the process is ready, and the duration and
+                error of each step run.
+        """
+        with self._lock:
+            steps = {
+                name: {"seconds": round(result.seconds, 3), "error": result.error}
+                for name, result in self.results.items()
+            }
+
+        return {"ready": self.ready, "steps": steps}
+
+    def _run_step(self, step: tuple[str, Callable[[], Any]]) -> StepResult:
+        """Run and time a single step."""
+        name, func = step
+        start = self.clock()
+
+        try:
+            func()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            seconds = self.clock() - start
+            logger.exception("Warm-up step %s failed after %.3fs.", name, seconds)
+            return StepResult(name, seconds, f"{type(exc).__name__}: {exc}")
+
+        seconds = self.clock() - start
+        logger.info("Warm-up step %s took %.3fs.", name, seconds)
+
+        return StepResult(name, seconds)
+
+
+def warm_tools(tools: list[tuple[str, str]]) -> None:
+    """Import the tool modules and generate the tool definitions.
+
+    Args:
+        tools (list[tuple[str, str]]): The module and function names of the tools,
+            as passed to `LLMClient`.
+    """
+    for module_name, function_name in tools:
+        compile_tool(getattr(importlib.import_module(module_name), function_name))
+
+
+def warm_database(backend: str = "sql") -> None:
+    """Open a connection and run a trivial query, loading the database driver.
+
+    The connection is closed afterwards: only the loading of the driver and its
+    one-time initialization are saved, not the next connection.
+
+    Args:
+        backend (str): The database backend, "sql" or "sqlite".
+    """
+    if backend == "sqlite":
+        connection = get_sqlite_connection()
+    else:
+        connection = get_database_connection()
+
+    try:
+        connection.execute("SELECT 1").fetchone()
+    finally:
+        connection.close()
+
+
+def create_warmup(
+    tools: list[tuple[str, str]],
+    backend: str = "sql",
+    parallel: bool = False,
+) -> Warmup:
+    """Create the warm-up of the services used by a booking assistant.
+
+    Args:
+        tools (list[tuple[str, str]]): The tools of the assistant, as passed to
+            `LLMClient`.
+        backend (str): The database backend, "sql" or "sqlite".
+        parallel (bool): Whether to run the steps concurrently.
+
+    Returns:
+        Warmup: The warm-up, not run yet.
+    """
+    steps = {"credential": get_credential}
+
+    if backend == "sql":
+        steps["database_token"] = lambda: get_credential().get_token(SQL_TOKEN_SCOPE)
+
+    steps.update(
+        {
+            "database": lambda: warm_database(backend),
+            "tools": lambda: warm_tools(tools),
+            "openai_token": lambda: get_credential().get_token(OPENAI_TOKEN_SCOPE),
+            "openai_client": get_openai_client,
+        }
+    )
+
+    return Warmup(steps, parallel=parallel)
@@ -0,0 +1,85 @@
+"""Tests for the ai.cassette module."""
+
+import pytest
+
+from booking.ai.cassette import CassetteMismatch, RecordingClient, ReplayClient
+from booking.ai.client import LLMClient
+from booking.model import Booking
+from tests.shared import FakeOpenAIClient, FakeRepository, create_response
+
+TOOLS = [("booking.services", "check_availability")]
+
+
+def create_scripted_client() -> FakeOpenAIClient:
+    """Create a client answering one availability question with a tool call."""
+    return FakeOpenAIClient(
+        [
+            create_response(
+                "resp_1",
+                tool_calls=[
+                    (
+                        "check_availability",
+                        {"dates": ["2023-10-01"], "repo": None, "resource_id": "main"},
+                    )
+                ],
+            ),
+            create_response("resp_2", output_text="The room is booked."),
+        ]
+    )
+
+
+@pytest.fixture(name="cassette_path")
+def record_cassette(tmp_path) -> str:
+    """Record a conversation turn to a cassette."""
+    path = str(tmp_path / "cassette.json")
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    llm_client = LLMClient(
+        RecordingClient(create_scripted_client(), path), "gpt-4o-mini", repo, TOOLS
+    )
+
+    llm_client.chat("Is the room free on the 1st?", timeout=30)
+
+    return path
+
+
+def test_replay_serves_recorded_turn(cassette_path: str) -> None:
+    """Test that a recorded turn is replayed identically, tool calls included."""
+    sleeps = []
+    replay_client = ReplayClient(cassette_path, latency_scale=2, sleep=sleeps.append)
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    llm_client = LLMClient(replay_client, "gpt-4o-mini", repo, TOOLS)
+
+    response = llm_client.chat("Is the room free on the 1st?")
+
+    assert response == "The room is booked."
+    assert llm_client.conversation_id == "resp_2"
+    assert len(sleeps) == 2
+    assert [i["request"].get("timeout") for i in replay_client.interactions] == [
+        None,
+        None,
+    ]
+
+
+def test_replay_rejects_mismatching_requests(cassette_path: str) -> None:
+    """Test that a request differing from the recording is rejected."""
+    replay_client = ReplayClient(cassette_path, latency_scale=0)
+    llm_client = LLMClient(replay_client, "gpt-4o-mini", FakeRepository(), TOOLS)
+
+    with pytest.raises(CassetteMismatch):
+        llm_client.chat("Is the room free on the 2nd?")
+
+
+def test_replay_can_be_rewound(cassette_path: str) -> None:
+    """Test that a cassette can be replayed several times."""
+    replay_client = ReplayClient(cassette_path, latency_scale=0)
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    llm_client = LLMClient(replay_client, "gpt-4o-mini", repo, TOOLS)
+
+    for _ in range(2):
+        replay_client.rewind()
+        llm_client.conversation_id = None
+
+        assert llm_client.chat("Is the room free on the 1st?") == "The room is booked."
+
+    with pytest.raises(CassetteMismatch):
+        llm_client.chat("Is the room free on the 1st?")
@@ -1,8 +1,20 @@
 """Tests for the ai.client module."""
 
+import json
+import pstats
+import time
+
 import pytest
 
 from booking.ai.client import LLMClient
+from booking.ai.encoders import CompactResultEncoder
+from booking.ai.routing import ModelRouter
+from booking.cache import CachedRepository, Prefetcher
+from booking.deadline import DeadlineExceeded
+from booking.model import Booking
+from booking.profiling import TurnProfiler
+from booking.repository import SqliteRepository
+from tests.shared import FakeOpenAIClient, FakeRepository, create_response
 
 
 def tool_function() -> None:
@@ -86,6 +98,342 @@ def test_client_resolve_tools_fails_with_invalid_function():
         _ = LLMClient(None, None, None, test_tools)
 
 
+def test_client_sends_encoded_tool_results():
+    """Test that tool results are serialized with the client's encoder."""
+    openai_client = FakeOpenAIClient(
+        [
+            create_response(
+                "resp_1",
+                tool_calls=[
+                    (
+                        "check_availability",
+                        {
+                            "dates": ["2023-10-01", "2023-10-02"],
+                            "repo": None,
+                            "resource_id": "main",
+                        },
+                    )
+                ],
+            ),
+            create_response("resp_2", output_text="The 2nd is free."),
+        ]
+    )
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        repo,
+        [("booking.services", "check_availability")],
+        result_encoder=CompactResultEncoder(),
+    )
+
+    response = llm_client.chat("Is the room free on the 1st and 2nd?")
+
+    assert response == "The 2nd is free."
+    assert openai_client.requests[1]["input"] == [
+        {
+            "type": "function_call_output",
+            "call_id": "call_0",
+            "output": '{"available":["2023-10-02"],"booked":["2023-10-01"]}',
+        }
+    ]
+    assert llm_client.conversation_id == "resp_2"
+
+
+@pytest.mark.parametrize(
+    "test_tool_call, expected_error",
+    [
+        (
+            (
+                "check_availability",
+                {"dates": ["2023-13-01"], "repo": None, "resource_id": "main"},
+            ),
+            "Invalid",
+        ),
+        (("cancel_booking", {"booking_id": "123"}), "Unknown tool"),
+    ],
+)
+def test_client_reports_invalid_tool_calls_without_calling_tools(
+    test_tool_call: tuple[str, dict], expected_error: str
+):
+    """Test that invalid tool calls are reported to the model before dispatch."""
+    openai_client = FakeOpenAIClient(
+        [
+            create_response("resp_1", tool_calls=[test_tool_call]),
+            create_response("resp_2", output_text="Please check the dates."),
+        ]
+    )
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        None,
+        [("booking.services", "check_availability")],
+    )
+
+    llm_client.chat("Is the room free on the 1st of the 13th month?")
+
+    output = json.loads(openai_client.requests[1]["input"][0]["output"])
+
+    assert output["error"].startswith(expected_error)
+
+
+@pytest.mark.parametrize(
+    "tool_call, expected_error",
+    [
+        (
+            (
+                "check_availability",
+                {"dates": ["2023-10-01"], "repo": None, "resource_id": "attic"},
+            ),
+            "Unknown room 'attic'.",
+        ),
+        (
+            (
+                "create_booking",
+                {
+                    "dates": ["2023-10-01"],
+                    "customer_name": "John Dory",
+                    "repo": None,
+                    "resource_id": "main",
+                },
+            ),
+            "The dates are already booked.",
+        ),
+    ],
+)
+def test_client_reports_rejected_tool_calls(
+    sqlite_session, tool_call: tuple, expected_error: str
+):
+    """Test that unknown rooms and booked dates are reported to the model."""
+    repo = SqliteRepository(sqlite_session)
+    repo.add(Booking("123", ["2023-10-01"], ""))
+    openai_client = FakeOpenAIClient(
+        [
+            create_response("resp_1", tool_calls=[tool_call]),
+            create_response("resp_2", output_text="Sorry."),
+        ]
+    )
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        repo,
+        [
+            ("booking.services", "check_availability"),
+            ("booking.services", "create_booking"),
+        ],
+    )
+
+    assert llm_client.chat("Is the attic free on the 1st?") == "Sorry."
+
+    output = json.loads(openai_client.requests[1]["input"][0]["output"])
+    assert output == {"error": expected_error}
+
+
+class SlowOpenAIClient(FakeOpenAIClient):
+    """Fake OpenAI client responding only once the prefetch completed."""
+
+    def __init__(self, responses: list, prefetcher: Prefetcher) -> None:
+        super().__init__(responses)
+        self.prefetcher = prefetcher
+
+    def create(self, **kwargs):
+        """Wait for the prefetch, then return the next scripted response."""
+        self.prefetcher.wait(timeout=5)
+        return super().create(**kwargs)
+
+
+def test_client_prefetches_when_a_turn_starts():
+    """Test that the tool reads booked dates prefetched at the start of the turn."""
+    repo = CachedRepository(FakeRepository([Booking("123", ["2023-10-01"], "")]))
+    prefetcher = Prefetcher(repo.warm)
+    openai_client = SlowOpenAIClient(
+        [
+            create_response(
+                "resp_1",
+                tool_calls=[
+                    (
+                        "check_availability",
+                        {"dates": ["2023-10-01"], "repo": None, "resource_id": "main"},
+                    )
+                ],
+            ),
+            create_response("resp_2", output_text="The room is booked."),
+        ],
+        prefetcher,
+    )
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        repo,
+        [("booking.services", "check_availability")],
+        prefetcher=prefetcher,
+    )
+
+    llm_client.chat("Is the room free on the 1st?")
+
+    assert prefetcher.started == 1
+    assert (repo.stats.hits, repo.stats.misses) == (1, 0)
+
+
+def record_tool_call(repo: FakeRepository) -> str:
+    """Record the call in the events of the repository.
+
+    Args:
+        repo (Any): A repository. Pass None as a default.
+    """
+    repo.events.append("tool")
+    return "done"
+
+
+def test_client_waits_for_the_prefetch_before_running_tools():
+    """Test that tools do not query the repository while a prefetch runs."""
+    repo = FakeRepository()
+    repo.events = []
+
+    def warm() -> None:
+        time.sleep(0.05)
+        repo.events.append("prefetch")
+
+    prefetcher = Prefetcher(warm)
+    openai_client = FakeOpenAIClient(
+        [
+            create_response(
+                "resp_1", tool_calls=[("record_tool_call", {"repo": None})]
+            ),
+            create_response("resp_2", output_text="Done."),
+        ]
+    )
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        repo,
+        [("tests.ai.test_client", "record_tool_call")],
+        prefetcher=prefetcher,
+    )
+
+    llm_client.chat("Hello")
+
+    assert repo.events == ["prefetch", "tool"]
+
+
+def slow_tool(repo: str) -> str:
+    """Return once the time budget of the turn is exhausted.
+
+    Args:
+        repo (Any): A repository. Pass None as a default.
+    """
+    time.sleep(0.05)
+    return "done"
+
+
+def test_client_passes_remaining_time_to_the_model_call():
+    """Test that the model call times out with the turn deadline."""
+    openai_client = FakeOpenAIClient([create_response("resp_1", output_text="Hi")])
+    llm_client = LLMClient(openai_client, "gpt-4o-mini", None, [], turn_timeout=5)
+
+    llm_client.chat("Hello")
+
+    assert 0 < openai_client.requests[0]["timeout"] <= 5
+
+
+def test_client_cancels_remaining_work_after_deadline():
+    """Test that a turn over its deadline raises and leaves the conversation as is."""
+    openai_client = FakeOpenAIClient(
+        [
+            create_response(
+                "resp_1",
+                tool_calls=[
+                    ("slow_tool", {"repo": None}),
+                    ("slow_tool", {"repo": None}),
+                ],
+            ),
+            create_response("resp_2", output_text="Done."),
+        ]
+    )
+    llm_client = LLMClient(
+        openai_client, "gpt-4o-mini", None, [("tests.ai.test_client", "slow_tool")]
+    )
+
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        llm_client.chat("Run the slow tool twice.", timeout=0.01)
+
+    assert exc_info.value.stage == "tool call"
+    assert len(openai_client.requests) == 1
+    assert llm_client.conversation_id is None
+
+
+def test_client_profiles_requested_turns(tmp_path):
+    """Test that a turn asked to be profiled writes a profile of its tool calls."""
+    openai_client = FakeOpenAIClient(
+        [
+            create_response(
+                "resp_1",
+                tool_calls=[
+                    (
+                        "check_availability",
+                        {"dates": ["2023-10-01"], "repo": None, "resource_id": "main"},
+                    )
+                ],
+            ),
+            create_response("resp_2", output_text="The room is free."),
+        ]
+    )
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        FakeRepository(),
+        [("booking.services", "check_availability")],
+        profiler=TurnProfiler(str(tmp_path), sample_rate=0),
+    )
+
+    llm_client.chat("Is the room free on the 1st?", profile=True)
+
+    (profile_path,) = tmp_path.iterdir()
+    functions = {name for _, _, name in pstats.Stats(str(profile_path)).stats}
+
+    assert {"_process_tool_call", "get_booked_dates"} <= functions
+
+
+def test_client_routes_tool_results_to_the_configured_model():
+    """Test that the follow-up call with tool results uses its own route."""
+    openai_client = FakeOpenAIClient(
+        [
+            create_response(
+                "resp_1",
+                tool_calls=[
+                    (
+                        "check_availability",
+                        {"dates": ["2023-10-01"], "repo": None, "resource_id": "main"},
+                    )
+                ],
+            ),
+            create_response("resp_2", output_text="The 1st is free."),
+        ]
+    )
+    router = ModelRouter("gpt-4o", tool_results="gpt-4o-mini")
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o",
+        FakeRepository(),
+        [("booking.services", "check_availability")],
+        router=router,
+    )
+
+    llm_client.chat("Is the room free on the first day of next month?")
+
+    assert [r["model"] for r in openai_client.requests] == ["gpt-4o", "gpt-4o-mini"]
+    assert {name: stats.calls for name, stats in router.stats.items()} == {
+        "default": 1,
+        "tool_results": 1,
+    }
+
+
+def test_client_rejects_routers_with_another_default_model():
+    """Test that the model of the client and the router cannot disagree."""
+    with pytest.raises(ValueError):
+        LLMClient(None, "gpt-4o", None, [], router=ModelRouter("gpt-4o-mini"))
+
+
 @pytest.mark.integration
 def test_client_can_use_tools(openai_client):
     """Test that the LLM client can use a provided tool."""
@@ -0,0 +1,98 @@
+"""Tests for the ai.encoders module."""
+
+import json
+
+import pytest
+
+from booking.ai.encoders import (
+    CompactResultEncoder,
+    JsonResultEncoder,
+    compress_availability,
+    is_availability,
+)
+
+
+@pytest.mark.parametrize(
+    "test_availability, expected",
+    [
+        (
+            {"2023-10-01": True, "2023-10-02": True, "2023-10-03": False},
+            {"available": [["2023-10-01", "2023-10-02"]], "booked": ["2023-10-03"]},
+        ),
+        (
+            {"2023-10-03": True, "2023-10-01": True, "2023-10-02": False},
+            {"available": ["2023-10-01", "2023-10-03"], "booked": ["2023-10-02"]},
+        ),
+        (
+            {"2023-02-28": False, "2023-03-01": False, "2023-03-05": False},
+            {"available": [], "booked": [["2023-02-28", "2023-03-01"], "2023-03-05"]},
+        ),
+    ],
+)
+def test_availability_is_compressed_into_runs(
+    test_availability: dict[str, bool], expected: dict[str, list]
+) -> None:
+    """Test that availability maps are compressed into runs of dates."""
+    assert compress_availability(test_availability) == expected
+
+
+@pytest.mark.parametrize(
+    "test_result, expected",
+    [
+        ({"2023-10-01": True}, True),
+        ({}, False),
+        ({"2023-10-01": "yes"}, False),
+        ({"booking_id": True}, False),
+        ("2023-10-01", False),
+    ],
+)
+def test_availability_results_are_detected(test_result, expected: bool) -> None:
+    """Test that only availability maps are detected as such."""
+    assert is_availability(test_result) == expected
+
+
+def test_json_encoder_keeps_default_serialization() -> None:
+    """Test that the JSON encoder matches json.dumps."""
+    result = {"2023-10-01": True, "2023-10-02": False}
+
+    assert JsonResultEncoder().encode("check_availability", result) == json.dumps(
+        result
+    )
+
+
+def test_compact_encoder_output_is_smaller() -> None:
+    """Test that the compact encoder shrinks availability results."""
+    result = {f"2023-10-{d:02}": d != 15 for d in range(1, 32)}
+
+    compact = CompactResultEncoder().encode("check_availability", result)
+
+    assert json.loads(compact) == {
+        "available": [["2023-10-01", "2023-10-14"], ["2023-10-16", "2023-10-31"]],
+        "booked": ["2023-10-15"],
+    }
+    assert len(compact) < len(json.dumps(result)) / 5
+
+
+def test_compact_encoder_truncates_per_tool() -> None:
+    """Test that results over the tool size cap are trimmed to valid JSON."""
+    encoder = CompactResultEncoder(max_chars={"echo": 100}, default_max_chars=1000)
+    result = [f"room-{i}" for i in range(50)]
+
+    truncated = json.loads(encoder.encode("echo", result))
+
+    assert len(encoder.encode("echo", result)) <= 100
+    assert truncated["result"] == result[: len(truncated["result"])]
+    assert truncated["truncated"] == 50 - len(truncated["result"]) > 0
+    assert encoder.encode("other", result) == json.dumps(result, separators=(",", ":"))
+
+
+def test_compact_encoder_truncates_availability_runs() -> None:
+    """Test that compressed availability over the cap keeps both run lists."""
+    encoder = CompactResultEncoder(default_max_chars=120)
+    availability = {f"2023-10-{day:02d}": day % 2 == 0 for day in range(1, 32)}
+
+    truncated = json.loads(encoder.encode("check_availability", availability))
+
+    assert set(truncated["result"]) == {"available", "booked"}
+    assert truncated["result"]["booked"][0] == "2023-10-01"
+    assert truncated["truncated"] > 0
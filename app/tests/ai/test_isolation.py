@@ -0,0 +1,228 @@
+"""Tests for the ai.isolation module."""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from booking.ai.client import LLMClient
+from booking.ai.isolation import (
+    ToolMemoryExceeded,
+    ToolPool,
+    ToolResultTooLarge,
+    ToolTimeout,
+    ToolWorkerCrashed,
+)
+from tests.shared import FakeOpenAIClient, create_response
+
+
+def get_process_id(offset: int) -> int:
+    """Get the ID of the process running the tool.
+
+    Args:
+        offset (int): A number added to the process ID.
+    """
+    return os.getpid() + offset
+
+
+def sleep(seconds: float) -> None:
+    """Sleep for a while.
+
+    Args:
+        seconds (float): The number of seconds to sleep.
+    """
+    time.sleep(seconds)
+
+
+def repeat(text: str, count: int) -> str:
+    """Repeat a text.
+
+    Args:
+        text (str): The text to repeat.
+        count (int): The number of repetitions.
+    """
+    return text * count
+
+
+def allocate(size: int) -> int:
+    """Allocate a buffer.
+
+    Args:
+        size (int): The size of the buffer in bytes.
+    """
+    return len(bytearray(size))
+
+
+def load_result() -> None:
+    """Fail to unpickle a result."""
+    raise RuntimeError("Cannot be loaded.")
+
+
+class UnloadableResult:
+    """Result which can be pickled but not unpickled."""
+
+    def __reduce__(self):
+        return (load_result, ())
+
+
+def return_unloadable() -> UnloadableResult:
+    """Return a result which cannot be unpickled."""
+    return UnloadableResult()
+
+
+def fail(message: str) -> None:
+    """Raise an error.
+
+    Args:
+        message (str): The error message.
+    """
+    raise KeyError(message)
+
+
+@pytest.fixture(name="pool")
+def create_pool():
+    """Provide a started pool of one worker."""
+    pool = ToolPool(["get_process_id"], max_workers=1, timeout=5)
+    pool.start()
+
+    yield pool
+    pool.close()
+
+
+def test_tools_run_in_a_worker_process(pool: ToolPool) -> None:
+    """Test that isolated tools run out of process, with measured pickling."""
+    assert pool.call(get_process_id, {"offset": 0}) != os.getpid()
+    assert pool.stats.calls == 1
+    assert pool.stats.bytes_sent > 0 and pool.stats.bytes_received > 0
+
+
+def test_tool_errors_are_raised_in_the_caller(pool: ToolPool) -> None:
+    """Test that the exceptions of a tool are raised back and counted."""
+    with pytest.raises(KeyError, match="missing"):
+        pool.call(fail, {"message": "missing"})
+
+    assert (pool.stats.calls, pool.stats.failures) == (1, 1)
+
+
+def test_oversized_results_are_rejected() -> None:
+    """Test that results over the size limit are not sent back."""
+    pool = ToolPool(["repeat"], max_workers=1, max_result_bytes=1000)
+
+    try:
+        assert pool.call(repeat, {"text": "x", "count": 10}) == "x" * 10
+        with pytest.raises(ToolResultTooLarge):
+            pool.call(repeat, {"text": "x", "count": 10_000})
+    finally:
+        pool.close()
+
+
+def test_hanging_workers_are_replaced(pool: ToolPool) -> None:
+    """Test that a timed-out worker is killed and replaced."""
+    first_worker = pool.call(get_process_id, {"offset": 0})
+    pool.timeout = 0.2
+
+    with pytest.raises(ToolTimeout):
+        pool.call(sleep, {"seconds": 10})
+
+    assert pool.stats.timeouts == 1
+    pool.timeout = 5
+    assert pool.call(get_process_id, {"offset": 0}) not in (first_worker, os.getpid())
+
+
+def test_waiting_for_a_worker_counts_towards_the_timeout(pool: ToolPool) -> None:
+    """Test that a call waiting for a busy worker times out with the pool timeout."""
+    pool.call(get_process_id, {"offset": 0})
+    pool.timeout = 1.0
+    thread = threading.Thread(target=pool.call, args=(sleep, {"seconds": 0.6}))
+    thread.start()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    with pytest.raises(ToolTimeout):
+        pool.call(sleep, {"seconds": 0.8})
+    elapsed = time.monotonic() - start
+
+    thread.join()
+    assert elapsed < 1.3
+
+
+def test_unloadable_results_replace_the_worker(pool: ToolPool) -> None:
+    """Test that a result failing to unpickle does not lose the worker."""
+    with pytest.raises(ToolWorkerCrashed):
+        pool.call(return_unloadable, {})
+
+    assert pool.stats.crashes == 1
+    assert pool.call(get_process_id, {"offset": 0}) != os.getpid()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Memory limits need Unix.")
+def test_workers_out_of_memory_are_replaced() -> None:
+    """Test that tools out of memory fail, and their workers are replaced."""
+    pool = ToolPool(["allocate"], max_workers=1, memory_limit=2**31)
+
+    try:
+        first_worker = pool.call(get_process_id, {"offset": 0})
+
+        with pytest.raises(ToolMemoryExceeded):
+            pool.call(allocate, {"size": 2**32})
+
+        openai_client = FakeOpenAIClient(
+            [
+                create_response("resp_1", tool_calls=[("allocate", {"size": 2**32})]),
+                create_response("resp_2", output_text="Failed."),
+            ]
+        )
+        llm_client = LLMClient(
+            openai_client,
+            "gpt-4o-mini",
+            None,
+            [("tests.ai.test_isolation", "allocate")],
+            tool_pool=pool,
+        )
+        llm_client.chat("Allocate")
+
+        (tool_output,) = openai_client.requests[1]["input"]
+        assert "failed to complete" in tool_output["output"]
+        assert pool.stats.memory_errors == 2
+        assert pool.stats.failures == 2
+        assert pool.call(allocate, {"size": 1000}) == 1000
+        assert pool.call(get_process_id, {"offset": 0}) != first_worker
+    finally:
+        pool.close()
+
+
+def test_client_runs_isolated_tools_in_the_pool(pool: ToolPool) -> None:
+    """Test that the client dispatches isolated tools to the pool."""
+    openai_client = FakeOpenAIClient(
+        [
+            create_response("resp_1", tool_calls=[("get_process_id", {"offset": 0})]),
+            create_response("resp_2", output_text="Done."),
+        ]
+    )
+    llm_client = LLMClient(
+        openai_client,
+        "gpt-4o-mini",
+        None,
+        [("tests.ai.test_isolation", "get_process_id")],
+        tool_pool=pool,
+    )
+
+    llm_client.chat("Which process?")
+
+    (tool_output,) = openai_client.requests[1]["input"]
+    assert tool_output["output"] != str(os.getpid())
+    assert pool.stats.calls == 1
+
+
+def test_tools_using_the_repository_cannot_be_isolated() -> None:
+    """Test that tools needing the repository are rejected."""
+    with pytest.raises(ValueError):
+        LLMClient(
+            None,
+            "gpt-4o-mini",
+            None,
+            [("booking.services", "check_availability")],
+            tool_pool=ToolPool(["check_availability"]),
+        )
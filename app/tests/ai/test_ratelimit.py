@@ -0,0 +1,229 @@
+"""Tests for the ai.ratelimit module."""
+
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import AzureOpenAI, RateLimitError
+
+from booking.ai.client import LLMClient
+from booking.ai.ratelimit import (
+    AdaptiveRateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_retry_after,
+)
+from booking.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+
+class FakeClock:
+    """Clock advanced by the sleeps of the code under test."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock instead of sleeping."""
+        self.now += seconds
+
+
+def create_rate_limit_error(headers: dict[str, str]) -> RateLimitError:
+    """Create a throttling error with the given response headers."""
+    request = httpx.Request("POST", "https://example.com/openai/responses")
+    response = httpx.Response(429, headers=headers, request=request)
+
+    return RateLimitError("Too many requests", response=response, body=None)
+
+
+def create_limiter(clock: FakeClock, **kwargs) -> AdaptiveRateLimiter:
+    """Create a rate limiter using the fake clock."""
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_token_bucket_reports_wait_when_empty() -> None:
+    """Test that a depleted bucket reports the time until it is refilled."""
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=10, refill_per_second=2, clock=clock)
+
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(4) == pytest.approx(2.0)
+
+    clock.sleep(2.0)
+
+    assert bucket.reserve(0) == 0.0
+
+
+def test_limiter_spaces_requests_under_quota() -> None:
+    """Test that requests beyond the quota are delayed to stay under it."""
+    clock = FakeClock()
+    limiter = create_limiter(
+        clock, requests_per_minute=60, tokens_per_minute=10_000, headroom=0.5
+    )
+
+    for _ in range(60):
+        limiter.call(lambda: None, tokens=1)
+
+    # 30 requests are allowed at once, the other 30 at one every 2 seconds.
+    assert clock.now == pytest.approx(60.0)
+
+
+def test_limiter_honors_retry_after_and_reduces_concurrency() -> None:
+    """Test that a throttled call waits for retry-after before retrying."""
+    clock = FakeClock()
+    limiter = create_limiter(
+        clock, requests_per_minute=1000, tokens_per_minute=100_000, max_concurrency=8
+    )
+    responses = [create_rate_limit_error({"retry-after": "3"}), "ok"]
+
+    def call() -> str:
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert limiter.call(call, tokens=10) == "ok"
+    assert clock.now == pytest.approx(3.0)
+    assert limiter.throttled == 1
+    assert limiter.concurrency == pytest.approx(4 + 1 / 4)
+
+
+def test_limiter_raises_after_max_retries() -> None:
+    """Test that the throttling error is raised once retries are exhausted."""
+    clock = FakeClock()
+    limiter = create_limiter(
+        clock, requests_per_minute=1000, tokens_per_minute=100_000, max_retries=2
+    )
+    calls = []
+
+    def call() -> None:
+        calls.append(clock.now)
+        raise create_rate_limit_error({})
+
+    with pytest.raises(RateLimitError):
+        limiter.call(call, tokens=10)
+
+    assert len(calls) == 3
+    assert limiter.concurrency == 2.0
+
+
+def test_limiter_retries_with_the_remaining_time_of_the_deadline() -> None:
+    """Test that each attempt times out with the time left before the deadline."""
+    clock = FakeClock()
+    limiter = create_limiter(clock, requests_per_minute=1000, tokens_per_minute=100_000)
+    responses = [create_rate_limit_error({"retry-after": "3"}), "ok"]
+    timeouts = []
+
+    def call(timeout: float) -> str:
+        timeouts.append(timeout)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    with deadline_scope(Deadline(5, clock=clock)):
+        assert limiter.call(call, tokens=10) == "ok"
+
+    assert timeouts == [pytest.approx(5.0), pytest.approx(2.0)]
+
+
+def test_limiter_does_not_wait_past_the_deadline() -> None:
+    """Test that a retry-after beyond the deadline fails without waiting."""
+    clock = FakeClock()
+    limiter = create_limiter(clock, requests_per_minute=1000, tokens_per_minute=100_000)
+    calls = []
+
+    def call(timeout: float) -> None:
+        calls.append(timeout)
+        raise create_rate_limit_error({"retry-after": "10"})
+
+    with deadline_scope(Deadline(5, clock=clock)), pytest.raises(DeadlineExceeded):
+        limiter.call(call, tokens=10)
+
+    assert len(calls) == 1
+    assert clock.now == 0.0
+
+
+def test_limiter_waits_for_a_slot_until_the_deadline() -> None:
+    """Test that waiting for a concurrency slot is bounded by the deadline."""
+    limiter = AdaptiveRateLimiter(
+        requests_per_minute=1000, tokens_per_minute=100_000, max_concurrency=1
+    )
+    started, release = threading.Event(), threading.Event()
+
+    def hold_slot() -> None:
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=limiter.call, args=(hold_slot, 10))
+    thread.start()
+    started.wait(5)
+
+    try:
+        with deadline_scope(Deadline(0.05)), pytest.raises(DeadlineExceeded):
+            limiter.call(lambda timeout: None, tokens=10)
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_limiter_settles_token_estimate_with_usage() -> None:
+    """Test that tokens are charged by actual usage rather than the estimate."""
+    clock = FakeClock()
+    limiter = create_limiter(clock, requests_per_minute=1000, tokens_per_minute=1000)
+    response = SimpleNamespace(usage=SimpleNamespace(total_tokens=100))
+
+    limiter.call(lambda: response, tokens=900)
+
+    assert limiter.tokens.reserve(800) == 0.0
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"retry-after-ms": "1500", "retry-after": "2"}, 1.5),
+        ({"retry-after": "2"}, 2.0),
+        ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_is_read_from_headers(headers: dict, expected) -> None:
+    """Test that the retry delay is read from the response headers."""
+    assert get_retry_after(create_rate_limit_error(headers)) == expected
+
+
+def test_estimate_tokens_counts_input_and_output_allowance() -> None:
+    """Test that the estimate includes the output allowance."""
+    small = estimate_tokens(input="Hi")
+    large = estimate_tokens(input="Hi" * 400, max_output_tokens=100)
+
+    assert large - small >= 100 + 190
+
+
+def test_client_lets_the_limiter_handle_the_first_throttling() -> None:
+    """Test that the SDK does not retry throttled calls of a rate-limited client."""
+    requests = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(429, headers={"retry-after": "0"})
+
+    openai_client = AzureOpenAI(
+        api_key="test",
+        api_version="2025-03-01-preview",
+        azure_endpoint="https://example.com",
+        http_client=httpx.Client(transport=httpx.MockTransport(respond)),
+    )
+    limiter = create_limiter(
+        FakeClock(), requests_per_minute=1000, tokens_per_minute=100_000, max_retries=0
+    )
+    llm_client = LLMClient(openai_client, "gpt-4o-mini", None, [], rate_limiter=limiter)
+
+    with pytest.raises(RateLimitError):
+        llm_client.chat("Hello")
+
+    assert len(requests) == 1
+    assert limiter.throttled == 1
@@ -0,0 +1,38 @@
+"""Tests for the ai.routing module."""
+
+from types import SimpleNamespace
+
+from booking.ai.routing import ModelRouter, Route, is_simple_message
+
+
+def test_short_messages_with_explicit_dates_are_simple() -> None:
+    """Test the default classification of simple messages."""
+    assert is_simple_message("Is the room free on 2023-10-01?")
+    assert not is_simple_message("Is the room free next Friday?")
+    assert not is_simple_message("Is it free on 2023-10-01? " + "really " * 30)
+
+
+def test_router_sends_simple_messages_to_the_simple_model() -> None:
+    """Test that only simple messages are routed to the simple model."""
+    router = ModelRouter("gpt-4o", simple="gpt-4o-mini")
+
+    assert router.route_message("Book 2023-10-01 for Ann.") == Route(
+        "simple", "gpt-4o-mini"
+    )
+    assert router.route_message("Book my usual room.") == Route("default", "gpt-4o")
+    assert router.route_tool_results() == Route("tool_results", "gpt-4o")
+
+
+def test_router_records_latency_and_tokens_per_route() -> None:
+    """Test the per-route statistics."""
+    router = ModelRouter("gpt-4o")
+    route = router.route_tool_results()
+
+    router.record(route, 0.2, SimpleNamespace(input_tokens=100, output_tokens=10))
+    router.record(route, 0.4)
+    router.record_error(route)
+
+    stats = router.stats["tool_results"]
+    assert (stats.calls, stats.errors) == (2, 1)
+    assert (stats.input_tokens, stats.output_tokens) == (100, 10)
+    assert abs(stats.mean_latency - 0.3) < 1e-9
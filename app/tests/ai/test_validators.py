@@ -0,0 +1,81 @@
+"""Tests for the ai.validators module."""
+
+import pytest
+
+from booking.ai.tools import get_tool_definition
+from booking.ai.validators import compile_validator
+
+# pylint: disable=unused-argument
+
+
+def book_room(dates: list[str], customer_name: str, guests: int, repo: str) -> None:
+    """Book the room.
+
+    Args:
+        dates (list[str]): List of dates to book (YYYY-MM-DD).
+        customer_name (str): Name of the customer.
+        guests (int): Number of guests.
+        repo (AbstractRepository): The repository.
+    """
+
+
+@pytest.fixture(name="validate")
+def compile_test_validator():
+    """Compile the validator of the test tool."""
+    return compile_validator(get_tool_definition(book_room))
+
+
+def test_valid_arguments_have_no_errors(validate) -> None:
+    """Test that valid arguments pass validation, whatever the injected repo."""
+    arguments = {
+        "dates": ["2024-02-28", "2024-02-29"],
+        "customer_name": "Paul",
+        "guests": 3,
+        "repo": None,
+    }
+
+    assert validate(arguments) == []
+
+
+@pytest.mark.parametrize(
+    "test_arguments, expected",
+    [
+        (
+            {"dates": ["2023-10-01"], "customer_name": "Paul"},
+            ["Missing required argument 'guests'."],
+        ),
+        (
+            {"dates": "2023-10-01", "customer_name": "Paul", "guests": 1},
+            ["Argument 'dates' must be an array."],
+        ),
+        (
+            {"dates": ["2023-10-01", 2], "customer_name": "Paul", "guests": 1},
+            ["Argument 'dates[1]' must be of type string."],
+        ),
+        (
+            {"dates": ["2023-02-29"], "customer_name": "Paul", "guests": 1},
+            ["Argument 'dates[0]' must be a valid date (YYYY-MM-DD)."],
+        ),
+        (
+            {"dates": ["20231001"], "customer_name": "Paul", "guests": 1},
+            ["Argument 'dates[0]' must be a valid date (YYYY-MM-DD)."],
+        ),
+        (
+            {"dates": ["2023-10-01"], "customer_name": None, "guests": True},
+            [
+                "Argument 'customer_name' must be of type string.",
+                "Argument 'guests' must be of type integer.",
+            ],
+        ),
+        (
+            {"dates": ["2023-10-01"], "customer_name": "", "guests": 1, "room": 2},
+            ["Unexpected argument 'room'."],
+        ),
+        (None, ["Arguments must be an object."]),
+    ],
+)
+def test_invalid_arguments_are_reported(
+    validate, test_arguments, expected: list[str]
+) -> None:
+    """Test that invalid arguments are reported with explicit errors."""
+    assert validate(test_arguments) == expected
@@ -3,7 +3,11 @@ import os
 
 import pytest
 
-from booking.config import get_database_connection, get_openai_client
+from booking.config import (
+    get_database_connection,
+    get_openai_client,
+    get_sqlite_connection,
+)
 
 
 APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -31,6 +35,15 @@ def create_db_session(
     connection.close()
 
 
+@pytest.fixture(name="sqlite_session")
+def create_sqlite_session(tmp_path):
+    """Fixture to provide a connection to an empty SQLite database."""
+    connection = get_sqlite_connection(str(tmp_path / "booking.db"))
+
+    yield connection
+    connection.close()
+
+
 @pytest.fixture()
 def clear_db(db_session) -> None:
     """Clear the database."""
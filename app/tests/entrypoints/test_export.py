@@ -0,0 +1,96 @@
+"""Tests for the export entrypoint."""
+
+import csv
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from booking.config import get_sqlite_connection
+from booking.entrypoints.export import main
+from booking.model import Booking
+from booking.repository import SqliteRepository
+
+
+def create_database(path: str) -> None:
+    """Create a SQLite database with two bookings."""
+    connection = get_sqlite_connection(path)
+    repo = SqliteRepository(connection)
+    repo.add(Booking("123", ["2023-10-01", "2023-10-02"], "Alice"))
+    repo.add(Booking("456", ["2023-10-05"], "Bob"))
+    connection.commit()
+    connection.close()
+
+
+def test_bookings_are_exported_as_jsonl(tmp_path) -> None:
+    """Test that each booking is written as a JSON line."""
+    database, output = str(tmp_path / "booking.db"), tmp_path / "bookings.jsonl"
+    create_database(database)
+
+    main(
+        [
+            "--backend",
+            "sqlite",
+            "--database",
+            database,
+            "--batch-size",
+            "1",
+            str(output),
+        ]
+    )
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [(b["id"], b["customer_name"], b["dates"]) for b in lines] == [
+        ("123", "Alice", ["2023-10-01", "2023-10-02"]),
+        ("456", "Bob", ["2023-10-05"]),
+    ]
+    assert all(b["resource_id"] == "main" for b in lines)
+
+
+def test_bookings_are_exported_as_csv(tmp_path) -> None:
+    """Test that each booking is written as a CSV row, with a header."""
+    database, output = str(tmp_path / "booking.db"), tmp_path / "bookings.csv"
+    create_database(database)
+
+    main(
+        ["--backend", "sqlite", "--database", database, "--format", "csv", str(output)]
+    )
+
+    with open(output, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["id"], r["dates"]) for r in rows] == [
+        ("123", "2023-10-01 2023-10-02"),
+        ("456", "2023-10-05"),
+    ]
+
+
+def test_bookings_created_before_since_are_not_exported(tmp_path, capsys) -> None:
+    """Test that the export can be limited to recent bookings."""
+    database = str(tmp_path / "booking.db")
+    create_database(database)
+
+    main(
+        [
+            "--backend",
+            "sqlite",
+            "--database",
+            database,
+            "--since",
+            datetime(2999, 1, 1).isoformat(),
+        ]
+    )
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Exported 0 bookings." in captured.err
+
+
+def test_missing_databases_are_not_created(tmp_path) -> None:
+    """Test that exporting from a missing database fails without creating it."""
+    database = tmp_path / "missing.db"
+
+    with pytest.raises(sqlite3.OperationalError):
+        main(["--backend", "sqlite", "--database", str(database)])
+
+    assert not database.exists()
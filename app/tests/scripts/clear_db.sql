@@ -1,5 +1,11 @@
+IF OBJECT_ID (N'dbo.booking_dates_log', N'U') IS NOT NULL
+    TRUNCATE TABLE dbo.booking_dates_log;
+
 IF OBJECT_ID (N'dbo.booking_dates', N'U') IS NOT NULL
     TRUNCATE TABLE dbo.booking_dates;
 
 IF OBJECT_ID (N'dbo.booking', N'U') IS NOT NULL
     DELETE FROM dbo.booking;
+
+IF OBJECT_ID (N'dbo.resource', N'U') IS NOT NULL
+    DELETE FROM dbo.resource WHERE id <> 'main';
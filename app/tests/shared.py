@@ -1,24 +1,136 @@
 """Shared testing utilities."""
 
+import json
 from datetime import date
+from typing import Any
 
-from booking.model import Booking
+from openai.types.responses import (
+    Response,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+)
+
+from booking.model import DEFAULT_RESOURCE, Booking
 
 
 class FakeRepository:
     """In-memory fake repository for bookings."""
 
-    def __init__(self, data: set[Booking] | None = None) -> None:
+    def __init__(
+        self, data: set[Booking] | None = None, resources: set[str] | None = None
+    ) -> None:
         self.data = set(data or [])
+        self.resources = {DEFAULT_RESOURCE} | set(resources or [])
 
     def get(self, id_: str) -> Booking | None:
         """Get a booking by ID."""
         return next((booking for booking in self.data if booking.id_ == id_), None)
 
-    def get_booked_dates(self) -> list[date]:
-        """Get all booked dates."""
-        return sorted({date_ for booking in self.data for date_ in booking.dates})
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource."""
+        return sorted(
+            {
+                date_
+                for booking in self.data
+                if booking.resource_id == resource_id
+                for date_ in booking.dates
+            }
+        )
+
+    def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates."""
+        candidates = self.resources if resource_ids is None else resource_ids
+        return sorted(
+            resource_id
+            for resource_id in set(candidates) & self.resources
+            if not set(dates) & set(self.get_booked_dates(resource_id))
+        )
 
     def add(self, booking: Booking) -> None:
         """Add a new booking."""
         self.data.add(booking)
+
+
+class FakeAsyncRepository:
+    """In-memory fake async repository for bookings."""
+
+    def __init__(
+        self, data: set[Booking] | None = None, resources: set[str] | None = None
+    ) -> None:
+        self.repository = FakeRepository(data, resources)
+
+    async def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID."""
+        return self.repository.get(id_)
+
+    async def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates of a resource."""
+        return self.repository.get_booked_dates(resource_id)
+
+    async def get_available_resources(
+        self, dates: list[date], resource_ids: list[str] | None = None
+    ) -> list[str]:
+        """Get the resources free on all the dates."""
+        return self.repository.get_available_resources(dates, resource_ids)
+
+    async def add(self, booking: Booking) -> None:
+        """Add a new booking."""
+        self.repository.add(booking)
+
+
+def create_response(
+    id_: str, output_text: str = "", tool_calls: list[tuple[str, dict]] = None
+) -> Response:
+    """Create a model response, with optional tool calls (name, arguments)."""
+    output = [
+        ResponseFunctionToolCall(
+            type="function_call",
+            call_id=f"call_{i}",
+            name=name,
+            arguments=json.dumps(arguments),
+        )
+        for i, (name, arguments) in enumerate(tool_calls or [])
+    ]
+
+    if output_text:
+        output.append(
+            ResponseOutputMessage(
+                id=f"msg_{id_}",
+                type="message",
+                role="assistant",
+                status="completed",
+                content=[
+                    ResponseOutputText(
+                        type="output_text", text=output_text, annotations=[]
+                    )
+                ],
+            )
+        )
+
+    return Response(
+        id=id_,
+        created_at=0,
+        model="gpt-4o-mini",
+        object="response",
+        output=output,
+        parallel_tool_calls=True,
+        tool_choice="auto",
+        tools=[],
+    )
+
+
+class FakeOpenAIClient:
+    """Fake OpenAI client returning scripted responses."""
+
+    def __init__(self, responses: list[Any]) -> None:
+        self.responses = self
+        self.scripted_responses = list(responses)
+        self.requests = []
+
+    def create(self, **kwargs: Any) -> Any:
+        """Record the request and return the next scripted response."""
+        self.requests.append(kwargs)
+        return self.scripted_responses.pop(0)
@@ -0,0 +1,74 @@
+"""Tests for the availability module."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from booking.model import Booking
+from booking.services import check_availability, check_availability_range
+from tests.shared import FakeRepository
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from booking.availability import AvailabilityIndex  # noqa: E402
+
+
+@pytest.fixture(name="index")
+def create_index() -> AvailabilityIndex:
+    """Index booked dates given out of order."""
+    return AvailabilityIndex(["2023-10-03", "2023-10-01", "2023-10-02", "2023-10-07"])
+
+
+def test_index_checks_batches_of_dates(index: AvailabilityIndex) -> None:
+    """Test that a batch of dates is checked against the booked dates."""
+    test_dates = ["2023-10-01", "2023-10-04", "2023-09-01", "2023-10-08"]
+
+    assert index.is_available(test_dates).tolist() == [False, True, True, True]
+    assert AvailabilityIndex([]).is_available(test_dates).all()
+
+
+def test_index_returns_runs_of_a_range(index: AvailabilityIndex) -> None:
+    """Test that a range is returned as runs of consecutive days."""
+    runs = index.runs("2023-09-30", "2023-10-08")
+
+    assert runs.lengths.tolist() == [1, 3, 3, 1, 1]
+    assert runs.available.tolist() == [True, False, True, False, True]
+    assert runs.to_dict() == {
+        "available": ["2023-09-30", ["2023-10-04", "2023-10-06"], "2023-10-08"],
+        "booked": [["2023-10-01", "2023-10-03"], "2023-10-07"],
+    }
+    assert index.count_booked("2023-10-02", date(2023, 10, 7)) == 3
+
+
+def test_index_rejects_reversed_ranges(index: AvailabilityIndex) -> None:
+    """Test that a range cannot end before it starts."""
+    with pytest.raises(ValueError):
+        index.availability("2023-10-02", "2023-10-01")
+
+
+def test_index_can_be_created_from_ordinals() -> None:
+    """Test that an index can be built from date ordinals, e.g. a snapshot."""
+    ordinals = np.array([date(2023, 10, 1).toordinal()], dtype=np.int32)
+
+    assert AvailabilityIndex.from_ordinals(ordinals).booked.tolist() == [
+        date(2023, 10, 1)
+    ]
+
+
+def test_index_agrees_with_the_services() -> None:
+    """Test that the engine and the services answer random queries alike."""
+    rng = random.Random(42)
+    start = date(2023, 1, 1)
+    days = [(start + timedelta(days=d)).isoformat() for d in range(365)]
+    bookings = [Booking(str(i), [d], "") for i, d in enumerate(rng.sample(days, 120))]
+    repo = FakeRepository(bookings)
+    index = AvailabilityIndex.from_repository(repo)
+
+    expected = check_availability(days, repo)
+
+    assert index.is_available(days).tolist() == list(expected.values())
+    assert index.runs(days[0], days[-1]).to_dict() == check_availability_range(
+        days[0], days[-1], repo
+    )
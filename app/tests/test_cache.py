@@ -0,0 +1,154 @@
+"""Tests for the cache module."""
+
+from datetime import date
+
+from booking.cache import CachedRepository, Prefetcher
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.repository import SqliteRepository
+from tests.shared import FakeRepository
+
+
+class CountingRepository(FakeRepository):
+    """Fake repository counting booked dates queries."""
+
+    def __init__(
+        self, data: set[Booking] | None = None, resources: set[str] | None = None
+    ) -> None:
+        super().__init__(data, resources)
+        self.queries = 0
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates."""
+        self.queries += 1
+        return super().get_booked_dates(resource_id)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_booked_dates_are_cached_until_expired() -> None:
+    """Test that booked dates are served from memory within the TTL."""
+    clock = FakeClock()
+    inner = CountingRepository([Booking("123", ["2023-10-01"], "")])
+    repo = CachedRepository(inner, ttl=10, clock=clock)
+
+    repo.get_booked_dates()
+    repo.get_booked_dates()
+    clock.now = 11
+    repo.get_booked_dates()
+
+    assert inner.queries == 2
+    assert (repo.stats.hits, repo.stats.misses) == (1, 2)
+
+
+def test_adding_a_booking_invalidates_the_cache() -> None:
+    """Test that bookings added through the cache are visible at once."""
+    repo = CachedRepository(CountingRepository())
+
+    assert repo.get_booked_dates() == []
+
+    repo.add(Booking("123", ["2023-10-01"], ""))
+
+    assert repo.get_booked_dates() == [date(2023, 10, 1)]
+
+
+def test_adding_a_booking_only_invalidates_its_resource() -> None:
+    """Test that a booking keeps the cached dates of other resources."""
+    inner = CountingRepository(resources={"annex"})
+    repo = CachedRepository(inner)
+    repo.get_booked_dates()
+    repo.get_booked_dates("annex")
+
+    repo.add(Booking("123", ["2023-10-01"], "", "annex"))
+
+    assert repo.get_booked_dates() == []
+    assert repo.get_booked_dates("annex") == [date(2023, 10, 1)]
+    assert inner.queries == 3
+
+
+def test_incremental_cache_applies_changes_made_elsewhere(sqlite_session) -> None:
+    """Test that expired dates are refreshed from the change feed."""
+    clock = FakeClock()
+    inner = SqliteRepository(sqlite_session)
+    inner.add(Booking("123", ["2023-10-01", "2023-10-02"], ""))
+    repo = CachedRepository(inner, ttl=10, clock=clock, incremental=True)
+    repo.get_booked_dates()
+
+    # Changes made without going through the cache, e.g. by another instance.
+    inner.add(Booking("456", ["2023-09-30"], ""))
+    sqlite_session.execute("DELETE FROM booking WHERE id = ?", ("123",))
+    inner.add(Booking("789", ["2023-10-02"], ""))
+    assert len(repo.get_booked_dates()) == 2
+
+    clock.now = 10
+    booked_dates = repo.get_booked_dates()
+
+    assert [d.isoformat() for d in booked_dates] == ["2023-09-30", "2023-10-02"]
+    assert booked_dates == inner.get_booked_dates()
+    assert repo.stats.refreshes == 1
+
+
+def test_incremental_cache_applies_local_bookings(sqlite_session) -> None:
+    """Test that bookings added through the cache update it without a query."""
+    inner = SqliteRepository(sqlite_session)
+    inner.add(Booking("123", ["2023-10-02"], ""))
+    repo = CachedRepository(inner, ttl=10, clock=FakeClock(), incremental=True)
+    repo.get_booked_dates()
+
+    repo.add(Booking("456", ["2023-10-03", "2023-10-04"], ""))
+
+    assert repo.get_booked_dates() == inner.get_booked_dates()
+    assert (repo.stats.hits, repo.stats.misses) == (1, 1)
+
+
+def test_incremental_cache_prunes_changes_it_applied(sqlite_session) -> None:
+    """Test that pruning keeps the changes not applied to the cache yet."""
+    clock = FakeClock()
+    inner = SqliteRepository(sqlite_session)
+    inner.add(Booking("123", ["2023-10-01"], ""))
+    repo = CachedRepository(inner, ttl=10, clock=clock, incremental=True)
+    repo.get_booked_dates()
+    inner.add(Booking("456", ["2023-10-02"], ""))
+
+    assert repo.prune_changes() == 1
+
+    clock.now = 10
+    assert repo.get_booked_dates() == [date(2023, 10, 1), date(2023, 10, 2)]
+    assert repo.stats.refreshes == 1
+
+
+def test_prefetch_turns_the_next_read_into_a_hit() -> None:
+    """Test that a completed prefetch serves the next read from memory."""
+    inner = CountingRepository([Booking("123", ["2023-10-01"], "")])
+    repo = CachedRepository(inner)
+    prefetcher = Prefetcher(repo.warm)
+
+    prefetcher.start().result()
+    prefetcher.start().result()
+    prefetcher.close()
+
+    assert repo.get_booked_dates() == [date(2023, 10, 1)]
+    assert inner.queries == 1
+    assert (repo.stats.hits, repo.stats.misses) == (1, 0)
+    assert prefetcher.started == 2
+
+
+def test_prefetch_failures_are_not_raised() -> None:
+    """Test that a failing prefetch is counted and logged only."""
+
+    def fail() -> None:
+        raise RuntimeError("Database unavailable.")
+
+    prefetcher = Prefetcher(fail)
+
+    prefetcher.start().result()
+    prefetcher.close()
+
+    assert prefetcher.failed == 1
@@ -0,0 +1,96 @@
+"""Tests for the dates module."""
+
+from datetime import date
+
+import pytest
+
+from booking.dates import (
+    format_run,
+    has_duplicates,
+    is_consecutive,
+    parse_dates,
+    parse_ordinals,
+    to_dates,
+)
+
+
+INVALID_DATES = [
+    "2023-02-29",
+    "0000-01-01",
+    "2023-13-01",
+    "2023-00-10",
+    "2023-01-00",
+    "2023-04-31",
+    "2023/01/01",
+    "2023-1-01",
+    "2023-10",
+    "NaT",
+    None,
+]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_parse_ordinals_matches_fromisoformat(use_numpy: bool) -> None:
+    """Test that both parsing paths agree with the standard library."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    test_dates = [
+        "0001-01-01",
+        "1900-02-28",
+        "2000-02-29",
+        "2023-10-01",
+        "2024-02-29",
+        "2024-03-01",
+        "9999-12-31",
+        date(2023, 10, 1),
+    ]
+    expected = [date.fromisoformat(str(d)).toordinal() for d in test_dates]
+
+    assert list(parse_ordinals(test_dates, use_numpy=use_numpy)) == expected
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+@pytest.mark.parametrize("test_date", INVALID_DATES)
+def test_parse_ordinals_rejects_invalid_dates(use_numpy: bool, test_date) -> None:
+    """Test that invalid dates raise a ValueError on both parsing paths."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        parse_ordinals(["2023-10-01", test_date], use_numpy=use_numpy)
+
+
+def test_parse_dates_round_trips_through_ordinals() -> None:
+    """Test that dates are parsed in order and converted back from ordinals."""
+    test_dates = ["2023-10-02", "2023-10-01"]
+
+    assert parse_dates(test_dates) == [date(2023, 10, 2), date(2023, 10, 1)]
+    assert to_dates(parse_ordinals(test_dates)) == parse_dates(test_dates)
+
+
+@pytest.mark.parametrize(
+    "test_dates, duplicates, consecutive",
+    [
+        (["2023-10-01"], False, True),
+        (["2023-10-03", "2023-10-01", "2023-10-02"], False, True),
+        (["2023-10-01", "2023-10-03"], False, False),
+        (["2023-10-01", "2023-10-02", "2023-10-01"], True, False),
+    ],
+)
+def test_ordinal_checks(
+    test_dates: list[str], duplicates: bool, consecutive: bool
+) -> None:
+    """Test the uniqueness and consecutiveness checks of ordinals."""
+    ordinals = parse_ordinals(test_dates)
+
+    assert has_duplicates(ordinals) == duplicates
+    assert is_consecutive(ordinals) == consecutive
+
+
+def test_format_run_collapses_single_days() -> None:
+    """Test that runs are formatted as one date or a [first, last] range."""
+    assert format_run(date(2023, 10, 1), date(2023, 10, 1)) == "2023-10-01"
+    assert format_run(date(2023, 10, 1), date(2023, 10, 3)) == [
+        "2023-10-01",
+        "2023-10-03",
+    ]
@@ -0,0 +1,72 @@
+"""Tests for the deadline module."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from booking.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    deadline_scope,
+    get_current_deadline,
+)
+from booking.model import Booking
+from booking.repository import SqliteRepository
+
+
+class FakeClock:
+    """Clock returning scripted times, then the last one."""
+
+    def __init__(self, *times: float) -> None:
+        self.times = list(times)
+
+    def __call__(self) -> float:
+        if len(self.times) > 1:
+            return self.times.pop(0)
+        return self.times[0]
+
+
+def test_deadline_reports_remaining_time() -> None:
+    """Test that the remaining time decreases down to zero."""
+    deadline = Deadline(10, clock=FakeClock(0, 4, 12))
+
+    assert deadline.remaining() == 6
+    assert deadline.remaining() == 0
+    assert deadline.expired
+
+
+def test_deadline_check_raises_with_stage() -> None:
+    """Test that checking an expired deadline raises a typed timeout."""
+    deadline = Deadline(0)
+
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        deadline.check("model call")
+
+    assert exc_info.value.stage == "model call"
+    assert isinstance(exc_info.value, TimeoutError)
+
+
+def test_deadline_scope_sets_and_resets_current_deadline() -> None:
+    """Test that the deadline is only current within its scope."""
+    deadline = Deadline(10)
+
+    with deadline_scope(deadline):
+        assert get_current_deadline() is deadline
+
+    assert get_current_deadline() is None
+
+
+def test_sqlite_queries_are_interrupted_at_deadline(sqlite_session) -> None:
+    """Test that a SQLite query running past the deadline is interrupted."""
+    repo = SqliteRepository(sqlite_session)
+    start = date(2030, 1, 1)
+    for i in range(2000):
+        repo.add(Booking(str(i), [(start + timedelta(days=i)).isoformat()], ""))
+
+    # The deadline is checked before the query, then expires while it runs.
+    deadline = Deadline(10, clock=FakeClock(0, 0, 0, 20))
+
+    with deadline_scope(deadline), pytest.raises(DeadlineExceeded):
+        repo.get_booked_dates()
+
+    assert len(repo.get_booked_dates()) == 2000
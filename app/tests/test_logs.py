@@ -0,0 +1,78 @@
+"""Tests for the logs module."""
+
+import io
+import json
+import logging
+import queue
+
+from booking.logs import (
+    BackgroundLogging,
+    LoggedRepository,
+    NonBlockingQueueHandler,
+    turn_scope,
+)
+from booking.model import Booking
+from tests.shared import FakeRepository
+
+
+def create_record(level: int = logging.DEBUG) -> logging.LogRecord:
+    """Create a log record."""
+    return logging.makeLogRecord({"msg": "Event %s", "args": (1,), "levelno": level})
+
+
+def test_records_are_written_as_json_with_their_turn_id() -> None:
+    """Test that records are written in the background, with structured fields."""
+    stream = io.StringIO()
+    logger = logging.getLogger("tests.logs.json")
+
+    with BackgroundLogging(
+        [logging.StreamHandler(stream)], logger_name="tests.logs.json"
+    ):
+        with turn_scope("turn-1"):
+            logger.info("Tool %s called.", "book", extra={"event": "tool_call"})
+        logger.warning("Outside of a turn.")
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "Tool book called."
+    assert (first["turn_id"], first["event"]) == ("turn-1", "tool_call")
+    assert second["turn_id"] is None
+    assert second["level"] == "WARNING"
+
+
+def test_records_are_dropped_when_the_queue_is_full() -> None:
+    """Test that a full queue drops records instead of blocking."""
+    handler = NonBlockingQueueHandler(queue.Queue(1), sample_rate=1.0)
+
+    for _ in range(3):
+        handler.emit(create_record(logging.ERROR))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
+
+
+def test_low_level_records_are_sampled_under_pressure() -> None:
+    """Test that records below WARNING are sampled above the high-water mark."""
+    handler = NonBlockingQueueHandler(
+        queue.Queue(4), sample_rate=0.1, sampler=lambda: 0.5
+    )
+
+    for _ in range(3):
+        handler.emit(create_record(logging.DEBUG))
+    handler.emit(create_record(logging.WARNING))
+
+    assert handler.queue.qsize() == 3
+    assert handler.sampled_out == 1
+    assert handler.queue.get().msg == "Event 1"
+
+
+def test_logged_repository_logs_query_durations(caplog) -> None:
+    """Test that repository calls are logged with their duration."""
+    repo = LoggedRepository(FakeRepository([Booking("123", ["2023-10-01"], "")]))
+
+    with caplog.at_level(logging.DEBUG, logger="app"):
+        repo.get_booked_dates()
+
+    (record,) = caplog.records
+    assert record.event == "repository_call"
+    assert record.method == "get_booked_dates"
+    assert record.seconds >= 0
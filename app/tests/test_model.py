@@ -68,7 +68,8 @@ def test_booking_representation() -> None:
     """Test that the Booking object can be represented as a string."""
     booking = Booking("123", ["2023-10-24", "2023-10-25"], "Paul")
     expected = (
-        "Booking(id_=123, dates=['2023-10-24', '2023-10-25'], customer_name=Paul)"
+        "Booking(id_=123, dates=['2023-10-24', '2023-10-25'], customer_name=Paul, "
+        "resource_id=main)"
     )
 
     assert str(booking) == expected
@@ -100,6 +101,13 @@ def test_booking_representation() -> None:
             ),
             False,
         ),
+        (
+            (
+                Booking("123", ["2025-01-01"], "", "main"),
+                Booking("123", ["2025-01-01"], "", "annex"),
+            ),
+            False,
+        ),
     ],
 )
 def test_booking_equality(test_bookings: tuple[Booking], expected: bool) -> None:
@@ -0,0 +1,73 @@
+"""Tests for the occupancy module."""
+
+from datetime import date
+
+import pytest
+
+from booking.model import Booking
+from booking.occupancy import MAX_DAYS, OccupancyIndex, OccupancyRepository
+from tests.shared import FakeRepository
+
+
+def create_repository() -> OccupancyRepository:
+    """Create an occupancy repository over two rooms."""
+    return OccupancyRepository(
+        FakeRepository(
+            [
+                Booking("123", ["2023-10-01", "2023-10-02"], ""),
+                Booking("456", ["2023-10-02"], "", "annex"),
+            ],
+            resources={"annex"},
+        ),
+        ["main", "annex"],
+    )
+
+
+def test_occupancy_is_counted_per_day() -> None:
+    """Test the daily occupancy of the rooms."""
+    repo = create_repository()
+
+    assert repo.get_occupancy(date(2023, 10, 1), date(2023, 10, 3)) == [
+        {"period": "2023-10-01", "booked": 1, "capacity": 2, "rate": 0.5},
+        {"period": "2023-10-02", "booked": 2, "capacity": 2, "rate": 1.0},
+        {"period": "2023-10-03", "booked": 0, "capacity": 2, "rate": 0.0},
+    ]
+
+
+def test_weeks_are_clipped_to_the_range() -> None:
+    """Test that partial ISO weeks only count the days within the range."""
+    repo = create_repository()
+
+    assert repo.get_occupancy(date(2023, 9, 30), date(2023, 10, 4), "week") == [
+        {"period": "2023-W39", "booked": 1, "capacity": 4, "rate": 0.25},
+        {"period": "2023-W40", "booked": 2, "capacity": 6, "rate": 0.333},
+    ]
+
+
+def test_added_bookings_update_the_occupancy() -> None:
+    """Test that bookings added through the repository are counted at once."""
+    repo = create_repository()
+
+    repo.add(Booking("789", ["2023-10-01"], "", "annex"))
+
+    (october,) = repo.get_occupancy(date(2023, 10, 1), date(2023, 10, 31), "month")
+    assert (october["booked"], october["capacity"]) == (4, 62)
+    assert repo.get_booked_dates("annex") == [date(2023, 10, 1), date(2023, 10, 2)]
+
+
+def test_invalid_ranges_and_periods_are_rejected() -> None:
+    """Test the validation of occupancy queries."""
+    index = OccupancyIndex(["main"])
+
+    with pytest.raises(ValueError):
+        index.occupancy(date(2023, 10, 2), date(2023, 10, 1))
+    with pytest.raises(ValueError):
+        index.occupancy(date(2023, 10, 1), date(2023, 10, 2), "quarter")
+    with pytest.raises(ValueError):
+        index.occupancy(date(1, 1, 1), date(9999, 12, 31))
+    with pytest.raises(ValueError):
+        index.occupancy(
+            date(2023, 1, 1), date.fromordinal(date(2023, 1, 1).toordinal() + MAX_DAYS)
+        )
+
+    assert len(index.occupancy(date(2023, 1, 1), date(2027, 12, 31), "month")) == 60
@@ -0,0 +1,64 @@
+"""Tests for the profiling module."""
+
+import pstats
+
+from booking.model import Booking
+from booking.profiling import ProfiledRepository, TurnProfiler
+from tests.shared import FakeRepository
+
+
+def get_profiled_functions(path: str) -> set[str]:
+    """Get the names of the functions recorded in a profile file."""
+    return {name for _, _, name in pstats.Stats(path).stats}
+
+
+def test_forced_profile_is_written(tmp_path) -> None:
+    """Test that a forced block is profiled even when not sampled."""
+    profiler = TurnProfiler(str(tmp_path), sample_rate=0)
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+
+    with profiler.profile("turn", force=True) as path:
+        repo.get_booked_dates()
+
+    assert "get_booked_dates" in get_profiled_functions(path)
+
+
+def test_blocks_are_sampled(tmp_path) -> None:
+    """Test that only sampled blocks are profiled."""
+    samples = iter([0.2, 0.7])
+    profiler = TurnProfiler(
+        str(tmp_path), sample_rate=0.5, sampler=lambda: next(samples)
+    )
+
+    with profiler.profile("first") as first, profiler.profile("ignored") as nested:
+        pass
+    with profiler.profile("second") as second:
+        pass
+
+    assert first is not None
+    assert nested is None
+    assert second is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_profiled_repository_profiles_calls(tmp_path) -> None:
+    """Test that repository calls are profiled in their own files."""
+    repo = ProfiledRepository(FakeRepository(), TurnProfiler(str(tmp_path)))
+
+    repo.add(Booking("123", ["2023-10-01"], ""))
+    repo.get("123")
+
+    assert sorted(p.name.split("-")[0] for p in tmp_path.iterdir()) == [
+        "repository.add",
+        "repository.get",
+    ]
+
+
+def test_profiler_is_configured_from_environment(monkeypatch, tmp_path) -> None:
+    """Test that the output directory and sample rate come from the environment."""
+    monkeypatch.setenv("BOOKING_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("BOOKING_PROFILE_SAMPLE_RATE", "0.25")
+
+    profiler = TurnProfiler.from_environment()
+
+    assert (profiler.output_dir, profiler.sample_rate) == (str(tmp_path), 0.25)
@@ -1,9 +1,29 @@
 """Tests for the repository module."""
 
+import asyncio
+import sqlite3
+from datetime import date
+
 import pytest
 
+from booking.config import get_database_connection
 from booking.model import Booking
-from booking.repository import AbstractRepository, SqlRepository
+from booking.repository import (
+    AbstractRepository,
+    AsyncSqlRepository,
+    SqliteRepository,
+    SqlRepository,
+)
+
+
+@pytest.fixture(name="repo", params=["sql", "sqlite"])
+def create_repository(request) -> AbstractRepository:
+    """Provide an empty repository for each supported backend."""
+    if request.param == "sqlite":
+        return SqliteRepository(request.getfixturevalue("sqlite_session"))
+
+    request.getfixturevalue("clear_db")
+    return SqlRepository(request.getfixturevalue("db_session"))
 
 
 def create_test_bookings(repo: AbstractRepository) -> list[Booking]:
@@ -19,11 +39,8 @@ def create_test_bookings(repo: AbstractRepository) -> list[Booking]:
     return bookings
 
 
-@pytest.mark.usefixtures("clear_db")
-def test_repository_can_retrieve_specific_booking(db_session) -> None:
+def test_repository_can_retrieve_specific_booking(repo: AbstractRepository) -> None:
     """Test that the repository can retrieve bookings."""
-    repo = SqlRepository(db_session)
-
     create_test_bookings(repo)
 
     expected_booking = Booking("123", ["2023-10-01", "2023-10-02"], "")
@@ -32,21 +49,17 @@ def test_repository_can_retrieve_specific_booking(db_session) -> None:
     assert retrieved_booking == expected_booking
 
 
-@pytest.mark.usefixtures("clear_db")
-def test_repository_returns_none_when_no_booking_is_found(db_session) -> None:
+def test_repository_returns_none_when_no_booking_is_found(
+    repo: AbstractRepository,
+) -> None:
     """Test that the repository returns None when no booking is found."""
-    repo = SqlRepository(db_session)
-
     test_booking = repo.get("999999")
 
     assert test_booking is None
 
 
-@pytest.mark.usefixtures("clear_db")
-def test_repository_can_create_bookings(db_session) -> None:
+def test_repository_can_create_bookings(repo: AbstractRepository) -> None:
     """Test that the repository can create bookings."""
-    repo = SqlRepository(db_session)
-
     expected_bookings = [
         Booking("123", ["2024-11-02", "2024-11-03"], "John Dory"),
         Booking("456", ["2023-10-03", "2023-10-04"], "Peter"),
@@ -62,14 +75,184 @@ def test_repository_can_create_bookings(db_session) -> None:
     assert actual_bookings == expected_bookings
 
 
-@pytest.mark.usefixtures("clear_db")
-def test_repository_can_retrieve_all_booked_dates(db_session) -> None:
+def test_repository_can_retrieve_all_booked_dates(repo: AbstractRepository) -> None:
     """Test that the repository can retrieve all booked dates."""
-    repo = SqlRepository(db_session)
-
     bookings = create_test_bookings(repo)
     expected_dates = [b for booking in bookings for b in booking.dates]
 
     test_dates = repo.get_booked_dates()
 
     assert test_dates == sorted(expected_dates)
+
+
+def test_repository_partitions_booked_dates_by_resource(
+    repo: AbstractRepository,
+) -> None:
+    """Test that the same dates can be booked once per resource."""
+    repo.add_resource("annex", "Annex")
+    create_test_bookings(repo)
+    annex_booking = Booking("999", ["2023-10-01", "2023-10-02"], "Paul", "annex")
+
+    repo.add(annex_booking)
+
+    assert repo.get("999") == annex_booking
+    assert repo.get_booked_dates("annex") == annex_booking.dates
+    assert len(repo.get_booked_dates()) == 6
+
+
+@pytest.mark.parametrize(
+    "test_dates, test_resource_ids, expected",
+    [
+        (["2023-10-01"], None, ["garden"]),
+        (["2023-10-05"], None, ["annex", "garden"]),
+        (["2023-10-09"], None, ["annex", "garden", "main"]),
+        (["2023-10-04", "2023-10-09"], None, ["annex", "garden"]),
+        (["2023-10-09"], ["main", "unknown"], ["main"]),
+        (["2023-10-09"], [], []),
+        ([], None, ["annex", "garden", "main"]),
+    ],
+)
+def test_repository_can_retrieve_available_resources(
+    repo: AbstractRepository,
+    test_dates: list[str],
+    test_resource_ids: list[str] | None,
+    expected: list[str],
+) -> None:
+    """Test that the resources free on all the dates are found in one query."""
+    repo.add_resource("annex", "Annex")
+    repo.add_resource("garden", "Garden room")
+    create_test_bookings(repo)
+    repo.add(Booking("999", ["2023-10-01", "2023-10-02"], "", "annex"))
+
+    dates = [date.fromisoformat(d) for d in test_dates]
+
+    assert repo.get_available_resources(dates, test_resource_ids) == expected
+
+
+def test_repository_streams_all_bookings(repo: AbstractRepository) -> None:
+    """Test that bookings are streamed with their dates, across fetch batches."""
+    bookings = create_test_bookings(repo)
+
+    records = list(repo.iter_bookings(batch_size=3))
+
+    assert [(r.id, r.resource_id, r.dates) for r in records] == [
+        (b.id_, b.resource_id, tuple(b.dates)) for b in bookings
+    ]
+    assert list(repo.iter_bookings(since=records[-1].created_date)) == [
+        r for r in records if r.created_date >= records[-1].created_date
+    ]
+
+
+def test_sqlite_repository_rejects_already_booked_dates(sqlite_session) -> None:
+    """Test that the SQLite repository enforces unique booked dates."""
+    repo = SqliteRepository(sqlite_session)
+    repo.add(Booking("123", ["2023-10-01", "2023-10-02"], ""))
+
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.add(Booking("456", ["2023-10-02", "2023-10-03"], ""))
+
+
+def test_sqlite_repository_rejects_unknown_resources(sqlite_session) -> None:
+    """Test that bookings can only be made for existing resources."""
+    repo = SqliteRepository(sqlite_session)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.add(Booking("123", ["2023-10-01"], "", "unknown"))
+
+
+def test_sqlite_repository_cascades_booking_deletes(sqlite_session) -> None:
+    """Test that deleting a booking deletes its dates."""
+    repo = SqliteRepository(sqlite_session)
+    create_test_bookings(repo)
+
+    sqlite_session.execute("DELETE FROM booking WHERE id = ?", ("123",))
+
+    assert [d.isoformat() for d in repo.get_booked_dates()] == [
+        "2023-10-03",
+        "2023-10-04",
+        "2023-10-05",
+        "2023-10-06",
+    ]
+
+
+def test_repository_records_booked_date_changes(repo: AbstractRepository) -> None:
+    """Test that the change feed returns the dates booked since a version."""
+    repo.add(Booking("123", ["2023-10-01"], ""))
+    since = repo.get_change_version()
+    repo.add_resource("room-2", "Room 2")
+    repo.add(Booking("456", ["2023-10-02", "2023-10-03"], ""))
+    repo.add(Booking("789", ["2023-10-02"], "", "room-2"))
+
+    version, changes = repo.get_changes(since, "main")
+
+    assert version == repo.get_change_version()
+    assert [(c.date.isoformat(), c.booked) for c in changes] == [
+        ("2023-10-02", True),
+        ("2023-10-03", True),
+    ]
+    assert len(repo.get_changes(since)[1]) == 3
+    assert repo.get_changes(version) == (version, [])
+
+
+def test_repository_prunes_changes_up_to_a_version(repo: AbstractRepository) -> None:
+    """Test that pruned changes leave the later changes and the version."""
+    repo.add(Booking("123", ["2023-10-01"], ""))
+    through = repo.get_change_version()
+    repo.add(Booking("456", ["2023-10-02"], ""))
+    version = repo.get_change_version()
+
+    assert repo.prune_changes(through) == 1
+
+    _, changes = repo.get_changes(0)
+    assert [c.date for c in changes] == [date(2023, 10, 2)]
+    assert repo.get_change_version() == version
+
+
+def test_sqlite_repository_records_released_dates(sqlite_session) -> None:
+    """Test that dates deleted with their booking appear in the change feed."""
+    repo = SqliteRepository(sqlite_session)
+    create_test_bookings(repo)
+    since = repo.get_change_version()
+
+    sqlite_session.execute("DELETE FROM booking WHERE id = ?", ("123",))
+
+    _, changes = repo.get_changes(since)
+    assert sorted((c.resource_id, c.date, c.booked) for c in changes) == [
+        ("main", date(2023, 10, 1), False),
+        ("main", date(2023, 10, 2), False),
+    ]
+
+
+@pytest.mark.usefixtures("clear_db")
+def test_async_repository_can_create_and_retrieve_bookings() -> None:
+    """Test that the async repository can create and retrieve bookings."""
+    expected_bookings = [
+        Booking("123", ["2024-11-02", "2024-11-03"], "John Dory"),
+        Booking("456", ["2023-10-03", "2023-10-04"], "Peter"),
+    ]
+
+    async def run() -> list[Booking]:
+        async with AsyncSqlRepository(get_database_connection, pool_size=2) as repo:
+            await asyncio.gather(*(repo.add(b) for b in expected_bookings))
+            return await asyncio.gather(*(repo.get(b.id_) for b in expected_bookings))
+
+    assert asyncio.run(run()) == expected_bookings
+
+
+@pytest.mark.usefixtures("clear_db")
+def test_async_repository_can_retrieve_all_booked_dates() -> None:
+    """Test that the async repository can retrieve all booked dates."""
+    booking = Booking("123", ["2023-10-01", "2023-10-02"], "")
+
+    async def run() -> list:
+        async with AsyncSqlRepository(get_database_connection) as repo:
+            await repo.add(booking)
+            return await repo.get_booked_dates()
+
+    assert asyncio.run(run()) == booking.dates
+
+
+def test_async_repository_rejects_invalid_pool_size() -> None:
+    """Test that the async repository needs at least one connection."""
+    with pytest.raises(ValueError):
+        AsyncSqlRepository(get_database_connection, pool_size=0)
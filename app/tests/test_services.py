@@ -1,5 +1,6 @@
 """Tests for the services module."""
 
+import asyncio
 from datetime import date
 
 import pyodbc
@@ -7,8 +8,18 @@ import pytest
 
 from booking.repository import SqlRepository
 from booking.model import Booking
-from booking.services import check_availability, create_booking
-from tests.shared import FakeRepository
+from booking.occupancy import OccupancyRepository
+from booking.services import (
+    check_availability,
+    check_availability_async,
+    check_availability_range,
+    create_booking,
+    create_booking_async,
+    find_available_rooms,
+    find_available_rooms_async,
+    get_occupancy,
+)
+from tests.shared import FakeAsyncRepository, FakeRepository
 
 
 @pytest.mark.parametrize(
@@ -40,6 +51,122 @@ def test_check_availability_returns_correct_availability(
     assert test_availability == expected
 
 
+def test_check_availability_is_scoped_to_a_room():
+    """Test that bookings of other rooms do not affect availability."""
+    repo = FakeRepository(
+        [
+            Booking("123", ["2023-10-01"], ""),
+            Booking("456", ["2023-10-02"], "", "annex"),
+        ],
+        resources={"annex"},
+    )
+
+    test_availability = check_availability(["2023-10-01", "2023-10-02"], repo, "annex")
+
+    assert test_availability == {"2023-10-01": True, "2023-10-02": False}
+
+
+@pytest.mark.parametrize(
+    "test_range, expected",
+    [
+        (
+            ("2023-09-29", "2023-10-05"),
+            {
+                "available": [["2023-09-29", "2023-09-30"], "2023-10-03", "2023-10-05"],
+                "booked": [["2023-10-01", "2023-10-02"], "2023-10-04"],
+            },
+        ),
+        (("2023-10-03", "2023-10-03"), {"available": ["2023-10-03"], "booked": []}),
+        (("2023-10-02", "2023-10-02"), {"available": [], "booked": ["2023-10-02"]}),
+    ],
+)
+def test_check_availability_range_returns_runs(
+    test_range: tuple[str, str], expected: dict[str, list]
+):
+    """Test that the availability of a period is returned as runs of dates."""
+    repo = FakeRepository(
+        [
+            Booking("123", ["2023-10-01", "2023-10-02"], ""),
+            Booking("456", ["2023-10-04"], ""),
+            Booking("789", ["2023-10-04"], "", "annex"),
+        ],
+        resources={"annex"},
+    )
+
+    assert check_availability_range(*test_range, repo) == expected
+
+
+def test_check_availability_range_rejects_reversed_periods():
+    """Test that a period cannot end before it starts."""
+    with pytest.raises(ValueError):
+        check_availability_range("2023-10-02", "2023-10-01", FakeRepository())
+
+
+def test_get_occupancy_returns_monthly_rates():
+    """Test that the occupancy of the rooms is returned per month."""
+    repo = OccupancyRepository(
+        FakeRepository(
+            [Booking("123", ["2023-10-30", "2023-10-31", "2023-11-01"], "")],
+            resources={"annex"},
+        ),
+        ["main", "annex"],
+    )
+
+    assert get_occupancy("2023-10-01", "2023-11-30", "month", repo) == [
+        {"period": "2023-10", "booked": 2, "capacity": 62, "rate": 0.032},
+        {"period": "2023-11", "booked": 1, "capacity": 60, "rate": 0.017},
+    ]
+
+
+def test_get_occupancy_counts_booked_dates_without_an_index():
+    """Test that repositories without occupancy counts are counted directly."""
+    repo = FakeRepository(
+        [Booking("123", ["2023-10-30", "2023-10-31", "2023-11-01"], "")],
+        resources={"annex"},
+    )
+
+    assert get_occupancy("2023-10-01", "2023-11-30", "month", repo) == [
+        {"period": "2023-10", "booked": 2, "capacity": 62, "rate": 0.032},
+        {"period": "2023-11", "booked": 1, "capacity": 60, "rate": 0.017},
+    ]
+
+
+@pytest.mark.parametrize(
+    "test_range, period",
+    [
+        (("2023-10-02", "2023-10-01"), "day"),
+        (("2023-10-01", "2023-10-31"), "quarter"),
+        (("0001-01-01", "9999-12-31"), "month"),
+        (("2023-10-01", "2023-31-10"), "day"),
+    ],
+)
+def test_get_occupancy_rejects_invalid_queries(
+    test_range: tuple[str, str], period: str
+):
+    """Test that reversed or overlong ranges and unknown periods are rejected."""
+    repo = OccupancyRepository(FakeRepository(), ["main"])
+
+    with pytest.raises(ValueError):
+        get_occupancy(*test_range, period, repo)
+
+
+def test_find_available_rooms_returns_rooms_free_on_all_dates():
+    """Test that only the rooms free on every date are returned."""
+    repo = FakeRepository(
+        [
+            Booking("123", ["2023-10-01"], ""),
+            Booking("456", ["2023-10-02"], "", "annex"),
+        ],
+        resources={"annex", "garden"},
+    )
+
+    assert find_available_rooms(["2023-10-01"], repo) == ["annex", "garden"]
+    assert find_available_rooms(["2023-10-01", "2023-10-02"], repo) == ["garden"]
+    assert asyncio.run(
+        find_available_rooms_async(["2023-10-03"], FakeAsyncRepository(repo.data))
+    ) == ["main"]
+
+
 @pytest.mark.parametrize(
     "test_dates",
     [["12/10/2023"], ["2023-10-01", "2023-13-02"], ["invalid_date"], [None]],
@@ -54,6 +181,61 @@ def test_check_availability_raises_exception_on_invalid_date_format(
         check_availability(test_dates, repo)
 
 
+def test_check_availability_async_returns_correct_availability():
+    """Test that check_availability_async returns correct availability."""
+    repo = FakeAsyncRepository([Booking("123", ["2023-10-01", "2023-10-02"], "")])
+
+    test_availability = asyncio.run(
+        check_availability_async(["2023-10-02", "2023-10-03"], repo)
+    )
+
+    assert test_availability == {"2023-10-02": False, "2023-10-03": True}
+
+
+def test_booking_is_created_correctly_async():
+    """Test that create_booking_async stores the booking in the repository."""
+    repo = FakeAsyncRepository()
+
+    test_booking_id = asyncio.run(
+        create_booking_async(["2025-10-01", "2025-10-02"], "John Dory", repo)
+    )
+
+    test_booking = asyncio.run(repo.get(test_booking_id))
+
+    assert test_booking.dates_iso == ["2025-10-01", "2025-10-02"]
+
+
+def test_booking_is_created_for_the_requested_room():
+    """Test that create_booking books the given room."""
+    repo = FakeRepository(resources={"annex"})
+
+    test_booking_id = create_booking(["2025-10-01"], "John Dory", repo, "annex")
+
+    assert repo.get(test_booking_id).resource_id == "annex"
+    assert repo.get_booked_dates() == []
+
+
+def test_unknown_rooms_are_rejected():
+    """Test that a room which does not exist is not reported as available."""
+    repo = FakeRepository()
+    async_repo = FakeAsyncRepository()
+
+    with pytest.raises(ValueError, match="Unknown room"):
+        check_availability(["2023-10-01"], repo, "attic")
+    with pytest.raises(ValueError, match="Unknown room"):
+        check_availability_range("2023-10-01", "2023-10-31", repo, "attic")
+    with pytest.raises(ValueError, match="Unknown room"):
+        create_booking(["2023-10-01"], "John Dory", repo, "attic")
+    with pytest.raises(ValueError, match="Unknown room"):
+        asyncio.run(check_availability_async(["2023-10-01"], async_repo, "attic"))
+    with pytest.raises(ValueError, match="Unknown room"):
+        asyncio.run(
+            create_booking_async(["2023-10-01"], "John Dory", async_repo, "attic")
+        )
+
+    assert not repo.data
+
+
 @pytest.mark.usefixtures("clear_db")
 def test_booking_is_created_correctly(db_session):
     """Test that a booking is created correctly."""
@@ -0,0 +1,107 @@
+"""Tests for the singleflight module."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from booking.model import DEFAULT_RESOURCE, Booking
+from booking.singleflight import (
+    AsyncCoalescingRepository,
+    CoalescingRepository,
+    SingleFlight,
+)
+from tests.shared import FakeAsyncRepository, FakeRepository
+
+
+class SlowRepository(FakeRepository):
+    """Fake repository blocking reads until released."""
+
+    def __init__(self, data: set[Booking] | None = None) -> None:
+        super().__init__(data)
+        self.release = threading.Event()
+        self.queries = 0
+
+    def get_booked_dates(self, resource_id: str = DEFAULT_RESOURCE) -> list[date]:
+        """Get all booked dates once released."""
+        self.queries += 1
+        self.release.wait(timeout=5)
+        return super().get_booked_dates(resource_id)
+
+
+class SlowAsyncRepository(FakeAsyncRepository):
+    """Fake async repository counting the queries it serves."""
+
+    def __init__(self, data: set[Booking] | None = None) -> None:
+        super().__init__(data)
+        self.queries = 0
+
+    async def get(self, id_: str) -> Booking | None:
+        """Get a booking by ID after yielding to the event loop."""
+        self.queries += 1
+        await asyncio.sleep(0.01)
+        return await super().get(id_)
+
+
+def test_concurrent_reads_share_one_query() -> None:
+    """Test that concurrent threads share a single in-flight query."""
+    booking = Booking("123", ["2023-10-01", "2023-10-02"], "")
+    slow_repo = SlowRepository([booking])
+    repo = CoalescingRepository(slow_repo)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(repo.get_booked_dates) for _ in range(8)]
+        while repo.stats.calls < 8:
+            time.sleep(0.001)
+        slow_repo.release.set()
+        results = [f.result() for f in futures]
+
+    assert slow_repo.queries == 1
+    assert all(r == booking.dates for r in results)
+    assert repo.stats.coalesced == 7
+    assert repo.stats.ratio == pytest.approx(7 / 8)
+
+
+def test_sequential_reads_are_not_coalesced() -> None:
+    """Test that calls are executed again once the previous one completed."""
+    repo = CoalescingRepository(FakeRepository())
+
+    repo.get("123")
+    repo.get("123")
+
+    assert repo.stats.executions == 2
+    assert repo.stats.ratio == 0.0
+
+
+def test_exceptions_are_propagated_and_not_cached() -> None:
+    """Test that a failing call raises and does not block later calls."""
+    singleflight = SingleFlight()
+
+    def fail() -> None:
+        raise RuntimeError("Query failed.")
+
+    with pytest.raises(RuntimeError):
+        singleflight.do("key", fail)
+
+    assert singleflight.do("key", lambda: 1) == 1
+
+
+def test_async_concurrent_reads_share_one_query() -> None:
+    """Test that concurrent coroutines share a single query per key."""
+    booking = Booking("123", ["2023-10-01"], "")
+    slow_repo = SlowAsyncRepository([booking])
+    repo = AsyncCoalescingRepository(slow_repo)
+
+    async def run() -> list[Booking | None]:
+        return await asyncio.gather(
+            *(repo.get("123") for _ in range(5)), repo.get("456")
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [booking] * 5 + [None]
+    assert slow_repo.queries == 2
+    assert repo.stats.coalesced == 4
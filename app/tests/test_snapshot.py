@@ -0,0 +1,134 @@
+"""Tests for the snapshot module."""
+
+import time
+from datetime import date
+
+import pytest
+
+from booking.model import Booking
+from booking.services import check_availability
+from booking.snapshot import (
+    InvalidSnapshot,
+    SnapshotReader,
+    SnapshotRefresher,
+    SnapshotRepository,
+    SnapshotWriter,
+)
+from tests.shared import FakeRepository
+
+
+def test_snapshot_round_trip(tmp_path) -> None:
+    """Test that published dates are read back sorted and searchable."""
+    path = str(tmp_path / "booked.snapshot")
+    dates = [date(2023, 10, 5), date(2023, 10, 1), date(2024, 2, 29)]
+
+    version = SnapshotWriter(path).publish(dates)
+    view = SnapshotReader(path).booked_dates()
+
+    assert view.version == version == 1
+    assert list(view) == sorted(dates)
+    assert date(2024, 2, 29) in view
+    assert date(2023, 10, 2) not in view
+
+
+def test_reader_sees_new_snapshot_versions(tmp_path) -> None:
+    """Test that readers pick up snapshots published after they were opened."""
+    path = str(tmp_path / "booked.snapshot")
+    writer = SnapshotWriter(path)
+    reader = SnapshotReader(path)
+
+    writer.publish([date(2023, 10, 1)])
+    first = reader.booked_dates()
+    writer.publish([date(2023, 10, 1), date(2023, 10, 2)])
+    second = reader.booked_dates()
+
+    assert (first.version, len(first)) == (1, 1)
+    assert (second.version, len(second)) == (2, 2)
+    assert SnapshotWriter(path).version == 2
+
+
+def test_reader_rejects_invalid_snapshot(tmp_path) -> None:
+    """Test that a file which is not a snapshot is rejected."""
+    path = tmp_path / "booked.snapshot"
+    path.write_bytes(b"not a snapshot at all")
+
+    with pytest.raises(InvalidSnapshot):
+        SnapshotReader(str(path)).booked_dates()
+
+
+def test_only_one_refresher_is_active(tmp_path) -> None:
+    """Test that a second refresher on the same path stays idle."""
+    path = str(tmp_path / "booked.snapshot")
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    first = SnapshotRefresher(repo, path, interval=60)
+    second = SnapshotRefresher(repo, path, interval=60)
+
+    try:
+        assert first.start()
+        assert not second.start()
+    finally:
+        first.stop()
+        second.stop()
+
+
+def test_idle_refresher_takes_over_with_later_versions(tmp_path) -> None:
+    """Test that an idle refresher takes over once the active one stops."""
+    path = str(tmp_path / "booked.snapshot")
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    first = SnapshotRefresher(repo, path, interval=60)
+    second = SnapshotRefresher(repo, path, interval=0.01)
+
+    try:
+        assert first.start()
+        assert not second.start()
+        first.refresh()
+        first.stop()
+
+        for _ in range(500):
+            if second.writer.version > 2:
+                break
+            time.sleep(0.01)
+
+        assert second.writer.version > 2
+        assert SnapshotReader(path).booked_dates().version == second.writer.version
+    finally:
+        first.stop()
+        second.stop()
+
+
+def test_refresher_can_own_its_connection(tmp_path) -> None:
+    """Test that a refresher gets a connection of its own from a factory."""
+    connections = []
+
+    def connect() -> object:
+        connections.append(object())
+        return connections[-1]
+
+    refresher = SnapshotRefresher.from_connection_factory(
+        connect, str(tmp_path / "booked.snapshot")
+    )
+
+    assert refresher.repository.connection is connections[0]
+    assert len(connections) == 1
+
+
+def test_check_availability_answers_from_snapshot(tmp_path) -> None:
+    """Test that availability is answered from the snapshot."""
+    path = str(tmp_path / "booked.snapshot")
+    repo = FakeRepository([Booking("123", ["2023-10-01", "2023-10-02"], "")])
+    SnapshotRefresher(repo, path).refresh()
+
+    snapshot_repo = SnapshotRepository(FakeRepository(), SnapshotReader(path))
+
+    assert check_availability(["2023-10-02", "2023-10-03"], snapshot_repo) == {
+        "2023-10-02": False,
+        "2023-10-03": True,
+    }
+
+
+def test_snapshot_repository_falls_back_to_repository(tmp_path) -> None:
+    """Test that booked dates are queried when no snapshot exists."""
+    repo = FakeRepository([Booking("123", ["2023-10-01"], "")])
+    reader = SnapshotReader(str(tmp_path / "missing.snapshot"))
+
+    assert SnapshotRepository(repo, reader).get_booked_dates() == [date(2023, 10, 1)]
@@ -0,0 +1,63 @@
+"""Tests for the warmup module."""
+
+import threading
+
+from booking.ai.client import compile_tool
+from booking.warmup import Warmup, warm_tools
+
+
+def test_warmup_is_ready_once_every_step_succeeded() -> None:
+    """Test that the readiness check only passes after a successful warm-up."""
+    calls = []
+    warmup = Warmup({"first": lambda: calls.append(1), "second": lambda: None})
+
+    assert not warmup.ready
+
+    results = warmup.run()
+
+    assert warmup.ready
+    assert calls == [1]
+    assert list(results) == ["first", "second"]
+    assert all(result.ok and result.seconds >= 0 for result in results.values())
+
+
+def test_failed_steps_are_reported_and_retried() -> None:
+    """Test that a failed step leaves the process not ready until a retry works."""
+    attempts = []
+
+    def connect() -> None:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("unreachable")
+
+    warmup = Warmup({"database": connect, "tools": lambda: None})
+    warmup.run()
+
+    status = warmup.status()
+    assert not status["ready"]
+    assert status["steps"]["database"]["error"] == "ConnectionError: unreachable"
+    assert status["steps"]["tools"]["error"] is None
+
+    warmup.run()
+
+    assert warmup.ready
+
+
+def test_parallel_warmup_runs_steps_concurrently() -> None:
+    """Test that parallel steps overlap, which would time out sequentially."""
+    barrier = threading.Barrier(2, timeout=5)
+    warmup = Warmup({"a": barrier.wait, "b": barrier.wait}, parallel=True)
+
+    warmup.run()
+
+    assert warmup.ready
+
+
+def test_warm_tools_generates_the_tool_definitions() -> None:
+    """Test that the tools are resolved and their definitions cached."""
+    warm_tools([("booking.services", "check_availability")])
+
+    hits = compile_tool.cache_info().hits
+    warm_tools([("booking.services", "check_availability")])
+
+    assert compile_tool.cache_info().hits == hits + 1